@@ -2,6 +2,13 @@ const Recruiter = require("../models/Recruiter");
 const Job = require("../models/Jobs");
 const Student = require("../models/Student");
 
+const ML_API_URL = "http://127.0.0.1:8000";
+
+// The ML service caches one vector per job description; drop it when the job changes or goes away
+const invalidateJobVector = (jobId) =>
+  fetch(`${ML_API_URL}/api/job-vectors/${jobId}`, { method: "DELETE" }).catch((error) =>
+    console.error("Failed to invalidate job vector:", error.message)
+  );
 
 exports.signupRecruiter = async (req, res) => {
   try {
@@ -96,6 +103,7 @@ exports.deleteJob = async (req, res) => {
     await Recruiter.findByIdAndUpdate(recruiterId, {
       $pull: { jobs: jobId },
     });
+    invalidateJobVector(jobId);
 
     res.json({ message: "Job deleted successfully" });
   } catch (error) {
@@ -122,6 +130,9 @@ exports.updateJob = async (req, res) => {
       { title, description, location },
       { new: true }
     );
+    if (description !== job.description) {
+      invalidateJobVector(jobId);
+    }
 
     res.json({ message: "Job updated successfully", job: updatedJob });
   } catch (error) {
@@ -20,6 +20,11 @@ import {
 } from "react-icons/fi";
 import Header from "./Header";
 import axios from "axios";
+import {
+  fetchMatchResultsPage,
+  forEachMatchResultsPage,
+  waitForMatchJob,
+} from "./matchResults";
 
 const Jobs = () => {
   const [jobs, setAllJobs] = useState([]);
@@ -27,7 +32,11 @@ const Jobs = () => {
   const [error, setError] = useState(null);
   const [selectedJob, setSelectedJob] = useState(null);
   const [isModalOpen, setIsModalOpen] = useState(false);
+  // Best page of matches, for the top three (every match is sent to process-candidates)
   const [matchingResults, setMatchingResults] = useState([]);
+  // Page of matches currently shown under "All Results"
+  const [resultsPage, setResultsPage] = useState(null);
+  const [matchJobId, setMatchJobId] = useState("");
   const [isProcessing, setIsProcessing] = useState(false);
   const [showResults, setShowResults] = useState(false);
   const [countdown, setCountdown] = useState(0);
@@ -63,23 +72,29 @@ const Jobs = () => {
      setIsProcessing(true);
      setStatus("Saving candidates and sending email...");
 
-     // Prepare candidate data
-     const candidates = matchingResults.map((result) => ({
-       name: result.name || result.filename.replace(/\.(pdf|docx)$/i, ""),
-       email:
-         result.email ||
-         `${result.filename.replace(/\.(pdf|docx)$/i, "")}@candidate.com`,
-       resume: result.filename,
-       summary: result.summary || result.recommendation,
-       skills: result.skills || [],
-     }));
-
-     // Send to backend - single API call
-     await axios.post(
-       "http://localhost:5000/api/recruiter/process-candidates",
-       {
-         jobId: selectedJob._id,
-         candidates,
+     // Send every match to the backend, one page of results per call
+     await forEachMatchResultsPage(
+       "http://127.0.0.1:8000",
+       matchJobId,
+       async (results) => {
+         // Prepare candidate data
+         const candidates = results.map((result) => ({
+           name: result.name || result.filename.replace(/\.(pdf|docx)$/i, ""),
+           email:
+             result.email ||
+             `${result.filename.replace(/\.(pdf|docx)$/i, "")}@candidate.com`,
+           resume: result.filename,
+           summary: result.summary || result.recommendation,
+           skills: result.skills || [],
+         }));
+
+         await axios.post(
+           "http://localhost:5000/api/recruiter/process-candidates",
+           {
+             jobId: selectedJob._id,
+             candidates,
+           }
+         );
        }
      );
 
@@ -118,6 +133,7 @@ const Jobs = () => {
   const handleMatchClick = (job) => {
     setSelectedJob(job);
     setMatchingResults([]);
+    setResultsPage(null);
     setShowResults(false);
     setIsModalOpen(true);
   };
@@ -163,7 +179,7 @@ const Jobs = () => {
       setJobId(job_id);
       setStatus("Resume parsing started...");
 
-      await pollJobStatus(job_id);
+      watchJobEvents(job_id);
     } catch (err) {
       console.error("Error:", err);
       setError(err.response?.data?.message || "Failed to process resumes");
@@ -171,6 +187,56 @@ const Jobs = () => {
     }
   };
 
+  // Progress is pushed by the server; polling is only a fallback
+  const watchJobEvents = (jobId) => {
+    if (typeof EventSource === "undefined") {
+      pollJobStatus(jobId);
+      return;
+    }
+
+    const events = new EventSource(
+      `http://127.0.0.1:8000/api/events/${jobId}`
+    );
+
+    const showProgress = (data) => {
+      setProgress(data.progress_percentage);
+      if (data.status === "processing" && data.total_files) {
+        const eta =
+          data.eta_seconds != null ? ` (~${Math.ceil(data.eta_seconds)}s left)` : "";
+        setStatus(
+          `Parsed ${data.processed_files} of ${data.total_files} resumes${eta}`
+        );
+      } else {
+        setStatus(data.status);
+      }
+    };
+    events.addEventListener("status", (event) => {
+      showProgress(JSON.parse(event.data));
+    });
+    // "file" events carry the status of that one file, not of the job
+    events.addEventListener("file", (event) => {
+      showProgress({ ...JSON.parse(event.data), status: "processing" });
+    });
+
+    events.addEventListener("done", async (event) => {
+      events.close();
+      const { status, result_csv_path } = JSON.parse(event.data);
+      if (status === "completed") {
+        await matchResumesWithJob(jobId, result_csv_path);
+      } else {
+        setError("Resume parsing failed");
+        setIsProcessing(false);
+      }
+    });
+
+    events.onerror = () => {
+      // The browser reconnects on its own; only give up on the stream once it is closed
+      if (events.readyState === EventSource.CLOSED) {
+        pollJobStatus(jobId);
+      }
+    };
+  };
+
   const pollJobStatus = async (jobId) => {
     try {
       const statusResponse = await axios.get(
@@ -196,6 +262,17 @@ const Jobs = () => {
     }
   };
 
+  const showResultsPage = async (page) => {
+    try {
+      setResultsPage(
+        await fetchMatchResultsPage("http://127.0.0.1:8000", matchJobId, page)
+      );
+    } catch (err) {
+      console.error("Results page error:", err);
+      setError("Failed to load matching results");
+    }
+  };
+
  const matchResumesWithJob = async (jobId, csvFilePath) => {
    try {
      setStatus("Matching resumes with job description...");
@@ -205,10 +282,17 @@ const Jobs = () => {
        {
          csv_file_path: csvFilePath,
          job_description: selectedJob.description,
+         job_posting_id: selectedJob._id,
        }
      );
 
-     setMatchingResults(matchResponse.data.results);
+     // Matching runs in the background; only the first page of its results is fetched for display
+     const matchJob = matchResponse.data.job_id;
+     await waitForMatchJob("http://127.0.0.1:8000", matchJob, setProgress);
+     const firstPage = await fetchMatchResultsPage("http://127.0.0.1:8000", matchJob);
+     setMatchJobId(matchJob);
+     setResultsPage(firstPage);
+     setMatchingResults(firstPage.results);
      setStatus("Matching completed");
      setShowResults(true);
 
@@ -262,6 +346,7 @@ const Jobs = () => {
     setIsModalOpen(false);
     setShowResults(false);
     setMatchingResults([]);
+    setResultsPage(null);
     setSelectedFile(null);
   };
 
@@ -593,8 +678,7 @@ useEffect(() => {
                       All Results
                     </h3>
                     <div className="space-y-4">
-                      {matchingResults
-                        .sort((a, b) => b.match_score - a.match_score)
+                      {(resultsPage?.results || [])
                         .map((result) => (
                           <div
                             key={result.filename}
@@ -649,6 +733,27 @@ useEffect(() => {
                           </div>
                         ))}
                     </div>
+                    {resultsPage && resultsPage.pages > 1 && (
+                      <div className="mt-4 flex items-center justify-between">
+                        <button
+                          onClick={() => showResultsPage(resultsPage.page - 1)}
+                          disabled={resultsPage.page <= 1}
+                          className="px-3 py-1 border rounded-md text-sm text-gray-700 hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
+                        >
+                          Previous
+                        </button>
+                        <span className="text-sm text-gray-600">
+                          Page {resultsPage.page} of {resultsPage.pages}
+                        </span>
+                        <button
+                          onClick={() => showResultsPage(resultsPage.page + 1)}
+                          disabled={resultsPage.page >= resultsPage.pages}
+                          className="px-3 py-1 border rounded-md text-sm text-gray-700 hover:bg-gray-50 disabled:opacity-50 disabled:cursor-not-allowed"
+                        >
+                          Next
+                        </button>
+                      </div>
+                    )}
                   </div>
 
                   <div className="mt-6 flex justify-end">
@@ -11,6 +11,11 @@ import {
 } from "react-icons/fi";
 import axios from "axios";
 import Header from "./Header";
+import {
+  fetchMatchResultsPage,
+  forEachMatchResultsPage,
+  waitForMatchJob,
+} from "./matchResults";
 
 const Upload = () => {
   const [allStudents, setAllStudents] = useState([]);
@@ -126,12 +131,19 @@ const Upload = () => {
         }
       );
 
-      setResults(matchResponse.data.results);
+      // Matching runs in the background; only the best page of matches is fetched for display
+      const matchJobId = matchResponse.data.job_id;
+      await waitForMatchJob("http://127.0.0.1:8001", matchJobId, setProgress);
+      const { results: matchedResults } = await fetchMatchResultsPage(
+        "http://127.0.0.1:8001",
+        matchJobId
+      );
+      setResults(matchedResults);
       setStatus("Matching completed");
       setSuccess("Resumes processed successfully!");
 
-      // Save matched candidates to DB
-      await saveMatchedCandidates(matchResponse.data.results);
+      // Save every matched candidate to DB
+      await saveMatchedCandidates(matchJobId);
     } catch (err) {
       console.error("Matching error:", err);
       setError("Failed to match resumes with job description");
@@ -140,23 +152,29 @@ const Upload = () => {
     }
   };
 
-  const saveMatchedCandidates = async (candidates) => {
+  const saveMatchedCandidates = async (matchJobId) => {
     try {
-      const validCandidates = candidates.filter(
-        (c) => c.status === "success" && c.email
+      await forEachMatchResultsPage(
+        "http://127.0.0.1:8001",
+        matchJobId,
+        async (candidates) => {
+          const validCandidates = candidates.filter(
+            (c) => c.status === "success" && c.email
+          );
+
+          for (const candidate of validCandidates) {
+            await axios.post("http://localhost:5000/api/student/add", {
+              name: candidate.name || "Unknown",
+              email: candidate.email,
+              resume: candidate.filename,
+              summary: candidate.summary || "No summary available",
+              matchScore: candidate.match_score,
+              recommendation: candidate.recommendation,
+            });
+          }
+        }
       );
 
-      for (const candidate of validCandidates) {
-        await axios.post("http://localhost:5000/api/student/add", {
-          name: candidate.name || "Unknown",
-          email: candidate.email,
-          resume: candidate.filename,
-          summary: candidate.summary || "No summary available",
-          matchScore: candidate.match_score,
-          recommendation: candidate.recommendation,
-        });
-      }
-
       getAllStudents();
     } catch (err) {
       console.error("Error saving candidates:", err);
@@ -0,0 +1,53 @@
+import axios from "axios";
+
+export const RESULTS_PAGE_SIZE = 50;
+// Rows per request when every result is processed (the ML service allows up to 1000)
+const BULK_PAGE_SIZE = 500;
+
+// Matching runs as a background job on the ML service: poll until it is done
+export const waitForMatchJob = async (apiUrl, matchJobId, onProgress) => {
+  for (;;) {
+    const statusResponse = await axios.get(`${apiUrl}/api/status/${matchJobId}`);
+    const { status, progress_percentage, error_message } = statusResponse.data;
+    if (status === "completed") return;
+    if (status === "failed") {
+      throw new Error(error_message || "Job matching failed");
+    }
+    onProgress?.(progress_percentage);
+    await new Promise((resolve) => setTimeout(resolve, 1000));
+  }
+};
+
+// One page of a finished matching job's results, best match first.
+// Resolves to { results, page, pages, total }; pages are fetched as they are shown.
+export const fetchMatchResultsPage = async (
+  apiUrl,
+  matchJobId,
+  page = 1,
+  pageSize = RESULTS_PAGE_SIZE
+) => {
+  const { data } = await axios.get(`${apiUrl}/api/results/${matchJobId}`, {
+    params: {
+      page,
+      page_size: pageSize,
+      sort_by: "match_score",
+      order: "desc",
+    },
+  });
+  return data;
+};
+
+// Every result of a finished matching job, best match first, handed to onPage
+// one page at a time so a large job is never held in memory as a whole
+export const forEachMatchResultsPage = async (apiUrl, matchJobId, onPage) => {
+  for (let page = 1; ; page++) {
+    const data = await fetchMatchResultsPage(
+      apiUrl,
+      matchJobId,
+      page,
+      BULK_PAGE_SIZE
+    );
+    await onPage(data.results);
+    if (page >= data.pages) break;
+  }
+};
@@ -0,0 +1,93 @@
+"""
+Persistent cache of Gemini resume analyses.
+
+Entries are keyed by a hash of the whitespace-normalized resume text plus the
+prompt/model version, so re-uploading the same resume costs no LLM call while
+any prompt or model change naturally misses. The SQLite file is bounded in
+size: least recently used entries are evicted once it grows past the limit.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+def normalize_resume_text(text):
+    """Collapse whitespace so re-extracted copies of a resume hash the same"""
+    return " ".join(text.split())
+
+class AnalysisCache:
+    def __init__(self, db_path, max_bytes):
+        self.db_path = str(db_path)
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analyses (
+                key TEXT PRIMARY KEY,
+                analysis TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS analyses_last_used ON analyses (last_used)")
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(resume_text, version):
+        normalized = normalize_resume_text(resume_text)
+        return hashlib.sha256(f"{version}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Cached analysis for key, or None"""
+        with self.lock:
+            row = self.conn.execute("SELECT analysis FROM analyses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE analyses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            return json.loads(row[0])
+
+    def put(self, key, analysis):
+        payload = json.dumps(analysis)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO analyses (key, analysis, size, last_used) VALUES (?, ?, ?, ?)",
+                (key, payload, len(payload), time.time())
+            )
+            self._evict()
+            self.conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM analyses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        freed = 0
+        victims = []
+        for key, size in self.conn.execute("SELECT key, size FROM analyses ORDER BY last_used"):
+            if total - freed <= self.max_bytes:
+                break
+            victims.append((key,))
+            freed += size
+        self.conn.executemany("DELETE FROM analyses WHERE key = ?", victims)
+
+    def get_stats(self):
+        with self.lock:
+            entries, size = self.conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM analyses").fetchone()
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": entries,
+                "size_mb": round(size / 1024 / 1024, 2),
+                "max_size_mb": round(self.max_bytes / 1024 / 1024, 2)
+            }
@@ -0,0 +1,183 @@
+"""
+Approximate nearest-neighbour index for top-K candidate retrieval.
+
+An IVF (inverted file) index in plain NumPy: vectors are L2-normalized so the
+inner product is the cosine similarity used by calculate_match_score, a small
+k-means quantizer splits them into ``nlist`` cells, and a query only scores the
+vectors in its ``nprobe`` closest cells. Vectors can be inserted one batch at
+a time; the quantizer is retrained whenever the index has grown enough that
+the old cells are no longer representative.
+"""
+import threading
+
+import numpy as np
+
+MIN_TRAIN_SIZE = 1024  # Below this, exact search is fast enough
+RETRAIN_GROWTH = 4  # Retrain once the index is this many times its training size
+KMEANS_ITERATIONS = 10
+KMEANS_SAMPLE_SIZE = 20000
+
+def normalize(vectors):
+    vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+class IVFIndex:
+    def __init__(self, nprobe=8, seed=0):
+        self.nprobe = nprobe
+        self.seed = seed
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.keys = []
+        self.key_ids = {}
+        self.vectors = None
+        self.count = 0
+        self.centroids = None
+        self.lists = []
+        self.trained_size = 0
+        self.source_fingerprint = None
+        self.synced_rows = 0
+
+    def __len__(self):
+        return self.count
+
+    def add(self, keys, vectors):
+        """Insert vectors; keys already in the index are ignored"""
+        with self.lock:
+            self._add(keys, vectors)
+
+    def _add(self, keys, vectors):
+        vectors = normalize(vectors)
+        new_ids, new_rows = [], []
+        for key, vector in zip(keys, vectors):
+            if key in self.key_ids:
+                continue
+            self.key_ids[key] = self.count + len(new_ids)
+            self.keys.append(key)
+            new_ids.append(self.count + len(new_ids))
+            new_rows.append(vector)
+        if not new_ids:
+            return
+
+        self._grow_storage(np.stack(new_rows))
+        if self.centroids is not None:
+            for cell, vector_id in zip(self._assign(self.vectors[new_ids]), new_ids):
+                self.lists[cell].append(vector_id)
+
+        if self.count >= MIN_TRAIN_SIZE and (self.centroids is None or self.count >= RETRAIN_GROWTH * self.trained_size):
+            self._train()
+
+    def _grow_storage(self, rows):
+        """Amortized append into a preallocated matrix"""
+        needed = self.count + len(rows)
+        if self.vectors is None:
+            self.vectors = np.zeros((max(needed, 1024), rows.shape[1]), dtype=np.float32)
+        elif needed > self.vectors.shape[0]:
+            grown = np.zeros((max(needed, 2 * self.vectors.shape[0]), rows.shape[1]), dtype=np.float32)
+            grown[:self.count] = self.vectors[:self.count]
+            self.vectors = grown
+        self.vectors[self.count:needed] = rows
+        self.count = needed
+
+    def _assign(self, vectors):
+        return np.argmax(vectors @ self.centroids.T, axis=1)
+
+    def _train(self):
+        """Spherical k-means over (a sample of) the stored vectors"""
+        rng = np.random.default_rng(self.seed)
+        data = self.vectors[:self.count]
+        nlist = int(np.clip(np.sqrt(self.count), 1, 4096))
+        sample = data[rng.choice(self.count, size=min(self.count, KMEANS_SAMPLE_SIZE), replace=False)]
+
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)]
+        for _ in range(KMEANS_ITERATIONS):
+            assignment = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignment, sample)
+            empty = ~np.any(sums, axis=1)
+            sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            centroids = normalize(sums)
+
+        self.centroids = centroids
+        assignment = self._assign(data)
+        self.lists = [[] for _ in range(nlist)]
+        for vector_id, cell in enumerate(assignment):
+            self.lists[cell].append(vector_id)
+        self.trained_size = self.count
+
+    def search(self, query, k=50, allowed_keys=None, nprobe=None):
+        """Top-k (key, cosine similarity) pairs, optionally restricted to allowed_keys"""
+        with self.lock:
+            if not self.count:
+                return []
+            query = normalize(query)[0]
+            allowed_ids = None
+            if allowed_keys is not None:
+                allowed_ids = np.fromiter(
+                    (self.key_ids[key] for key in set(allowed_keys) if key in self.key_ids), dtype=np.int64
+                )
+
+            if self.centroids is None or (allowed_ids is not None and len(allowed_ids) <= 4 * k):
+                # Untrained index or a tiny filter: scoring everything is cheaper than probing
+                candidates = allowed_ids if allowed_ids is not None else np.arange(self.count)
+            else:
+                candidates = self._probe(query, k, allowed_ids, nprobe or self.nprobe)
+            return self._top_k(query, candidates, k)
+
+    def exact_search(self, query, k=50, allowed_keys=None):
+        """Brute-force top-k, used as the recall baseline"""
+        with self.lock:
+            if not self.count:
+                return []
+            candidates = np.arange(self.count)
+            if allowed_keys is not None:
+                candidates = np.fromiter(
+                    (self.key_ids[key] for key in set(allowed_keys) if key in self.key_ids), dtype=np.int64
+                )
+            return self._top_k(normalize(query)[0], candidates, k)
+
+    def _probe(self, query, k, allowed_ids, nprobe):
+        cell_order = np.argsort(-(self.centroids @ query))
+        allowed_mask = None
+        if allowed_ids is not None:
+            allowed_mask = np.zeros(self.count, dtype=bool)
+            allowed_mask[allowed_ids] = True
+
+        # Widen the probe until enough (allowed) candidates are found
+        probed = 0
+        chunks, found = [], 0
+        while probed < len(cell_order) and (probed < nprobe or found < k):
+            cell_ids = np.asarray(self.lists[cell_order[probed]], dtype=np.int64)
+            if allowed_mask is not None and len(cell_ids):
+                cell_ids = cell_ids[allowed_mask[cell_ids]]
+            chunks.append(cell_ids)
+            found += len(cell_ids)
+            probed += 1
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+    def _top_k(self, query, candidates, k):
+        if not len(candidates):
+            return []
+        scores = self.vectors[candidates] @ query
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top])]
+        return [(self.keys[candidates[i]], float(scores[i])) for i in top]
+
+    def sync(self, store):
+        """Insert rows appended to an EmbeddingStore since the last sync"""
+        with self.lock:
+            keys, vectors, fingerprint = store.rows_since(self.synced_rows)
+            if fingerprint != self.source_fingerprint:
+                # Store was invalidated (new model): rebuild from scratch
+                self.reset()
+                self.source_fingerprint = fingerprint
+                keys, vectors, _ = store.rows_since(0)
+            if keys:
+                self._add(keys, vectors)
+                self.synced_rows += len(keys)
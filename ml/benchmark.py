@@ -0,0 +1,819 @@
+"""
+Offline benchmarks for the resume processing API.
+
+Run from the ml/ directory, e.g.:
+    python benchmark.py match --rows 5000
+    python benchmark.py matrix --rows 5000 --jobs 50
+    python benchmark.py skills --candidates 100000
+    python benchmark.py batching --files 200 --batch-sizes 1 5 10
+    python benchmark.py dispatch --files 200 --workers 8
+    python benchmark.py extraction --files 50 --pages 3
+    python benchmark.py load --files 100 1000 10000 --keys 4
+    python benchmark.py model --workers 1 2 4
+
+If the production Doc2Vec model (cv_job_maching.model) is not present, a small
+model is trained on the synthetic corpus so the benchmarks can run anywhere.
+"""
+import argparse
+import asyncio
+import io
+import json
+import logging
+import multiprocessing
+import random
+import re
+import tempfile
+import time
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+
+from gensim.models.doc2vec import Doc2Vec, TaggedDocument
+
+import main
+import numpy as np
+import pandas as pd
+
+from ann_index import IVFIndex
+from embedding_store import EmbeddingStore
+from job_store import MemoryJobStore
+from job_vectors import JobVectorCache
+from result_io import FORMAT_EXTENSIONS, available_formats, read_results, write_results
+from skill_index import SkillIndex
+from text_extraction import ExtractionPool, ExtractionTimeout, available_pdf_backends, extract_text
+
+SKILL_WORDS = [
+    "python", "java", "javascript", "react", "node", "django", "flask", "fastapi",
+    "sql", "postgres", "mongodb", "docker", "kubernetes", "aws", "azure", "gcp",
+    "machine", "learning", "data", "analysis", "pandas", "numpy", "tensorflow",
+    "pytorch", "backend", "frontend", "devops", "testing", "agile", "scrum",
+    "leadership", "communication", "teamwork", "design", "microservices", "api",
+]
+FILLER_WORDS = [
+    "experienced", "engineer", "developer", "with", "strong", "background", "in",
+    "building", "scalable", "systems", "and", "delivering", "projects", "using",
+    "years", "of", "professional", "experience", "team", "skilled",
+]
+
+def synthetic_summaries(count, seed=42):
+    """Generate resume-like summaries from a fixed vocabulary"""
+    rng = random.Random(seed)
+    summaries = []
+    for _ in range(count):
+        words = rng.sample(SKILL_WORDS, 8) + rng.choices(FILLER_WORDS, k=20)
+        rng.shuffle(words)
+        summaries.append(" ".join(words))
+    return summaries
+
+def load_benchmark_model(model_path, documents=2000, vector_size=50, epochs=20):
+    """Load the production model if available, otherwise train a small stand-in"""
+    if Path(model_path).exists():
+        return Doc2Vec.load(str(model_path))
+    corpus = [
+        TaggedDocument(text.split(), [i])
+        for i, text in enumerate(synthetic_summaries(documents, seed=7))
+    ]
+    return Doc2Vec(corpus, vector_size=vector_size, min_count=1, epochs=epochs, workers=1, seed=1)
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+# Frozen copy of the original matching loop, so later changes to main cannot speed up the baseline
+def baseline_clean_text(text):
+    text = text.lower()
+    text = re.sub(r'[^a-z\s]', '', text)
+    return ' '.join(text.split())
+
+def baseline_match_score(model, summary, job_description):
+    try:
+        v1 = model.infer_vector(baseline_clean_text(summary).split())
+        v2 = model.infer_vector(baseline_clean_text(job_description).split())
+        similarity = 100 * (np.dot(v1, v2) / (np.linalg.norm(v1) * np.linalg.norm(v2)))
+        return round(similarity, 2)
+    except Exception:
+        return 0.0
+
+def baseline_recommendation(score):
+    if score < 50:
+        return "Low match - modify CV"
+    elif score < 70:
+        return "Good match - can improve"
+    else:
+        return "Excellent match - submit CV"
+
+def baseline_row_loop(model, df, job_description):
+    df["match_score"] = 0.0
+    df["recommendation"] = ""
+    for idx, row in df.iterrows():
+        if pd.notna(row["summary"]) and str(row["summary"]).strip():
+            score = baseline_match_score(model, row["summary"], job_description)
+            df.at[idx, "match_score"] = score
+            df.at[idx, "recommendation"] = baseline_recommendation(score)
+        else:
+            df.at[idx, "match_score"] = 0.0
+            df.at[idx, "recommendation"] = "No summary available"
+    return df
+
+def bench_match(args):
+    """Original row-by-row matching loop vs the vectorized score_summaries engine"""
+    main.DOC2VEC_MODEL = load_benchmark_model(args.model)
+    store_dir = tempfile.TemporaryDirectory()
+    summaries = synthetic_summaries(args.rows)
+    job_description = " ".join(SKILL_WORDS[:10] + FILLER_WORDS[:10])
+
+    loop_rows = summaries[:args.loop_rows] if args.loop_rows else summaries
+    loop_df = pd.DataFrame({"summary": loop_rows})
+
+    _, loop_time = timed(baseline_row_loop, main.DOC2VEC_MODEL, loop_df, job_description)
+    loop_per_row = loop_time / len(loop_rows)
+
+    print(f"rows={len(summaries)} vector_size={main.DOC2VEC_MODEL.vector_size}")
+    print(f"{'engine':<28}{'rows':>8}{'seconds':>12}{'rows/s':>12}")
+    print(f"{'row loop':<28}{len(loop_rows):>8}{loop_time:>12.3f}{len(loop_rows) / loop_time:>12.1f}")
+
+    for workers in sorted({1, args.workers}):
+        # Fresh embedding store per run so every summary is inferred
+        main.embedding_store = EmbeddingStore(Path(store_dir.name) / str(workers), args.model)
+        _, batch_time = timed(main.score_summaries, summaries, job_description, workers=workers)
+        label = f"vectorized ({workers} thread{'s' if workers > 1 else ''})"
+        print(f"{label:<28}{len(summaries):>8}{batch_time:>12.3f}{len(summaries) / batch_time:>12.1f}")
+
+    # Same pool, new job description: summary vectors come from the store
+    _, warm_time = timed(main.score_summaries, summaries, "python developer with docker and aws experience")
+    print(f"{'vectorized (stored vectors)':<28}{len(summaries):>8}{warm_time:>12.3f}{len(summaries) / warm_time:>12.1f}")
+
+    print(f"estimated row-loop time for {len(summaries)} rows: {loop_per_row * len(summaries):.3f}s")
+
+def bench_matrix(args):
+    """One score_summaries call per job vs one score_matrix multiply for all jobs"""
+    main.DOC2VEC_MODEL = load_benchmark_model(args.model)
+    store_dir = tempfile.TemporaryDirectory()
+    main.embedding_store = EmbeddingStore(Path(store_dir.name) / "store", args.model)
+    main.job_vector_cache = JobVectorCache(Path(store_dir.name) / "job_vectors.sqlite3", args.jobs)
+    summaries = synthetic_summaries(args.rows)
+    jobs = [main.MatrixJob(job_description=text) for text in synthetic_summaries(args.jobs, seed=3)]
+
+    # Warm both caches so the runs compare scoring, not inference
+    main.score_matrix(summaries, jobs)
+
+    per_job, loop_time = timed(lambda: [main.score_summaries(summaries, job.job_description)[0] for job in jobs])
+    (matrix, _), matrix_time = timed(main.score_matrix, summaries, jobs)
+    # float32 GEMM and GEMV accumulate in different orders; scores may differ by one rounding step
+    assert np.abs(np.array(per_job) - matrix).max() <= 0.01 + 1e-9
+
+    print(f"rows={len(summaries)} jobs={len(jobs)} vector_size={main.DOC2VEC_MODEL.vector_size}")
+    print(f"{'engine':<20}{'seconds':>12}{'ms/job':>12}")
+    print(f"{'per-job calls':<20}{loop_time:>12.3f}{1000 * loop_time / len(jobs):>12.2f}")
+    print(f"{'matrix':<20}{matrix_time:>12.3f}{1000 * matrix_time / len(jobs):>12.2f}")
+
+def bench_skills(args):
+    """Required-skill pre-filter and BM25 skill scoring over the inverted skill index"""
+    rng = random.Random(0)
+    vocabulary = SKILL_WORDS + ["c++", "c#", "node.js", ".net"] + [f"skill{i}" for i in range(args.vocabulary)]
+    # Zipf-like popularity: a few skills are very common, most are rare
+    weights = [1 / (rank + 1) for rank in range(len(vocabulary))]
+    index = SkillIndex()
+    _, build_time = timed(lambda: [
+        index.add(doc_id, rng.choices(vocabulary, weights=weights, k=args.skills)) for doc_id in range(args.candidates)
+    ])
+    doc_ids = range(args.candidates)
+    print(f"candidates={args.candidates} terms={len(index.postings)} build={build_time:.2f}s")
+    print(f"{'query':<44}{'matches':>10}{'ms':>10}")
+    for required in (["python"], ["python", "docker"], ["c++", "node.js"], ["python", "docker", "aws", "kubernetes"]):
+        matched, seconds = timed(index.matching, required)
+        print(f"{'filter ' + ' + '.join(required):<44}{len(matched):>10}{1000 * seconds:>10.2f}")
+    job_description = "python developer with docker, aws, c++ and node.js experience"
+    scores, seconds = timed(index.scores, job_description, doc_ids)
+    print(f"{'bm25 ' + job_description[:38]:<44}{int((scores > 0).sum()):>10}{1000 * seconds:>10.2f}")
+
+def clustered_vectors(count, dim, clusters=64, seed=0):
+    """Gaussian-mixture vectors, roughly shaped like document embeddings"""
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(clusters, dim))
+    labels = rng.integers(0, clusters, size=count)
+    return (centers[labels] + 0.6 * rng.normal(size=(count, dim))).astype(np.float32)
+
+def bench_ann(args):
+    """Recall and latency of IVF top-K retrieval against exact brute-force cosine"""
+    vectors = clustered_vectors(args.vectors + args.queries, args.dim)
+    pool, queries = vectors[:args.vectors], vectors[args.vectors:]
+    keys = [f"resume-{i}" for i in range(len(pool))]
+
+    index = IVFIndex()
+    # Incremental inserts, the way resumes arrive while parsing
+    _, build_time = timed(lambda: [index.add(keys[i:i + 500], pool[i:i + 500]) for i in range(0, len(pool), 500)])
+    print(f"vectors={len(pool)} dim={args.dim} k={args.k} cells={len(index.lists)} build={build_time:.2f}s")
+
+    exact, exact_time = timed(lambda: [{key for key, _ in index.exact_search(q, args.k)} for q in queries])
+    print(f"{'method':<16}{'recall@k':>10}{'ms/query':>12}")
+    print(f"{'exact':<16}{1.0:>10.3f}{1000 * exact_time / len(queries):>12.3f}")
+
+    for nprobe in args.nprobe:
+        approx, approx_time = timed(
+            lambda: [{key for key, _ in index.search(q, args.k, nprobe=nprobe)} for q in queries]
+        )
+        recall = np.mean([len(a & e) / len(e) for a, e in zip(approx, exact)])
+        print(f"{f'ivf nprobe={nprobe}':<16}{recall:>10.3f}{1000 * approx_time / len(queries):>12.3f}")
+
+def synthetic_result_rows(count, seed=0):
+    """Parsed-resume rows shaped like build_resume_result output"""
+    rng = random.Random(seed)
+    summaries = synthetic_summaries(count, seed=seed)
+    rows = []
+    for i, summary in enumerate(summaries):
+        skills = rng.sample(SKILL_WORDS, 10)
+        rows.append({
+            "filename": f"resume_{i}.pdf",
+            "name": f"Candidate {i}",
+            "email": f"candidate{i}@example.com",
+            "phone": f"+1 555 {i:07d}",
+            "linkedin": f"https://linkedin.com/in/candidate{i}",
+            "other_contacts": [f"https://github.com/candidate{i}"],
+            "summary": summary,
+            "key_skills": skills[:5],
+            "technical_skills": skills,
+            "soft_skills": ["communication", "teamwork"],
+            "experience_years": f"{rng.randint(0, 20)} years",
+            "education": [{"degree": "BSc Computer Science", "institution": "State University", "year": "2015"}],
+            "work_experience": [
+                {"title": "Engineer", "company": f"Company {j}", "duration": "2 years",
+                 "responsibilities": rng.sample(FILLER_WORDS, 5)}
+                for j in range(3)
+            ],
+            "status": "success",
+            "error": "",
+        })
+    return rows
+
+def bench_results(args):
+    """Load time of CSV vs Parquet result files, full rows vs the summary column only"""
+    import pandas as pd
+
+    df = pd.DataFrame(synthetic_result_rows(args.rows))
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"rows={args.rows}")
+        print(f"{'format':<10}{'size MB':>10}{'write s':>10}{'full read s':>14}{'summary read s':>16}")
+        for fmt in available_formats():
+            path = Path(tmp) / f"results{FORMAT_EXTENSIONS[fmt]}"
+            _, write_time = timed(write_results, df, path)
+            _, full_time = timed(read_results, path)
+            _, summary_time = timed(read_results, path, columns=["summary"])
+            size = path.stat().st_size / 1024 / 1024
+            print(f"{fmt:<10}{size:>10.1f}{write_time:>10.2f}{full_time:>14.3f}{summary_time:>16.3f}")
+
+class FakeGeminiResponse:
+    def __init__(self, text):
+        self.text = text
+        self.usage_metadata = None
+
+def fake_analysis(resume_text):
+    words = resume_text.split()
+    return {
+        "summary": " ".join(words[:40]),
+        "email": "", "phone": "", "linkedin": "", "other_contacts": [],
+        "education": [], "work_experience": [],
+        "technical_skills": [word for word in words if word in SKILL_WORDS][:10],
+        "soft_skills": [], "key_skills": [], "experience_years": "",
+    }
+
+def fake_generate(args, rng, calls):
+    """Stand-in for GeminiKeyClient.generate with a simulated latency per call and per resume"""
+    async def generate(client, prompt, reserved_tokens, response_schema=None):
+        sections = re.findall(
+            r"^\s*=== RESUME: (.+?) ===\n(.*?)\n=== END RESUME", prompt, re.DOTALL | re.MULTILINE
+        )
+        latency = args.latency + args.latency_per_resume * max(1, len(sections))
+        await asyncio.sleep(latency)
+        calls.append((max(1, len(sections)), latency))
+        if not sections:
+            return FakeGeminiResponse(json.dumps(fake_analysis(prompt)))
+        entries = [
+            dict(fake_analysis(text), filename=filename)
+            for filename, text in sections if rng.random() >= args.drop_rate
+        ]
+        return FakeGeminiResponse(json.dumps(entries))
+    return generate
+
+def bench_batching(args):
+    """Gemini calls per resume and call latency for each batch size, through the streaming pipeline"""
+    logging.getLogger("main").setLevel(logging.WARNING)
+    main.cache_summary_embedding = lambda summary: None
+    resumes = [
+        (f"resume_{i}.txt", f"Candidate {i}\n{summary}\n" * args.repeat)
+        for i, summary in enumerate(synthetic_summaries(args.files))
+    ]
+
+    async def file_source():
+        for filename, text in resumes:
+            yield {"filename": filename, "path": filename, "content": text.encode("utf-8")}
+
+    print(f"files={args.files} keys={args.keys} rpm={args.rpm} "
+          f"{'live Gemini' if args.live else f'simulated latency={args.latency}s+{args.latency_per_resume}s/resume'}")
+    print(f"{'batch':<7}{'calls':>7}{'calls/resume':>14}{'fallbacks':>11}{'resumes/call':>14}"
+          f"{'call latency s':>16}{'wall s':>9}{'resumes/s':>11}")
+    for batch_size in args.batch_sizes:
+        calls = []
+        main.BATCH_SIZE = batch_size
+        main.batch_stats.clear()
+        main.job_store = MemoryJobStore(ttl_seconds=3600)
+        main.job_store.create("benchmark", total_files=len(resumes))
+        if args.live:
+            main.api_distributor = main.APIKeyDistributor(main.API_KEYS)
+        else:
+            main.GeminiKeyClient.generate = fake_generate(args, random.Random(batch_size), calls)
+            main.api_distributor = main.APIKeyDistributor(["benchmark"] * args.keys)
+        for client in main.api_distributor.clients:
+            client.request_bucket = main.TokenBucket(args.rpm)
+
+        results, wall_time = timed(
+            asyncio.run, main.run_streaming_pipeline(file_source(), "benchmark", use_cache=False)
+        )
+        failed = sum(result["status"] == "failed" for result in results)
+        requests = main.batch_stats["requests"]
+        mean_latency = np.mean([latency for _, latency in calls]) if calls else float("nan")
+        print(f"{batch_size:<7}{requests:>7}{requests / len(resumes):>14.3f}{main.batch_stats['fallback_resumes']:>11}"
+              f"{main.batch_stats['llm_resumes'] / max(requests, 1):>14.2f}{mean_latency:>16.3f}"
+              f"{wall_time:>9.2f}{len(resumes) / wall_time:>11.1f}" + (f"  ({failed} failed)" if failed else ""))
+
+def skewed_corpus(directory, count, alpha, min_kb, max_kb, seed=0):
+    """Write .txt resumes with Pareto-distributed sizes (a few very large files)"""
+    rng = random.Random(seed)
+    files = []
+    for i, summary in enumerate(synthetic_summaries(count, seed=seed)):
+        size = min(max_kb, min_kb * rng.paretovariate(alpha)) * 1024
+        path = Path(directory) / f"resume_{i}.txt"
+        path.write_text((summary + "\n") * int(size // (len(summary) + 1) + 1))
+        files.append({"path": str(path), "filename": path.name, "size": path.stat().st_size})
+    return files
+
+async def run_round_robin(files, workers):
+    """The old dispatch: files split by index modulo worker up front, each worker works through its share"""
+    async def worker(worker_id, worker_files):
+        for file_info in worker_files:
+            resume_text = await main.extract_resume_text(file_info)
+            await main.analyze_resume(file_info, resume_text, worker_id, use_cache=False)
+    await asyncio.gather(*[worker(i, files[i::workers]) for i in range(workers)])
+
+def bench_dispatch(args):
+    """Job wall time on a skewed file-size corpus: static round-robin splits vs the shared work queue"""
+    logging.getLogger("main").setLevel(logging.WARNING)
+    main.cache_summary_embedding = lambda summary: None
+    main.BATCH_SIZE = 1
+    main.MAX_WORKERS = args.workers
+    main.EXTRACTION_WORKERS = args.extraction_workers
+
+    async def generate(client, prompt, reserved_tokens, response_schema=None):
+        await asyncio.sleep(args.latency + args.seconds_per_kb * len(prompt) / 1024)
+        return FakeGeminiResponse(json.dumps(fake_analysis(prompt)))
+    main.GeminiKeyClient.generate = generate
+
+    with tempfile.TemporaryDirectory() as tmp:
+        files = skewed_corpus(tmp, args.files, args.alpha, args.min_kb, args.max_kb)
+        sizes = sorted(file_info["size"] / 1024 for file_info in files)
+        slowest_file = args.latency + args.seconds_per_kb * sizes[-1]
+        print(f"files={len(files)} workers={args.workers} size KB: median={sizes[len(sizes) // 2]:.1f} "
+              f"max={sizes[-1]:.1f} total={sum(sizes):.0f}; slowest single file={slowest_file:.2f}s")
+        print(f"{'dispatch':<26}{'wall s':>9}{'wall / slowest file':>22}")
+
+        def run(label, coroutine_factory):
+            main.job_store = MemoryJobStore(ttl_seconds=3600)
+            main.job_store.create("benchmark", total_files=len(files))
+            main.api_distributor = main.APIKeyDistributor(["benchmark"])
+            for client in main.api_distributor.clients:
+                client.request_bucket = main.TokenBucket(1000000)
+                client.semaphore = asyncio.Semaphore(args.workers)
+                client.max_concurrency = args.workers
+            _, wall_time = timed(asyncio.run, coroutine_factory())
+            print(f"{label:<26}{wall_time:>9.2f}{wall_time / slowest_file:>22.2f}")
+
+        run("static round-robin", lambda: run_round_robin(files, args.workers))
+        for largest_first in (False, True):
+            main.LARGEST_FIRST = largest_first
+            ordered = main.dispatch_order(files, size=lambda file_info: file_info["size"])
+            run(
+                "shared queue, " + ("largest first" if largest_first else "fifo"),
+                lambda: main.run_streaming_pipeline(main.iter_resume_files(ordered), "benchmark", use_cache=False)
+            )
+
+def pdf_escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def pdf_bytes(pages):
+    """Minimal PDF with one Helvetica text block per page (pages are lists of lines)"""
+    page_ids = [4 + 2 * i for i in range(len(pages))]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{i} 0 R' for i in page_ids)}] /Count {len(pages)} >>".encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for page_id, lines in zip(page_ids, pages):
+        stream = "BT /F1 10 Tf 12 TL 50 780 Td " + " ".join(f"({pdf_escape(line)}) '" for line in lines) + " ET"
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_id + 1} 0 R >>".encode()
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode())
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
+
+def write_pdf(path, pages):
+    Path(path).write_bytes(pdf_bytes(pages))
+
+def resume_pages(summary, pages, lines_per_page=50):
+    """Lines of a multi-page resume built from a synthetic summary"""
+    words = summary.split()
+    return [
+        [f"Candidate resume page {page + 1}"] + [
+            " ".join(words[(line * 7) % len(words):][:12]) or summary[:60] for line in range(lines_per_page)
+        ]
+        for page in range(pages)
+    ]
+
+def extraction_corpus(directory, count, pages, seed=0):
+    """TXT, DOCX and PDF versions of the same synthetic resumes; returns {format: [paths]}"""
+    import docx
+
+    corpus = {"txt": [], "docx": [], "pdf": []}
+    for i, summary in enumerate(synthetic_summaries(count, seed=seed)):
+        content = resume_pages(summary, pages)
+        base = Path(directory) / f"resume_{i}"
+        base.with_suffix(".txt").write_text("\n\n".join("\n".join(lines) for lines in content))
+        document = docx.Document()
+        for lines in content:
+            for line in lines:
+                document.add_paragraph(line)
+        document.save(base.with_suffix(".docx"))
+        write_pdf(base.with_suffix(".pdf"), content)
+        for fmt in corpus:
+            corpus[fmt].append(str(base.with_suffix(f".{fmt}")))
+    return corpus
+
+def hang(seconds):
+    time.sleep(seconds)
+
+def bench_extraction(args):
+    """Extraction throughput per format and PDF backend, the page cap on a huge PDF, and timeout recovery"""
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = extraction_corpus(tmp, args.files, args.pages)
+        print(f"files={args.files} per format, pages={args.pages}, max_pages={args.max_pages} max_chars={args.max_chars}")
+        print(f"{'format':<16}{'files/s':>10}{'MB/s':>10}{'KB text/file':>14}")
+        runs = [(fmt, "pypdf2") for fmt in ("txt", "docx")] + [("pdf", backend) for backend in available_pdf_backends()]
+        for fmt, backend in runs:
+            paths = corpus[fmt]
+            size = sum(Path(path).stat().st_size for path in paths) / 1024 / 1024
+            texts, elapsed = timed(
+                lambda: [extract_text(path, None, args.max_pages, args.max_chars, backend) for path in paths]
+            )
+            label = fmt if fmt != "pdf" else f"pdf ({backend})"
+            text_kb = sum(len(text) for text in texts) / len(texts) / 1024
+            print(f"{label:<16}{len(paths) / elapsed:>10.1f}{size / elapsed:>10.2f}{text_kb:>14.1f}")
+
+        huge = Path(tmp) / "huge.pdf"
+        write_pdf(huge, resume_pages(synthetic_summaries(1)[0], args.huge_pages))
+        print(f"\n{args.huge_pages}-page PDF ({huge.stat().st_size / 1024 / 1024:.1f} MB)")
+        print(f"{'limits':<28}{'seconds':>10}{'chars':>10}")
+        for backend in available_pdf_backends():
+            for max_pages, max_chars in ((0, 0), (args.max_pages, args.max_chars)):
+                text, elapsed = timed(extract_text, str(huge), None, max_pages, max_chars, backend)
+                label = f"{backend}, " + (f"{max_pages} pages" if max_pages else "no limit")
+                print(f"{label:<28}{elapsed:>10.3f}{len(text):>10}")
+
+        pool = ExtractionPool(1)
+        pool.run(extract_text, (corpus["txt"][0],))
+        start = time.perf_counter()
+        try:
+            pool.run(hang, (60,), timeout=args.timeout)
+        except ExtractionTimeout:
+            pass
+        pool.run(extract_text, (corpus["txt"][0],))
+        print(f"\nhung file with timeout={args.timeout}s: worker killed, replaced and next file done "
+              f"after {time.perf_counter() - start:.2f}s (timeouts={pool.get_stats()['timeouts']})")
+
+FIRST_NAMES = ["Alex", "Sam", "Priya", "Chen", "Maria", "Omar", "Lena", "Kwame", "Yuki", "Diego"]
+LAST_NAMES = ["Smith", "Okafor", "Kumar", "Li", "Garcia", "Haddad", "Novak", "Mensah", "Tanaka", "Rossi"]
+JOB_TITLES = ["Software Engineer", "Data Scientist", "DevOps Engineer", "Backend Developer", "Frontend Developer"]
+DEGREES = ["BSc Computer Science", "MSc Data Science", "BEng Software Engineering", "MBA"]
+
+def synthetic_resume(i, rng, summary):
+    """Lines of a resume: contact header, summary, skills, 1-6 jobs and education"""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}{i}@example.com | +1 555 {i:07d} | linkedin.com/in/{first.lower()}-{last.lower()}-{i}",
+        "", "SUMMARY", summary, "", "SKILLS", ", ".join(rng.sample(SKILL_WORDS, rng.randint(5, 15))), "", "EXPERIENCE",
+    ]
+    for j in range(rng.randint(1, 6)):
+        start = rng.randint(2000, 2022)
+        lines.append(f"{rng.choice(JOB_TITLES)}, Company {rng.randint(1, 500)} ({start} - {start + rng.randint(1, 4)})")
+        lines.extend(
+            "- " + " ".join(rng.sample(SKILL_WORDS, 3) + rng.choices(FILLER_WORDS, k=8))
+            for _ in range(rng.randint(2, 5))
+        )
+    lines += ["", "EDUCATION", f"{rng.choice(DEGREES)}, State University, {rng.randint(1995, 2020)}"]
+    return lines
+
+def resume_file_bytes(lines, fmt, lines_per_page=45):
+    if fmt == "pdf":
+        return pdf_bytes([lines[start:start + lines_per_page] for start in range(0, len(lines), lines_per_page)])
+    if fmt == "docx":
+        import docx
+
+        document = docx.Document()
+        for line in lines:
+            document.add_paragraph(line)
+        buffer = io.BytesIO()
+        document.save(buffer)
+        return buffer.getvalue()
+    return "\n".join(lines).encode("utf-8")
+
+def resume_corpus(count, formats, weights, seed=0):
+    """(filename, bytes) of synthetic resumes in a weighted mix of formats"""
+    rng = random.Random(seed)
+    corpus = []
+    for i, summary in enumerate(synthetic_summaries(count, seed=seed)):
+        fmt = rng.choices(formats, weights)[0]
+        corpus.append((f"resume_{i}.{fmt}", resume_file_bytes(synthetic_resume(i, rng, summary), fmt)))
+    return corpus
+
+def sample_latency(args, rng):
+    if args.latency_dist == "fixed":
+        return args.latency
+    if args.latency_dist == "uniform":
+        return rng.uniform(0, 2 * args.latency)
+    return args.latency * rng.lognormvariate(0, args.latency_sigma)  # Median args.latency, long right tail
+
+class FakeGenerativeModel:
+    """Local stand-in for genai.GenerativeModel with simulated latency, 429s and malformed JSON"""
+    def __init__(self, args, rng):
+        self.args = args
+        self.rng = rng
+
+    async def generate_content_async(self, prompt, generation_config=None):
+        sections = re.findall(
+            r"^\s*=== RESUME: (.+?) ===\n(.*?)\n=== END RESUME", prompt, re.DOTALL | re.MULTILINE
+        )
+        if self.rng.random() < self.args.quota_rate:
+            await asyncio.sleep(sample_latency(self.args, self.rng) / 10)
+            raise main.google_exceptions.ResourceExhausted("429 Resource has been exhausted (e.g. check quota).")
+        await asyncio.sleep(sample_latency(self.args, self.rng) + self.args.latency_per_resume * max(1, len(sections)))
+        if sections:
+            text = json.dumps([dict(fake_analysis(body), filename=filename) for filename, body in sections])
+        else:
+            text = json.dumps(fake_analysis(prompt))
+        if self.rng.random() < self.args.malformed_rate:
+            # Cut off mid-response, as when the output token limit is hit
+            text = text[:self.rng.randint(1, len(text) - 1)]
+        return FakeGeminiResponse(text)
+
+def histogram_sums(histogram, label_index):
+    """Sum of a histogram's observations per value of one label"""
+    sums = defaultdict(float)
+    with histogram.lock:
+        for key, series in histogram.values.items():
+            sums[key[label_index]] += series["sum"]
+    return sums
+
+def bench_load(args):
+    """End-to-end /api/parse-resumes-zip load test against a local Gemini stand-in"""
+    from fastapi.testclient import TestClient
+
+    logging.getLogger("main").setLevel(logging.ERROR)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    main.cache_summary_embedding = lambda summary: None
+    main.RETRY_DELAY = args.retry_delay
+    rng = random.Random(args.seed)
+    main.genai.GenerativeModel = lambda model_name: FakeGenerativeModel(args, rng)
+    main.glm.GenerativeServiceAsyncClient = lambda client_options: None
+
+    # Per-file latency: from the start of its extraction to its result being recorded
+    started, finished = {}, {}
+    extract_resume_text, record_file_result = main.extract_resume_text, main.record_file_result
+
+    async def timed_extract(file_info):
+        started[file_info["filename"]] = time.monotonic()
+        return await extract_resume_text(file_info)
+
+    def timed_record(job_id, file_info, result):
+        finished[file_info["filename"]] = time.monotonic()
+        return record_file_result(job_id, file_info, result)
+
+    main.extract_resume_text, main.record_file_result = timed_extract, timed_record
+
+    corpus, corpus_time = timed(resume_corpus, max(args.files), args.formats, args.format_weights, args.seed)
+    print(f"corpus of {len(corpus)} resumes ({', '.join(args.formats)}) generated in {corpus_time:.1f}s")
+    print(f"keys={args.keys} concurrency/key={args.concurrency} rpm/key={args.rpm} batch={main.BATCH_SIZE} "
+          f"latency={args.latency_dist}({args.latency}s) 429 rate={args.quota_rate} malformed rate={args.malformed_rate}")
+    print(f"{'files':>7}{'zip MB':>8}{'wall s':>9}{'files/s':>9}{'p50 s':>8}{'p99 s':>8}{'failed':>8}"
+          f"{'calls':>7}{'429s':>6}{'malformed':>11}{'reasks':>8}{'key util':>10}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        main.UPLOAD_DIR = Path(tmp) / "uploads"
+        main.RESULTS_DIR = Path(tmp) / "results"
+        main.UPLOAD_DIR.mkdir()
+        main.RESULTS_DIR.mkdir()
+        for count in args.files:
+            archive = io.BytesIO()
+            with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zip_ref:
+                for filename, content in corpus[:count]:
+                    zip_ref.writestr(filename, content)
+
+            main.job_store = MemoryJobStore(ttl_seconds=3600)
+            main.api_distributor = main.APIKeyDistributor(
+                [f"fake-key-{i}" for i in range(args.keys)], max_concurrency_per_key=args.concurrency
+            )
+            for client in main.api_distributor.clients:
+                client.request_bucket = main.TokenBucket(args.rpm)
+            main.MAX_WORKERS = args.keys * args.concurrency
+            main.batch_stats.clear()
+            main.parse_stats.clear()
+            started.clear()
+            finished.clear()
+            busy_before = histogram_sums(main.GEMINI_REQUEST_SECONDS, 0)
+
+            # The test client runs the background parsing job before returning the response
+            response, wall_time = timed(
+                TestClient(main.app).post, "/api/parse-resumes-zip",
+                params={"use_cache": False, "add_to_pool": False},
+                files={"zip_file": ("load.zip", archive.getvalue(), "application/zip")}
+            )
+            job = main.job_store.get(response.json()["job_id"])
+            latencies = np.array([finished[name] - started[name] for name in finished if name in started])
+            busy = histogram_sums(main.GEMINI_REQUEST_SECONDS, 0)
+            utilization = [
+                (busy[client.label] - busy_before.get(client.label, 0.0)) / (wall_time * client.max_concurrency)
+                for client in main.api_distributor.clients
+            ]
+            throttled = sum(client.stats["throttled"] for client in main.api_distributor.clients)
+            malformed = main.parse_stats["repaired_responses"] + main.parse_stats["unparseable_responses"]
+            print(f"{count:>7}{len(archive.getvalue()) / 1024 / 1024:>8.1f}{wall_time:>9.2f}{count / wall_time:>9.1f}"
+                  f"{np.percentile(latencies, 50):>8.2f}{np.percentile(latencies, 99):>8.2f}{job['failed_files']:>8}"
+                  f"{main.batch_stats['requests']:>7}{throttled:>6}{malformed:>11}{main.parse_stats['reasks']:>8}"
+                  f"{np.mean(utilization):>10.2f}" + ("" if job["status"] == "completed" else f"  ({job['status']})"))
+            print("        per key: " + " ".join(
+                f"{client.label}={share:.2f}" for client, share in zip(main.api_distributor.clients, utilization)
+            ))
+
+def model_worker(model_path, mmap, barrier, results):
+    """One uvicorn-like worker process: load and warm up the model, then report its memory"""
+    logging.getLogger("gensim").setLevel(logging.WARNING)
+    before = main.process_memory_mb()
+    start = time.perf_counter()
+    model = Doc2Vec.load(model_path, mmap=mmap)
+    load_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    model.infer_vector(main.MODEL_WARMUP_TEXT.split())
+    warmup_seconds = time.perf_counter() - start
+    barrier.wait()  # Measure while every worker holds the model
+    after = main.process_memory_mb()
+    results.put({
+        "load": load_seconds,
+        "warmup": warmup_seconds,
+        "rss": after["rss_mb"] - before["rss_mb"],
+        "pss": (after["pss_mb"] or 0) - (before["pss_mb"] or 0),
+    })
+    barrier.wait()
+
+def bench_model(args):
+    """Model load/warmup time and memory per worker count, with and without memory-mapped arrays"""
+    logging.getLogger("gensim").setLevel(logging.WARNING)
+    model = load_benchmark_model(args.model, documents=args.documents, vector_size=args.vector_size, epochs=5)
+    context = multiprocessing.get_context("spawn")  # Like uvicorn --workers
+    with tempfile.TemporaryDirectory() as tmp:
+        # Arrays as separate .npy files, which is how gensim saves any real-size model
+        model_path = str(Path(tmp) / "model")
+        model.save(model_path, sep_limit=0)
+        array_mb = sum(path.stat().st_size for path in Path(tmp).glob("*.npy")) / 1024 / 1024
+        print(f"model arrays: {array_mb:.1f} MB (vector_size={model.vector_size}, docs={len(model.dv)})")
+        print(f"{'arrays':<10}{'workers':>8}{'load s':>9}{'warmup s':>10}{'model RSS MB/worker':>21}{'model PSS MB total':>20}")
+        for mmap in (None, "r"):
+            for workers in args.workers:
+                barrier = context.Barrier(workers)
+                results = context.Queue()
+                processes = [
+                    context.Process(target=model_worker, args=(model_path, mmap, barrier, results))
+                    for _ in range(workers)
+                ]
+                for process in processes:
+                    process.start()
+                stats = [results.get() for _ in processes]
+                for process in processes:
+                    process.join()
+                print(f"{'mmap' if mmap else 'in-memory':<10}{workers:>8}"
+                      f"{np.mean([s['load'] for s in stats]):>9.2f}{np.mean([s['warmup'] for s in stats]):>10.3f}"
+                      f"{np.mean([s['rss'] for s in stats]):>21.1f}{sum(s['pss'] for s in stats):>20.1f}")
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="cv_job_maching.model", help="Doc2Vec model path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    match_parser = subparsers.add_parser("match", help=bench_match.__doc__)
+    match_parser.add_argument("--rows", type=int, default=5000)
+    match_parser.add_argument("--loop-rows", type=int, default=1000,
+                              help="Rows timed with the row loop (0 = all); extrapolated to --rows")
+    match_parser.add_argument("--workers", type=int, default=4, help="Inference threads to compare against one")
+    match_parser.set_defaults(func=bench_match)
+
+    matrix_parser = subparsers.add_parser("matrix", help=bench_matrix.__doc__)
+    matrix_parser.add_argument("--rows", type=int, default=5000)
+    matrix_parser.add_argument("--jobs", type=int, default=50)
+    matrix_parser.set_defaults(func=bench_matrix)
+
+    skills_parser = subparsers.add_parser("skills", help=bench_skills.__doc__)
+    skills_parser.add_argument("--candidates", type=int, default=100000)
+    skills_parser.add_argument("--skills", type=int, default=15, help="Skills per candidate")
+    skills_parser.add_argument("--vocabulary", type=int, default=2000, help="Distinct rare skills")
+    skills_parser.set_defaults(func=bench_skills)
+
+    ann_parser = subparsers.add_parser("ann", help=bench_ann.__doc__)
+    ann_parser.add_argument("--vectors", type=int, default=50000)
+    ann_parser.add_argument("--queries", type=int, default=200)
+    ann_parser.add_argument("--dim", type=int, default=100)
+    ann_parser.add_argument("--k", type=int, default=main.DEFAULT_TOP_K)
+    ann_parser.add_argument("--nprobe", type=int, nargs="+", default=[1, 4, 8, 16, 32])
+    ann_parser.set_defaults(func=bench_ann)
+
+    results_parser = subparsers.add_parser("results", help=bench_results.__doc__)
+    results_parser.add_argument("--rows", type=int, default=100000)
+    results_parser.set_defaults(func=bench_results)
+
+    batching_parser = subparsers.add_parser("batching", help=bench_batching.__doc__)
+    batching_parser.add_argument("--files", type=int, default=200)
+    batching_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 5, 10])
+    batching_parser.add_argument("--repeat", type=int, default=5, help="Summary repetitions per synthetic resume")
+    batching_parser.add_argument("--keys", type=int, default=1, help="Simulated API keys")
+    batching_parser.add_argument("--rpm", type=int, default=600, help="Requests per minute per key")
+    batching_parser.add_argument("--latency", type=float, default=0.2, help="Simulated seconds per call")
+    batching_parser.add_argument("--latency-per-resume", type=float, default=0.1,
+                                 help="Simulated extra seconds per resume in a call")
+    batching_parser.add_argument("--drop-rate", type=float, default=0.02,
+                                 help="Fraction of batched entries the fake model leaves out")
+    batching_parser.add_argument("--live", action="store_true",
+                                 help="Call the real Gemini API with the configured keys")
+    batching_parser.set_defaults(func=bench_batching)
+
+    dispatch_parser = subparsers.add_parser("dispatch", help=bench_dispatch.__doc__)
+    dispatch_parser.add_argument("--files", type=int, default=200)
+    dispatch_parser.add_argument("--workers", type=int, default=8, help="Concurrent LLM workers")
+    dispatch_parser.add_argument("--extraction-workers", type=int, default=2)
+    dispatch_parser.add_argument("--alpha", type=float, default=1.2, help="Pareto shape of file sizes (lower = more skew)")
+    dispatch_parser.add_argument("--min-kb", type=float, default=2.0)
+    dispatch_parser.add_argument("--max-kb", type=float, default=200.0)
+    dispatch_parser.add_argument("--latency", type=float, default=0.05, help="Simulated seconds per Gemini call")
+    dispatch_parser.add_argument("--seconds-per-kb", type=float, default=0.01,
+                                 help="Simulated extra call seconds per KB of prompt")
+    dispatch_parser.set_defaults(func=bench_dispatch)
+
+    extraction_parser = subparsers.add_parser("extraction", help=bench_extraction.__doc__)
+    extraction_parser.add_argument("--files", type=int, default=50, help="Resumes per format")
+    extraction_parser.add_argument("--pages", type=int, default=3, help="Pages per resume")
+    extraction_parser.add_argument("--huge-pages", type=int, default=300, help="Pages of the oversized PDF")
+    extraction_parser.add_argument("--max-pages", type=int, default=main.EXTRACTION_MAX_PAGES)
+    extraction_parser.add_argument("--max-chars", type=int, default=main.EXTRACTION_MAX_CHARS)
+    extraction_parser.add_argument("--timeout", type=float, default=1.0, help="Seconds before a hung file is killed")
+    extraction_parser.set_defaults(func=bench_extraction)
+
+    load_parser = subparsers.add_parser("load", help=bench_load.__doc__)
+    load_parser.add_argument("--files", type=int, nargs="+", default=[100, 1000, 10000])
+    load_parser.add_argument("--formats", nargs="+", default=["txt", "pdf", "docx"])
+    load_parser.add_argument("--format-weights", type=float, nargs="+", default=[0.5, 0.35, 0.15])
+    load_parser.add_argument("--keys", type=int, default=4, help="Simulated API keys")
+    load_parser.add_argument("--concurrency", type=int, default=main.MAX_CONCURRENCY_PER_KEY,
+                             help="In-flight calls per key")
+    load_parser.add_argument("--rpm", type=int, default=1000, help="Requests per minute per key")
+    load_parser.add_argument("--latency-dist", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    load_parser.add_argument("--latency", type=float, default=1.0, help="Median seconds per call")
+    load_parser.add_argument("--latency-sigma", type=float, default=0.5, help="Spread of the lognormal latency")
+    load_parser.add_argument("--latency-per-resume", type=float, default=0.2,
+                             help="Simulated extra seconds per resume in a call")
+    load_parser.add_argument("--quota-rate", type=float, default=0.02, help="Fraction of calls answered with a 429")
+    load_parser.add_argument("--malformed-rate", type=float, default=0.02,
+                             help="Fraction of responses cut off mid-JSON")
+    load_parser.add_argument("--retry-delay", type=float, default=main.RETRY_DELAY,
+                             help="Base backoff seconds after a 429")
+    load_parser.add_argument("--seed", type=int, default=0)
+    load_parser.set_defaults(func=bench_load)
+
+    model_parser = subparsers.add_parser("model", help=bench_model.__doc__)
+    model_parser.add_argument("--model", default=main.DOC2VEC_MODEL_PATH)
+    model_parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    model_parser.add_argument("--documents", type=int, default=200000,
+                              help="Training documents of the stand-in model when the real one is missing")
+    model_parser.add_argument("--vector-size", type=int, default=100)
+    model_parser.set_defaults(func=bench_model)
+
+    return parser
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    args.func(args)
@@ -0,0 +1,200 @@
+"""
+Persistent pool of parsed candidates shared by every parsing job.
+
+Each successful result row of a parsing job is upserted into one SQLite
+table, so matching can run against every candidate seen so far instead of
+one job's result file. Candidates are deduplicated by email address, or by a
+hash of their analysis when no usable email was extracted; a newer resume of
+the same candidate replaces the older row but keeps its candidate id.
+
+The summary and skills columns are stored separately from the row so scoring
+can read the summaries of the whole pool, and the skill index can sync, without
+decoding every row. Each summary's embedding key is stored too, so top-K
+retrieval can map ANN hits back to candidates without re-hashing the pool.
+Every write bumps a pool-wide revision so in-memory indexes can pick up just
+the candidates changed since they last synced.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from skill_index import candidate_skills
+
+IDENTITY_EXCLUDED_FIELDS = ("filename", "status", "error")
+MATCH_FIELDS = ("candidate_id", "match_score", "recommendation")  # Added by matching, never stored
+
+def dedup_key(row):
+    """Identity of a candidate: their email, or a hash of the analysis without file details"""
+    email = str(row.get("email") or "").strip().lower()
+    if "@" in email:
+        return f"email:{email}"
+    content = {key: value for key, value in row.items() if key not in IDENTITY_EXCLUDED_FIELDS}
+    return f"content:{row_hash(content)}"
+
+def _canonical(value):
+    """Value as it survives any result format: empty cells, numbers and strings read back alike"""
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    return str(value)
+
+def row_hash(row):
+    return hashlib.sha1(json.dumps(_canonical(row), sort_keys=True).encode("utf-8")).hexdigest()
+
+class CandidatePool:
+    def __init__(self, db_path, summary_key=None):
+        self.db_path = str(db_path)
+        self.summary_key = summary_key  # Embedding key of a summary; without one no keys are stored
+        self.keys_backfilled = False
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS candidates (
+                candidate_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dedup_key TEXT NOT NULL UNIQUE,
+                row_hash TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                embedding_key TEXT,
+                skills TEXT NOT NULL DEFAULT '[]',
+                revision INTEGER NOT NULL DEFAULT 0,
+                row TEXT NOT NULL,
+                job_id TEXT,
+                added_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            """
+        )
+        columns = {column[1] for column in self.conn.execute("PRAGMA table_info(candidates)")}
+        if "skills" not in columns:
+            # Pools created before the skill index: add the columns and fill them from the stored rows
+            self.conn.execute("ALTER TABLE candidates ADD COLUMN skills TEXT NOT NULL DEFAULT '[]'")
+            self.conn.execute("ALTER TABLE candidates ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+            self.conn.executemany(
+                "UPDATE candidates SET skills = ?, revision = candidate_id WHERE candidate_id = ?",
+                [(json.dumps(candidate_skills(json.loads(row))), candidate_id)
+                 for candidate_id, row in self.conn.execute("SELECT candidate_id, row FROM candidates").fetchall()]
+            )
+        if "embedding_key" not in columns:
+            # Filled in on the first embedding_keys_since, when the key function is available
+            self.conn.execute("ALTER TABLE candidates ADD COLUMN embedding_key TEXT")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS candidates_revision ON candidates (revision)")
+        self.conn.commit()
+
+    def add_rows(self, rows, job_id=None):
+        """Upsert successful result rows; returns added/updated/unchanged counts and the new or changed summaries"""
+        counts = {"added": 0, "updated": 0, "unchanged": 0}
+        changed_summaries = []
+        now = time.time()
+        with self.lock:
+            for row in rows:
+                if row.get("status") != "success":
+                    continue
+                row = {field: value for field, value in row.items() if field not in MATCH_FIELDS}
+                key, digest = dedup_key(row), row_hash(row)
+                existing = self.conn.execute(
+                    "SELECT row_hash FROM candidates WHERE dedup_key = ?", (key,)
+                ).fetchone()
+                if existing is not None and existing[0] == digest:
+                    counts["unchanged"] += 1
+                    continue
+                summary = row.get("summary") or ""
+                # The revision is read inside the write transaction, so revisions become visible in order
+                self.conn.execute(
+                    "INSERT INTO candidates (dedup_key, row_hash, summary, embedding_key, skills, revision, row, job_id, "
+                    "added_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(revision), 0) + 1 FROM candidates), ?, ?, ?, ?) "
+                    "ON CONFLICT(dedup_key) DO UPDATE SET row_hash = excluded.row_hash, summary = excluded.summary, "
+                    "embedding_key = excluded.embedding_key, skills = excluded.skills, revision = excluded.revision, "
+                    "row = excluded.row, job_id = excluded.job_id, updated_at = excluded.updated_at",
+                    (key, digest, summary, self._embedding_key(summary), json.dumps(candidate_skills(row)),
+                     json.dumps(row, default=str), job_id, now, now)
+                )
+                counts["updated" if existing is not None else "added"] += 1
+                changed_summaries.append(summary)
+            self.conn.commit()
+        return counts, changed_summaries
+
+    def summaries(self):
+        """Summary of every candidate, indexed by candidate id"""
+        with self.lock:
+            rows = self.conn.execute("SELECT candidate_id, summary FROM candidates ORDER BY candidate_id").fetchall()
+        return pd.Series([summary for _, summary in rows], index=[candidate_id for candidate_id, _ in rows],
+                         name="summary", dtype=object)
+
+    def _embedding_key(self, summary):
+        if self.summary_key is None or not str(summary).strip():
+            return None
+        return self.summary_key(str(summary))
+
+    def embedding_keys_since(self, revision):
+        """(candidate id, embedding key, revision) of candidates added or updated after the given revision; None without a summary"""
+        with self.lock:
+            if not self.keys_backfilled and self.summary_key is not None:
+                # Candidates stored before the embedding_key column existed
+                rows = self.conn.execute(
+                    "SELECT candidate_id, summary FROM candidates WHERE embedding_key IS NULL"
+                ).fetchall()
+                self.conn.executemany(
+                    "UPDATE candidates SET embedding_key = ? WHERE candidate_id = ?",
+                    [(self._embedding_key(summary), candidate_id) for candidate_id, summary in rows]
+                )
+                self.conn.commit()
+                self.keys_backfilled = True
+            return self.conn.execute(
+                "SELECT candidate_id, embedding_key, revision FROM candidates WHERE revision > ? ORDER BY revision",
+                (revision,)
+            ).fetchall()
+
+    def skills_since(self, revision):
+        """(candidate id, skills, revision) of candidates added or updated after the given revision"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT candidate_id, skills, revision FROM candidates WHERE revision > ? ORDER BY revision", (revision,)
+            ).fetchall()
+        return [(candidate_id, json.loads(skills), row_revision) for candidate_id, skills, row_revision in rows]
+
+    def frame(self, candidate_ids=None):
+        """Result rows of the given candidates (in that order), or of the whole pool"""
+        with self.lock:
+            if candidate_ids is None:
+                rows = self.conn.execute("SELECT candidate_id, row FROM candidates ORDER BY candidate_id").fetchall()
+            else:
+                candidate_ids = [int(candidate_id) for candidate_id in candidate_ids]
+                rows_by_id = {}
+                # Stay under SQLite's bound-parameter limit
+                for start in range(0, len(candidate_ids), 500):
+                    chunk = candidate_ids[start:start + 500]
+                    rows_by_id.update(self.conn.execute(
+                        f"SELECT candidate_id, row FROM candidates WHERE candidate_id IN ({', '.join('?' for _ in chunk)})",
+                        chunk
+                    ).fetchall())
+                rows = [(candidate_id, rows_by_id[candidate_id]) for candidate_id in candidate_ids if candidate_id in rows_by_id]
+        return pd.DataFrame(
+            [{"candidate_id": candidate_id, **json.loads(row)} for candidate_id, row in rows],
+            index=[candidate_id for candidate_id, _ in rows]
+        )
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def get_stats(self):
+        with self.lock:
+            count, last_updated = self.conn.execute("SELECT COUNT(*), MAX(updated_at) FROM candidates").fetchone()
+            by_email = self.conn.execute(
+                "SELECT COUNT(*) FROM candidates WHERE dedup_key LIKE 'email:%'"
+            ).fetchone()[0]
+        return {
+            "candidates": count,
+            "identified_by_email": by_email,
+            "last_updated": last_updated
+        }
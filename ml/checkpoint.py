@@ -0,0 +1,49 @@
+"""
+Durable per-file checkpoint of a parsing job.
+
+Every processed file appends one JSON line (its source path and result row)
+as soon as it finishes, so a job that dies part way keeps everything it had
+already paid Gemini for. Lines are flushed to the OS on each append, which
+survives the process being killed. A resumed job loads the checkpoint and
+only processes files whose latest row is missing or failed; a retried file
+simply appends a newer line that supersedes the old one.
+"""
+import json
+import os
+import threading
+
+# Files are recorded from worker threads; one append at a time keeps every line whole
+_append_lock = threading.Lock()
+
+class ResultCheckpoint:
+    def __init__(self, path):
+        self.path = str(path)
+
+    def append(self, source_path, row):
+        line = json.dumps({"path": source_path, "row": row}) + "\n"
+        with _append_lock, open(self.path, "ab+") as f:
+            # After a crash mid-write the torn last line has no newline; never glue the next entry onto it
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    line = "\n" + line
+            f.write(line.encode("utf-8"))
+            f.flush()
+
+    def load(self):
+        """Latest row per source path, in the order files were first processed"""
+        rows = {}
+        if not os.path.exists(self.path):
+            return rows
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # A line torn by a crash mid-write; that file is simply processed again
+                rows[entry["path"]] = entry["row"]
+        return rows
+
+    def delete(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,192 @@
+"""
+Persistent store of Doc2Vec summary vectors keyed by content hash.
+
+Vectors live in an append-only float32 file that readers memory-map, next to a
+tab-separated index of ``content_hash -> row``. Everything is kept in a
+generation directory named after the model file's fingerprint, so replacing
+``cv_job_maching.model`` automatically invalidates every cached vector.
+
+Writers serialize on an ``flock`` so several uvicorn workers can share one
+store: vectors are flushed before their index lines are appended, and readers
+only consume complete index lines, so a reader never sees a row that is not
+fully on disk.
+"""
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+VECTORS_FILE = "vectors.f32"
+INDEX_FILE = "index.tsv"
+META_FILE = "meta.json"
+LOCK_FILE = ".lock"
+
+def model_fingerprint(model_path):
+    """Identify a model file by name, size and modification time"""
+    try:
+        stat = os.stat(model_path)
+    except OSError:
+        return "missing"
+    key = f"{os.path.abspath(model_path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+def content_hash(text):
+    """Hash of the text a vector was inferred from"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+class EmbeddingStore:
+    def __init__(self, root, model_path):
+        self.root = Path(root)
+        self.model_path = model_path
+        self.lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, fingerprint):
+        self.fingerprint = fingerprint
+        self.generation_dir = self.root / fingerprint if fingerprint else None
+        self.dim = None
+        self.rows = {}
+        self.keys_by_row = []
+        self.row_count = 0  # One past the highest row in the index
+        self.index_offset = 0
+        self.vectors = None
+
+    @contextmanager
+    def _file_lock(self):
+        self.generation_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.generation_dir / LOCK_FILE, "a") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _check_generation(self):
+        """Switch to the generation matching the current model file"""
+        fingerprint = model_fingerprint(self.model_path)
+        if fingerprint == self.fingerprint:
+            return
+        if self.fingerprint is not None:
+            logger.info(f"Doc2Vec model changed, invalidating embeddings {self.fingerprint} -> {fingerprint}")
+        self._reset(fingerprint)
+        self._prune_generations()
+
+    def _prune_generations(self):
+        if not self.root.exists():
+            return
+        for path in self.root.iterdir():
+            if path.is_dir() and path.name != self.fingerprint:
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _refresh(self):
+        """Pick up rows appended by this or another process"""
+        index_path = self.generation_dir / INDEX_FILE
+        if self.dim is None:
+            meta_path = self.generation_dir / META_FILE
+            if not meta_path.exists():
+                return
+            self.dim = json.loads(meta_path.read_text())["dim"]
+        if not index_path.exists():
+            return
+
+        with open(index_path, "rb") as f:
+            f.seek(self.index_offset)
+            chunk = f.read()
+        # Only consume complete lines; a writer may be mid-append
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            key, row = line.split("\t")
+            self.rows[key] = int(row)
+            self.keys_by_row.append(key)
+            self.row_count = max(self.row_count, int(row) + 1)
+        self.index_offset += len(complete)
+
+        if self.row_count and (self.vectors is None or self.vectors.shape[0] < self.row_count):
+            self.vectors = np.memmap(
+                self.generation_dir / VECTORS_FILE, dtype=np.float32, mode="r",
+                shape=(self.row_count, self.dim)
+            )
+
+    def get_many(self, keys):
+        """Return {key: vector} for the keys already in the store"""
+        with self.lock:
+            self._check_generation()
+            self._refresh()
+            return {
+                key: np.array(self.vectors[self.rows[key]])
+                for key in keys if key in self.rows
+            }
+
+    def missing(self, keys):
+        """Keys that have no stored vector yet"""
+        with self.lock:
+            self._check_generation()
+            self._refresh()
+            return [key for key in keys if key not in self.rows]
+
+    def rows_since(self, start_row):
+        """(keys, vectors, fingerprint) for every row from start_row on, in insertion order"""
+        with self.lock:
+            self._check_generation()
+            self._refresh()
+            keys = self.keys_by_row[start_row:]
+            if not keys:
+                return [], np.empty((0, self.dim or 0), dtype=np.float32), self.fingerprint
+            return keys, np.array(self.vectors[start_row:len(self.keys_by_row)]), self.fingerprint
+
+    def add_many(self, keys, vectors):
+        """Append vectors for keys that are not stored yet"""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(keys):
+            return
+        with self.lock:
+            self._check_generation()
+            with self._file_lock():
+                meta_path = self.generation_dir / META_FILE
+                if not meta_path.exists():
+                    # Readers do not take the file lock: publish meta.json whole or not at all
+                    tmp_path = meta_path.with_name(f"{META_FILE}.{os.getpid()}.tmp")
+                    tmp_path.write_text(json.dumps({"dim": vectors.shape[1], "model_path": str(self.model_path)}))
+                    os.replace(tmp_path, meta_path)
+                self._refresh()
+
+                new_keys, new_vectors, seen = [], [], set()
+                for key, vector in zip(keys, vectors):
+                    if key not in self.rows and key not in seen:
+                        seen.add(key)
+                        new_keys.append(key)
+                        new_vectors.append(vector)
+                if not new_keys:
+                    return
+
+                vectors_path = self.generation_dir / VECTORS_FILE
+                row_bytes = self.dim * np.dtype(np.float32).itemsize
+                first_row = vectors_path.stat().st_size // row_bytes if vectors_path.exists() else 0
+                with open(vectors_path, "ab") as f:
+                    f.write(np.stack(new_vectors).astype(np.float32).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(self.generation_dir / INDEX_FILE, "a", encoding="utf-8") as f:
+                    f.write("".join(f"{key}\t{first_row + i}\n" for i, key in enumerate(new_keys)))
+                self._refresh()
+
+    def __len__(self):
+        with self.lock:
+            self._check_generation()
+            self._refresh()
+            return len(self.rows)
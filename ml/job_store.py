@@ -0,0 +1,346 @@
+"""
+Job status storage shared by every uvicorn worker.
+
+``SQLiteJobStore`` is the default: one row per job with indexed status and
+expiry columns, so status polls from any worker see the same record and a
+restart does not lose jobs. ``MemoryJobStore`` keeps the old single-process
+behaviour for development. Large payloads (matched rows) are never kept in a
+job record; jobs only store the paths of their result files.
+
+Each job also has an append-only event log (one event per processed file)
+that the progress stream tails; any worker can serve a job's stream because
+the events live in the store, not in the process doing the work.
+
+Finished jobs expire ``ttl_seconds`` after they complete; their result files,
+checkpoint, kept upload and events are deleted with them.
+
+Only job state is shared. The /metrics registry, the IVF summary index and the
+BM25 skill index are still built in memory by each worker process.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import defaultdict
+
+COUNTER_FIELDS = ("total_files", "processed_files", "failed_files")
+COLUMN_FIELDS = COUNTER_FIELDS + (
+    "status", "progress_percentage", "result_csv_path", "error_message", "processing_time",
+)
+FINISHED_STATUSES = ("completed", "failed")
+
+def new_job_record(job_id, **fields):
+    """Initial status record for a job"""
+    record = {
+        "job_id": job_id,
+        "status": "pending",
+        "total_files": 0,
+        "processed_files": 0,
+        "failed_files": 0,
+        "progress_percentage": 0.0,
+        "result_csv_path": None,
+        "error_message": None,
+        "processing_time": None,
+    }
+    record.update(fields)
+    return record
+
+def progress_percentage(processed, total):
+    return round((processed / total) * 100, 2) if total else 0.0
+
+def delete_result_files(record):
+    """Remove the files a job produced; returns the deleted paths"""
+    deleted = []
+    for field in ("result_csv_path", "converted_path", "checkpoint_path", "upload_path"):
+        path = record.get(field)
+        if path and os.path.exists(path):
+            os.remove(path)
+            deleted.append(path)
+    return deleted
+
+class JobStore(ABC):
+    """Interface shared by the job store backends"""
+    def __init__(self, ttl_seconds):
+        self.ttl_seconds = ttl_seconds
+
+    @abstractmethod
+    def create(self, job_id, **fields):
+        raise NotImplementedError
+
+    @abstractmethod
+    def get(self, job_id):
+        """Job record, or None if the job does not exist"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def update(self, job_id, **fields):
+        raise NotImplementedError
+
+    @abstractmethod
+    def increment(self, job_id, **counters):
+        """Atomically add to counter fields and recompute progress; returns the updated record (or None)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def add_event(self, job_id, event, data):
+        """Append an event to the job's log; returns its id (ids only ever increase)"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def events_since(self, job_id, after_id=0, limit=500):
+        """Events of a job with an id above after_id, oldest first, as {"id", "event", "data"} dicts"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, job_id):
+        raise NotImplementedError
+
+    @abstractmethod
+    def count_by_status(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def expire(self):
+        """Delete finished jobs past their TTL; returns how many were removed"""
+        raise NotImplementedError
+
+    def __contains__(self, job_id):
+        return self.get(job_id) is not None
+
+    def _expires_at(self, fields):
+        if fields.get("status") in FINISHED_STATUSES:
+            return time.time() + self.ttl_seconds
+        return None
+
+class MemoryJobStore(JobStore):
+    def __init__(self, ttl_seconds):
+        super().__init__(ttl_seconds)
+        self.jobs = {}
+        self.expires_at = {}
+        self.events = defaultdict(list)
+        self.last_event_id = 0
+        self.lock = threading.Lock()
+
+    def create(self, job_id, **fields):
+        self.expire()
+        with self.lock:
+            self.jobs[job_id] = new_job_record(job_id, **fields)
+
+    def get(self, job_id):
+        with self.lock:
+            record = self.jobs.get(job_id)
+            return dict(record) if record is not None else None
+
+    def update(self, job_id, **fields):
+        with self.lock:
+            if job_id not in self.jobs:
+                return
+            self.jobs[job_id].update(fields)
+            # A resumed job is running again: the expiry from its earlier finish no longer applies
+            if "status" in fields:
+                expires_at = self._expires_at(fields)
+                if expires_at:
+                    self.expires_at[job_id] = expires_at
+                else:
+                    self.expires_at.pop(job_id, None)
+
+    def increment(self, job_id, **counters):
+        with self.lock:
+            record = self.jobs.get(job_id)
+            if record is None:
+                return
+            for field, amount in counters.items():
+                record[field] += amount
+            record["progress_percentage"] = progress_percentage(record["processed_files"], record["total_files"])
+            return dict(record)
+
+    def add_event(self, job_id, event, data):
+        with self.lock:
+            self.last_event_id += 1
+            self.events[job_id].append({"id": self.last_event_id, "event": event, "data": data})
+            return self.last_event_id
+
+    def events_since(self, job_id, after_id=0, limit=500):
+        with self.lock:
+            return [event for event in self.events.get(job_id, []) if event["id"] > after_id][:limit]
+
+    def delete(self, job_id):
+        with self.lock:
+            self.expires_at.pop(job_id, None)
+            self.events.pop(job_id, None)
+            return self.jobs.pop(job_id, None) is not None
+
+    def count_by_status(self):
+        with self.lock:
+            counts = {}
+            for record in self.jobs.values():
+                counts[record["status"]] = counts.get(record["status"], 0) + 1
+            return counts
+
+    def expire(self):
+        now = time.time()
+        with self.lock:
+            expired = [job_id for job_id, expires_at in self.expires_at.items() if expires_at <= now]
+            records = [self.jobs.pop(job_id) for job_id in expired if job_id in self.jobs]
+            for job_id in expired:
+                del self.expires_at[job_id]
+                self.events.pop(job_id, None)
+        for record in records:
+            delete_result_files(record)
+        return len(records)
+
+class SQLiteJobStore(JobStore):
+    def __init__(self, db_path, ttl_seconds):
+        super().__init__(ttl_seconds)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(str(db_path), check_same_thread=False, timeout=30)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                total_files INTEGER NOT NULL DEFAULT 0,
+                processed_files INTEGER NOT NULL DEFAULT 0,
+                failed_files INTEGER NOT NULL DEFAULT 0,
+                progress_percentage REAL NOT NULL DEFAULT 0,
+                result_csv_path TEXT,
+                error_message TEXT,
+                processing_time REAL,
+                extra TEXT NOT NULL DEFAULT '{}',
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                expires_at REAL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status)")
+        self.conn.execute("CREATE INDEX IF NOT EXISTS jobs_expires_at ON jobs (expires_at)")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                job_id TEXT NOT NULL,
+                event TEXT NOT NULL,
+                data TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS job_events_job ON job_events (job_id, id)")
+        self.conn.commit()
+
+    @staticmethod
+    def _split(fields):
+        columns = {key: value for key, value in fields.items() if key in COLUMN_FIELDS}
+        extra = {key: value for key, value in fields.items() if key not in COLUMN_FIELDS and key != "job_id"}
+        return columns, extra
+
+    def _to_record(self, row):
+        record = {key: row[key] for key in ("job_id",) + COLUMN_FIELDS}
+        record.update(json.loads(row["extra"]))
+        return record
+
+    def create(self, job_id, **fields):
+        self.expire()
+        columns, extra = self._split(new_job_record(job_id, **fields))
+        now = time.time()
+        names = list(columns)
+        with self.lock:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO jobs (job_id, {', '.join(names)}, extra, created_at, updated_at) "
+                f"VALUES (?, {', '.join('?' for _ in names)}, ?, ?, ?)",
+                [job_id, *columns.values(), json.dumps(extra), now, now]
+            )
+            self.conn.commit()
+
+    def get(self, job_id):
+        with self.lock:
+            row = self.conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_record(row) if row is not None else None
+
+    def update(self, job_id, **fields):
+        columns, extra = self._split(fields)
+        assignments = [f"{name} = ?" for name in columns]
+        params = list(columns.values())
+        if extra:
+            assignments.append("extra = json_patch(extra, ?)")
+            params.append(json.dumps(extra))
+        # A resumed job is running again: the expiry from its earlier finish no longer applies
+        if "status" in fields:
+            assignments.append("expires_at = ?")
+            params.append(self._expires_at(fields))
+        assignments.append("updated_at = ?")
+        params.append(time.time())
+        with self.lock:
+            self.conn.execute(f"UPDATE jobs SET {', '.join(assignments)} WHERE job_id = ?", [*params, job_id])
+            self.conn.commit()
+
+    def increment(self, job_id, **counters):
+        assignments = [f"{field} = {field} + ?" for field in counters]
+        with self.lock:
+            self.conn.execute(
+                f"UPDATE jobs SET {', '.join(assignments)}, updated_at = ? WHERE job_id = ?",
+                [*counters.values(), time.time(), job_id]
+            )
+            self.conn.execute(
+                "UPDATE jobs SET progress_percentage = CASE WHEN total_files > 0 "
+                "THEN ROUND(100.0 * processed_files / total_files, 2) ELSE 0 END WHERE job_id = ?",
+                (job_id,)
+            )
+            self.conn.commit()
+            row = self.conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_record(row) if row is not None else None
+
+    def add_event(self, job_id, event, data):
+        with self.lock:
+            event_id = self.conn.execute(
+                "INSERT INTO job_events (job_id, event, data, created_at) VALUES (?, ?, ?, ?)",
+                (job_id, event, json.dumps(data), time.time())
+            ).lastrowid
+            self.conn.commit()
+        return event_id
+
+    def events_since(self, job_id, after_id=0, limit=500):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT id, event, data FROM job_events WHERE job_id = ? AND id > ? ORDER BY id LIMIT ?",
+                (job_id, after_id, limit)
+            ).fetchall()
+        return [{"id": row["id"], "event": row["event"], "data": json.loads(row["data"])} for row in rows]
+
+    def delete(self, job_id):
+        with self.lock:
+            deleted = self.conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,)).rowcount
+            self.conn.execute("DELETE FROM job_events WHERE job_id = ?", (job_id,))
+            self.conn.commit()
+        return deleted > 0
+
+    def count_by_status(self):
+        with self.lock:
+            rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def expire(self):
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT * FROM jobs WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+            ).fetchall()
+            self.conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(row["job_id"],) for row in rows])
+            self.conn.executemany("DELETE FROM job_events WHERE job_id = ?", [(row["job_id"],) for row in rows])
+            self.conn.commit()
+        for row in rows:
+            delete_result_files(self._to_record(row))
+        return len(rows)
+
+def create_job_store(backend, db_path, ttl_seconds):
+    """Build the configured job store backend ("sqlite" or "memory")"""
+    if backend == "sqlite":
+        return SQLiteJobStore(db_path, ttl_seconds)
+    if backend == "memory":
+        return MemoryJobStore(ttl_seconds)
+    raise ValueError(f"Unknown job store backend: {backend}")
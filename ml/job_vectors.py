@@ -0,0 +1,126 @@
+"""
+Persistent cache of job-description vectors.
+
+Doc2Vec's ``infer_vector`` is stochastic, so the same job description used to
+score slightly differently on every request. Job vectors are now inferred
+deterministically (fixed seed and epochs) and cached by a hash of the
+normalized text plus the model/seed/epochs version, so repeated matching for
+one job costs no inference and always gives the same scores.
+
+A backend job posting id can be linked to the text it was matched with. When
+the posting is edited its text (and key) changes and the old vector is
+dropped; the backend can also drop it explicitly when a job is updated or
+deleted.
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+class JobVectorCache:
+    def __init__(self, db_path, max_entries):
+        self.db_path = str(db_path)
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_vectors (
+                key TEXT PRIMARY KEY,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS job_vectors_last_used ON job_vectors (last_used)")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS job_postings (
+                posting_id TEXT PRIMARY KEY,
+                key TEXT NOT NULL
+            )
+            """
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def make_key(normalized_text, version):
+        return hashlib.sha256(f"{version}\0{normalized_text}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Cached vector for key, or None"""
+        with self.lock:
+            row = self.conn.execute("SELECT vector FROM job_vectors WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.conn.execute("UPDATE job_vectors SET last_used = ? WHERE key = ?", (time.time(), key))
+            self.conn.commit()
+            return np.frombuffer(row[0], dtype=np.float32).copy()
+
+    def put(self, key, vector):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO job_vectors (key, vector, last_used) VALUES (?, ?, ?)",
+                (key, np.asarray(vector, dtype=np.float32).tobytes(), time.time())
+            )
+            self._evict()
+            self.conn.commit()
+
+    def link_posting(self, posting_id, key):
+        """Remember which text a posting was matched with; returns True if its text changed since last time"""
+        with self.lock:
+            row = self.conn.execute("SELECT key FROM job_postings WHERE posting_id = ?", (posting_id,)).fetchone()
+            if row is not None and row[0] == key:
+                return False
+            if row is not None:
+                self._drop_vector(row[0], posting_id)
+            self.conn.execute("INSERT OR REPLACE INTO job_postings (posting_id, key) VALUES (?, ?)", (posting_id, key))
+            self.conn.commit()
+            return row is not None
+
+    def invalidate_posting(self, posting_id):
+        """Forget an edited or deleted posting and its vector; returns whether it was known"""
+        with self.lock:
+            row = self.conn.execute("SELECT key FROM job_postings WHERE posting_id = ?", (posting_id,)).fetchone()
+            if row is None:
+                return False
+            self._drop_vector(row[0], posting_id)
+            self.conn.execute("DELETE FROM job_postings WHERE posting_id = ?", (posting_id,))
+            self.conn.commit()
+            return True
+
+    def _drop_vector(self, key, posting_id):
+        """Delete a posting's old vector unless another posting still uses the same text"""
+        shared = self.conn.execute(
+            "SELECT 1 FROM job_postings WHERE key = ? AND posting_id != ?", (key, posting_id)
+        ).fetchone()
+        if shared is None:
+            self.conn.execute("DELETE FROM job_vectors WHERE key = ?", (key,))
+
+    def _evict(self):
+        """Drop least recently used vectors beyond max_entries"""
+        self.conn.execute(
+            "DELETE FROM job_vectors WHERE key IN (SELECT key FROM job_vectors ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,)
+        )
+
+    def get_stats(self):
+        with self.lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM job_vectors").fetchone()[0]
+            postings = self.conn.execute("SELECT COUNT(*) FROM job_postings").fetchone()[0]
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "entries": entries,
+                "postings": postings,
+                "max_entries": self.max_entries
+            }
@@ -1,9 +1,10 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File
+from fastapi import FastAPI, HTTPException, BackgroundTasks, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import os
+import copy
 import json
 import re
 import numpy as np
@@ -15,25 +16,49 @@ import pandas as pd
 import asyncio
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
-from queue import Queue
 import uuid
+import hashlib
 from datetime import datetime, timedelta
 import random
-from collections import defaultdict
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
 import zipfile
-import tempfile
-import shutil
 
 # Document processing
-from PyPDF2 import PdfReader
-import docx
 import google.generativeai as genai
+from google.ai import generativelanguage as glm
+from google.api_core import exceptions as google_exceptions
 from dotenv import load_dotenv
 # For vectorization
 from gensim.models.doc2vec import Doc2Vec
+from embedding_store import EmbeddingStore, content_hash, model_fingerprint
+from ann_index import IVFIndex
+from analysis_cache import AnalysisCache
+from resume_analysis import ANALYSIS_FIELDS, REQUIRED_FIELDS, load_json, response_schema, validate_analysis
+from resume_preprocessing import CONTACT_FIELDS, estimate_tokens, prepare_resume_text
+from text_extraction import ExtractionCrash, ExtractionPool, ExtractionTimeout, available_pdf_backends, extract_text
+from job_store import create_job_store, delete_result_files, progress_percentage
+from checkpoint import ResultCheckpoint
+from candidate_pool import CandidatePool
+from job_vectors import JobVectorCache
+from skill_index import SKILL_FIELDS, SkillIndex, candidate_skills
+from summary_keys import SummaryKeys
+from metrics import Counter, Gauge, Histogram, render as render_metrics
+from result_io import (
+    FORMAT_EXTENSIONS, MEDIA_TYPES, available_formats, convert_results, fill_missing, read_result_records,
+    read_result_page, read_result_rows, read_results, records_from_frame, result_columns, result_format,
+    write_results
+)
+
+@asynccontextmanager
+async def lifespan(app):
+    """Start loading the matching model in the background, so the first match request does not pay for it"""
+    if PRELOAD_DOC2VEC_MODEL:
+        asyncio.get_running_loop().run_in_executor(None, preload_doc2vec_model)
+    yield
 
 # Initialize FastAPI app
-app = FastAPI(title="Resume Processing API")
+app = FastAPI(title="Resume Processing API", lifespan=lifespan)
 
 # Configure CORS
 app.add_middleware(
@@ -62,67 +87,371 @@ if not API_KEYS:
     API_KEYS = [os.getenv("GOOGLE_API_KEY")]
 
 # Configuration
-BATCH_SIZE = 5  # Fixed batch size
-MAX_WORKERS = 5  # Use all 5 API keys
+BATCH_SIZE = int(os.getenv("BATCH_SIZE", "5"))  # Resumes per Gemini request (1 = one call per resume)
+BATCH_TOKEN_BUDGET = int(os.getenv("BATCH_TOKEN_BUDGET", "24000"))  # Max estimated resume tokens per batched request
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "6000"))  # Resume text tokens sent to Gemini per resume (0 = no limit)
+LOCAL_CONTACT_EXTRACTION = os.getenv("LOCAL_CONTACT_EXTRACTION", "true").lower() == "true"  # Find contacts with regexes instead of asking Gemini
+BATCH_WAIT_SECONDS = float(os.getenv("BATCH_WAIT_SECONDS", "0.5"))  # How long a batch waits for more texts after its first one
+MAX_CONCURRENCY_PER_KEY = int(os.getenv("MAX_CONCURRENCY_PER_KEY", "20"))  # In-flight Gemini calls per key
+MAX_WORKERS = len(API_KEYS) * MAX_CONCURRENCY_PER_KEY  # Concurrent resume tasks across all keys
+EXTRACTION_WORKERS = int(os.getenv("EXTRACTION_WORKERS", str(os.cpu_count() or 1)))  # Text extraction processes
+EXTRACTION_TIMEOUT_SECONDS = float(os.getenv("EXTRACTION_TIMEOUT_SECONDS", "60"))  # Per file; its extraction process is killed after this (0 = no limit)
+EXTRACTION_MAX_PAGES = int(os.getenv("EXTRACTION_MAX_PAGES", "20"))  # PDF pages read per file (0 = all)
+EXTRACTION_MAX_CHARS = int(os.getenv("EXTRACTION_MAX_CHARS", "200000"))  # Characters extracted per file (0 = no limit)
+PDF_BACKEND = os.getenv("PDF_BACKEND", "pypdf2")  # "pypdf2" or "pymupdf" (faster, needs PyMuPDF)
+LARGEST_FIRST = os.getenv("LARGEST_FIRST", "true").lower() == "true"  # Dispatch the biggest files first to shorten the job's tail
+FAILED_FILE_RETRIES = int(os.getenv("FAILED_FILE_RETRIES", "1"))  # Extra passes over failed files before a parsing job finishes
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "600"))  # A processing job without progress this long counts as dead and can be resumed
+GEMINI_MODEL_NAME = "gemini-1.5-flash"
 RETRY_ATTEMPTS = 3
 RETRY_DELAY = 5
+RETRY_MAX_DELAY = 60
+GEMINI_RPM_LIMIT = int(os.getenv("GEMINI_RPM_LIMIT", "15"))  # Requests per minute per key
+GEMINI_TPM_LIMIT = int(os.getenv("GEMINI_TPM_LIMIT", "1000000"))  # Tokens per minute per key
+ESTIMATED_OUTPUT_TOKENS = 1000  # Reserved per call until the real usage is known
+MATCH_INFERENCE_WORKERS = int(os.getenv("MATCH_INFERENCE_WORKERS", "1"))  # Threads for Doc2Vec inference (measure with benchmark.py match --workers)
+INFERENCE_CHUNK_SIZE = 256  # Summaries per inference task / progress update
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "8"))  # IVF cells scanned per top-K query
+RESULT_KEY_CACHE_FILES = int(os.getenv("RESULT_KEY_CACHE_FILES", "8"))  # Result files whose summary keys stay in memory for top-K queries
+DEFAULT_TOP_K = 50
+MATCH_SEMANTIC_WEIGHT = float(os.getenv("MATCH_SEMANTIC_WEIGHT", "1.0"))  # Share of the Doc2Vec similarity in match scores
+# Share of the BM25 skill score in match scores. Off by default: the recommendation buckets are calibrated
+# for pure cosine scores, so blending is opt-in (here or per request, e.g. lexical_weight=0.3)
+MATCH_LEXICAL_WEIGHT = float(os.getenv("MATCH_LEXICAL_WEIGHT", "0.0"))
+HYBRID_RERANK_FACTOR = int(os.getenv("HYBRID_RERANK_FACTOR", "5"))  # Top-K re-ranks this many times K semantic candidates by the blended score
+DEFAULT_RESULTS_PAGE_SIZE = 50
+MAX_RESULTS_PAGE_SIZE = 1000  # Rows per page of /api/results
 MAX_FILE_SIZE = 100 * 1024 * 1024  # 100MB max file size
+DOC2VEC_MODEL_PATH = os.getenv("DOC2VEC_MODEL_PATH", "cv_job_maching.model")
+DOC2VEC_MMAP = os.getenv("DOC2VEC_MMAP", "r") or None  # Memory-map the model's arrays so worker processes share them ("" to load into memory)
+PRELOAD_DOC2VEC_MODEL = os.getenv("PRELOAD_DOC2VEC_MODEL", "true").lower() == "true"  # Load and warm up the model at startup
+JOB_VECTOR_SEED = int(os.getenv("JOB_VECTOR_SEED", "42"))  # Job-description vectors are inferred deterministically
+JOB_VECTOR_EPOCHS = int(os.getenv("JOB_VECTOR_EPOCHS", "0"))  # Inference epochs for job vectors (0 = the model's own)
+JOB_VECTOR_CACHE_PATH = Path(os.getenv("JOB_VECTOR_CACHE_PATH", "job_vectors.sqlite3"))
+JOB_VECTOR_CACHE_MAX_ENTRIES = int(os.getenv("JOB_VECTOR_CACHE_MAX_ENTRIES", "10000"))
+MODEL_WARMUP_TEXT = "experienced python developer with strong background in building scalable systems"
+EMBEDDINGS_DIR = Path("embeddings")
+ANALYSIS_CACHE_PATH = Path(os.getenv("ANALYSIS_CACHE_PATH", "analysis_cache.sqlite3"))
+ANALYSIS_CACHE_MAX_MB = int(os.getenv("ANALYSIS_CACHE_MAX_MB", "512"))
+CANDIDATE_POOL_PATH = Path(os.getenv("CANDIDATE_POOL_PATH", "candidate_pool.sqlite3"))
+JOB_STORE_BACKEND = os.getenv("JOB_STORE", "sqlite")  # "sqlite" (shared by workers) or "memory"
+JOB_STORE_PATH = Path(os.getenv("JOB_STORE_PATH", "jobs.sqlite3"))
+JOB_TTL_HOURS = float(os.getenv("JOB_TTL_HOURS", "24"))  # Finished jobs and their files are kept this long
+RESULT_FORMAT = os.getenv("RESULT_FORMAT", "csv")  # "csv" or "parquet" (needs pyarrow)
+EVENT_POLL_INTERVAL = 0.5  # Seconds between event log reads of a progress stream
+EVENT_KEEPALIVE_SECONDS = 15  # Comment line sent on idle progress streams so proxies keep them open
 UPLOAD_DIR = Path("uploads")
-TEMP_DIR = Path("temp")
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Uploads are streamed to disk in 1MB chunks
+SUPPORTED_EXTENSIONS = {'.pdf', '.doc', '.docx', '.txt'}
 
 # Create directories
 RESULTS_DIR = Path("results")
 RESULTS_DIR.mkdir(exist_ok=True)
 UPLOAD_DIR.mkdir(exist_ok=True)
-TEMP_DIR.mkdir(exist_ok=True)
 
 # Initialize logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+if RESULT_FORMAT not in available_formats():
+    logger.warning(f"Result format '{RESULT_FORMAT}' is not available, writing CSV instead")
+    RESULT_FORMAT = "csv"
+
+if PDF_BACKEND not in available_pdf_backends():
+    logger.warning(f"PDF backend '{PDF_BACKEND}' is not available, using pypdf2 instead")
+    PDF_BACKEND = "pypdf2"
+
+# Killable processes for CPU-bound text extraction (created on first use)
+EXTRACTION_POOL = None
+
 # Cache the Doc2Vec model
 DOC2VEC_MODEL = None
+DOC2VEC_MODEL_FINGERPRINT = None
+DOC2VEC_MODEL_LOCK = threading.Lock()
+# Readiness of the model for /health: not_loaded -> loading -> ready (or failed)
+model_status = {"state": "not_loaded", "load_seconds": None, "warmup_seconds": None, "error": None}
+
+# Match score buckets
+LOW_MATCH_THRESHOLD = 50
+GOOD_MATCH_THRESHOLD = 70
+LOW_MATCH_RECOMMENDATION = "Low match - modify CV"
+GOOD_MATCH_RECOMMENDATION = "Good match - can improve"
+EXCELLENT_MATCH_RECOMMENDATION = "Excellent match - submit CV"
+
+class TokenBucket:
+    """Continuously refilling quota of ``per_minute`` units (burst up to one minute's worth)"""
+    def __init__(self, per_minute):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def fill_ratio(self):
+        self._refill()
+        return self.tokens / self.capacity
+    
+    def wait_time(self, amount):
+        """Seconds until ``amount`` units are available"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.rate)
+    
+    def consume(self, amount):
+        self._refill()
+        self.tokens -= amount
+
+def is_quota_error(error):
+    if isinstance(error, (google_exceptions.ResourceExhausted, google_exceptions.TooManyRequests)):
+        return True
+    return "429" in str(error) or "quota" in str(error).lower()
+
+class GeminiKeyClient:
+    """Gemini requests bound to a single API key through its own async client.
+    
+    Keeps keys out of the global ``genai.configure`` state, so any number of
+    keys can be used concurrently from one event loop. Each key tracks its own
+    requests-per-minute and tokens-per-minute quota.
+    """
+    def __init__(self, api_key, label, max_concurrency, rpm_limit=GEMINI_RPM_LIMIT, tpm_limit=GEMINI_TPM_LIMIT):
+        self.api_key = api_key
+        self.label = label
+        self.max_concurrency = max_concurrency
+        self.semaphore = asyncio.Semaphore(max_concurrency)
+        self.in_flight = 0
+        self.request_bucket = TokenBucket(rpm_limit)
+        self.token_bucket = TokenBucket(tpm_limit)
+        self.cooldown_until = 0.0
+        self.recent_requests = deque()
+        self.stats = defaultdict(int)
+        self._client = None
+    
+    @property
+    def client(self):
+        # Created lazily so the async transport binds to the running event loop
+        if self._client is None:
+            self._client = glm.GenerativeServiceAsyncClient(client_options={"api_key": self.api_key})
+        return self._client
+    
+    @staticmethod
+    def build_request(prompt, response_schema=None):
+        """GenerateContentRequest for a JSON-mode prompt, with the schema converted as GenerativeModel would"""
+        generation_config = genai.types.generation_types.to_generation_config_dict(
+            genai.GenerationConfig(response_mime_type="application/json", response_schema=response_schema)
+        )
+        return glm.GenerateContentRequest(
+            model=f"models/{GEMINI_MODEL_NAME}",
+            contents=[glm.Content(role="user", parts=[glm.Part(text=prompt)])],
+            generation_config=generation_config
+        )
+    
+    def wait_time(self, tokens):
+        """Seconds until this key may send a request of ``tokens`` tokens"""
+        return max(
+            self.cooldown_until - time.monotonic(),
+            self.request_bucket.wait_time(1),
+            self.token_bucket.wait_time(tokens),
+            0.0
+        )
+    
+    def headroom(self):
+        """Fraction of quota and concurrency left; higher means less loaded"""
+        free_slots = 1 - self.in_flight / self.max_concurrency
+        return min(self.request_bucket.fill_ratio(), self.token_bucket.fill_ratio(), free_slots)
+    
+    def reserve(self, tokens):
+        self.request_bucket.consume(1)
+        self.token_bucket.consume(tokens)
+    
+    def back_off(self, attempt):
+        """Exponential backoff with jitter after a quota error"""
+        delay = min(RETRY_MAX_DELAY, RETRY_DELAY * (2 ** attempt))
+        delay = delay / 2 + random.uniform(0, delay / 2)
+        self.cooldown_until = max(self.cooldown_until, time.monotonic() + delay)
+        self.stats["throttled"] += 1
+        return delay
+    
+    async def generate(self, prompt, reserved_tokens, response_schema=None):
+        async with self.semaphore:
+            self.in_flight += 1
+            start = time.perf_counter()
+            try:
+                response = genai.types.AsyncGenerateContentResponse.from_response(
+                    await self.client.generate_content(self.build_request(prompt, response_schema))
+                )
+            except Exception as e:
+                # Failed calls keep their request slot but give the reserved tokens back
+                self.token_bucket.consume(-reserved_tokens)
+                self.stats["errors"] += 1
+                GEMINI_REQUEST_SECONDS.observe(
+                    time.perf_counter() - start, key=self.label, outcome="quota" if is_quota_error(e) else "error"
+                )
+                raise
+            finally:
+                self.in_flight -= 1
+        GEMINI_REQUEST_SECONDS.observe(time.perf_counter() - start, key=self.label, outcome="ok")
+        
+        # Settle the reservation against the real usage when it is reported
+        usage = getattr(response, "usage_metadata", None)
+        used_tokens = getattr(usage, "total_token_count", 0) or reserved_tokens
+        self.token_bucket.consume(used_tokens - reserved_tokens)
+        self.stats["requests"] += 1
+        self.stats["tokens"] += used_tokens
+        self.recent_requests.append(time.monotonic())
+        return response
+    
+    def get_stats(self):
+        cutoff = time.monotonic() - 60
+        while self.recent_requests and self.recent_requests[0] < cutoff:
+            self.recent_requests.popleft()
+        return {
+            "requests": self.stats["requests"],
+            "tokens": self.stats["tokens"],
+            "throttled": self.stats["throttled"],
+            "errors": self.stats["errors"],
+            "requests_last_minute": len(self.recent_requests),
+            "in_flight": self.in_flight,
+            "rpm_headroom": round(self.request_bucket.fill_ratio(), 3),
+            "tpm_headroom": round(self.token_bucket.fill_ratio(), 3),
+            "cooling_down": self.cooldown_until > time.monotonic()
+        }
 
-# Thread-safe API key distributor
+# Rate-limit aware API key scheduler (runs on the event loop, so no locking is needed)
 class APIKeyDistributor:
-    def __init__(self, api_keys):
+    def __init__(self, api_keys, max_concurrency_per_key=MAX_CONCURRENCY_PER_KEY):
         self.api_keys = api_keys
-        self.key_queue = Queue()
+        self.clients = [
+            GeminiKeyClient(key, f"key_{i + 1}", max_concurrency_per_key)
+            for i, key in enumerate(api_keys)
+        ]
         self.usage_stats = defaultdict(int)
-        self.lock = threading.Lock()
-        
-        # Initialize queue
-        for key in api_keys:
-            self.key_queue.put(key)
     
-    def get_api_key(self):
-        """Get an API key (blocks until available)"""
-        key = self.key_queue.get()
-        with self.lock:
-            self.usage_stats[key] += 1
-        return key
+    async def acquire(self, tokens):
+        """Wait for the key with the most headroom that can take this request now"""
+        while True:
+            ready = [client for client in self.clients if client.wait_time(tokens) == 0]
+            if ready:
+                client = max(ready, key=lambda c: c.headroom())
+                client.reserve(tokens)
+                self.usage_stats[client.label] += 1
+                return client
+            await asyncio.sleep(min(1.0, min(client.wait_time(tokens) for client in self.clients)))
     
-    def return_api_key(self, key):
-        """Return API key to queue"""
-        self.key_queue.put(key)
+    async def generate(self, prompt, output_tokens=ESTIMATED_OUTPUT_TOKENS, response_schema=None):
+        """Send a prompt (in JSON mode) through the scheduler, retrying quota errors on the freest key"""
+        tokens = estimate_tokens(prompt) + output_tokens
+        for attempt in range(RETRY_ATTEMPTS + 1):
+            client = await self.acquire(tokens)
+            try:
+                return await client.generate(prompt, tokens, response_schema)
+            except Exception as e:
+                if not is_quota_error(e) or attempt == RETRY_ATTEMPTS:
+                    raise
+                delay = client.back_off(attempt)
+                logger.warning(f"Quota error on {client.label}, backing off {delay:.1f}s (attempt {attempt + 1})")
     
     def get_stats(self):
-        with self.lock:
-            return dict(self.usage_stats)
+        return dict(self.usage_stats)
+    
+    def get_key_stats(self):
+        return {client.label: client.get_stats() for client in self.clients}
 
 # Initialize API key distributor
 api_distributor = APIKeyDistributor(API_KEYS)
 
-# Job tracking
-job_status = {}
+# Gemini analysis calls vs resumes sent to the LLM, to see how much batching saves
+batch_stats = defaultdict(int)
+
+# Malformed responses repaired locally vs fields that had to be asked for again
+parse_stats = defaultdict(int)
+
+# Resume tokens extracted vs actually put into prompts
+prompt_stats = defaultdict(int)
+
+# Hot-path timings and load for /metrics
+EXTRACTION_SECONDS = Histogram("resume_extraction_seconds", "Text extraction and preprocessing time per file", ["outcome"])
+GEMINI_REQUEST_SECONDS = Histogram("gemini_request_seconds", "Gemini call latency per API key", ["key", "outcome"])
+GEMINI_PARSE_FAILURES = Counter("gemini_json_parse_failures_total", "Malformed Gemini JSON responses", ["kind"])
+DOC2VEC_INFERENCE_SECONDS = Histogram("doc2vec_inference_seconds", "Doc2Vec infer_vector time per text", ["kind"])
+MATCH_SCORING_SECONDS = Histogram("match_scoring_seconds", "Time to score candidates against job descriptions", ["mode"])
+RESULT_WRITE_SECONDS = Histogram("result_write_seconds", "Result file write time", ["format"])
+JOB_SECONDS = Histogram("job_seconds", "Wall time of parsing and matching jobs", ["kind", "status"])
+PIPELINE_QUEUE_DEPTH = Gauge("pipeline_queue_depth", "Items waiting for a pipeline stage, over all running jobs", ["stage"])
+EXTRACTIONS_IN_FLIGHT = Gauge("resume_extractions_in_flight", "Files being extracted")
+GEMINI_IN_FLIGHT = Gauge("gemini_requests_in_flight", "Gemini calls in progress per API key", ["key"])
+JOBS = Gauge("jobs", "Jobs in the job store by status", ["status"])
+
+# Pipelines of the jobs running in this process, for the queue-depth gauge
+active_pipelines = set()
+
+# Summary vectors shared across jobs (and uvicorn workers)
+embedding_store = EmbeddingStore(EMBEDDINGS_DIR, DOC2VEC_MODEL_PATH)
+
+# ANN index over the stored summary vectors, for top-K retrieval
+candidate_index = IVFIndex(nprobe=ANN_NPROBE)
+
+# Gemini analyses keyed by resume content, shared across uploads
+analysis_cache = AnalysisCache(ANALYSIS_CACHE_PATH, ANALYSIS_CACHE_MAX_MB * 1024 * 1024)
+
+# Job tracking, shared across uvicorn workers
+job_store = create_job_store(JOB_STORE_BACKEND, JOB_STORE_PATH, JOB_TTL_HOURS * 3600)
+
+# Every candidate parsed so far, deduplicated, for matching across jobs
+# (each summary's embedding key is stored with it, computed as ensure_summary_vectors does)
+candidate_pool = CandidatePool(CANDIDATE_POOL_PATH, summary_key=lambda summary: content_hash(clean_text(summary)))
+
+# Inverted index over the pool's skills, for lexical scoring and required-skill filters
+skill_index = SkillIndex()
+
+# Embedding keys of the pool's candidates and of recently searched result files, for mapping ANN hits to rows
+pool_summary_keys = SummaryKeys()
+result_summary_keys = {}  # (path, size, mtime) -> SummaryKeys, oldest first
+result_summary_keys_lock = threading.Lock()
+
+# Deterministic job-description vectors, keyed by normalized text (and linked to backend job ids)
+job_vector_cache = JobVectorCache(JOB_VECTOR_CACHE_PATH, JOB_VECTOR_CACHE_MAX_ENTRIES)
 
 # Models
 class ResumeParsingRequest(BaseModel):
     folder_path: str
+    use_cache: bool = True
+    add_to_pool: bool = True
 
 class JobMatchingRequest(BaseModel):
-    csv_file_path: str
+    csv_file_path: Optional[str] = None  # Omit to match against the whole candidate pool
+    job_description: str
+    job_posting_id: Optional[str] = None  # Backend job id; an edited job's cached vector is dropped
+    required_skills: List[str] = []  # Only candidates listing all of these are scored
+    semantic_weight: Optional[float] = None  # Defaults to MATCH_SEMANTIC_WEIGHT
+    lexical_weight: Optional[float] = None  # Defaults to MATCH_LEXICAL_WEIGHT
+
+class TopCandidatesRequest(BaseModel):
+    csv_file_path: Optional[str] = None  # Omit to search the whole candidate pool
     job_description: str
+    top_k: int = DEFAULT_TOP_K
+    job_posting_id: Optional[str] = None
+    required_skills: List[str] = []
+    semantic_weight: Optional[float] = None
+    lexical_weight: Optional[float] = None
+
+class MatrixJob(BaseModel):
+    job_description: str
+    job_posting_id: Optional[str] = None
+    required_skills: List[str] = []
+
+class MatchMatrixRequest(BaseModel):
+    csv_file_path: Optional[str] = None  # Omit to score the whole candidate pool
+    jobs: List[MatrixJob]
+    top_k: Optional[int] = None  # Top matches per job instead of every candidate's score
+    semantic_weight: Optional[float] = None
+    lexical_weight: Optional[float] = None
+
+class PoolImportRequest(BaseModel):
+    csv_file_path: str
 
 class JobStatus(BaseModel):
     job_id: str
@@ -134,53 +463,101 @@ class JobStatus(BaseModel):
     result_csv_path: Optional[str] = None
     error_message: Optional[str] = None
     processing_time: Optional[float] = None
+    pipeline: Optional[Dict[str, Any]] = None
+    prompt_tokens: Optional[Dict[str, int]] = None
+    candidate_pool: Optional[Dict[str, int]] = None
 
 # Helper functions
 def load_doc2vec_model():
-    """Load and cache the Doc2Vec model"""
-    global DOC2VEC_MODEL
-    if DOC2VEC_MODEL is None:
-        logger.info("Loading Doc2Vec model...")
-        try:
-            DOC2VEC_MODEL = Doc2Vec.load("cv_job_maching.model")
-            logger.info("Model loaded successfully")
-        except Exception as e:
-            logger.error(f"Error loading model: {e}")
-            raise HTTPException(status_code=500, detail="Failed to load matching model")
+    """Load and cache the Doc2Vec model (reloaded when the model file changes)"""
+    global DOC2VEC_MODEL, DOC2VEC_MODEL_FINGERPRINT
+    with DOC2VEC_MODEL_LOCK:
+        if DOC2VEC_MODEL is not None and DOC2VEC_MODEL_FINGERPRINT is not None:
+            if model_fingerprint(DOC2VEC_MODEL_PATH) != DOC2VEC_MODEL_FINGERPRINT:
+                logger.info("Doc2Vec model file changed, reloading")
+                DOC2VEC_MODEL = None
+        if DOC2VEC_MODEL is None:
+            logger.info("Loading Doc2Vec model...")
+            model_status["state"] = "loading"
+            try:
+                start = time.perf_counter()
+                DOC2VEC_MODEL_FINGERPRINT = model_fingerprint(DOC2VEC_MODEL_PATH)
+                # Arrays saved as separate .npy files (gensim does this for any over 10MB) are mapped
+                # read-only, so every worker process shares one copy through the page cache
+                model = Doc2Vec.load(DOC2VEC_MODEL_PATH, mmap=DOC2VEC_MMAP)
+                load_seconds = time.perf_counter() - start
+                
+                # One inference pages in the vectors and sets up gensim's inference path
+                start = time.perf_counter()
+                model.infer_vector(MODEL_WARMUP_TEXT.split())
+                warmup_seconds = time.perf_counter() - start
+                
+                DOC2VEC_MODEL = model
+                model_status.update(
+                    state="ready", load_seconds=round(load_seconds, 3), warmup_seconds=round(warmup_seconds, 3), error=None
+                )
+                logger.info(f"Model loaded successfully in {load_seconds:.2f}s (warmup {warmup_seconds:.2f}s)")
+            except Exception as e:
+                model_status.update(state="failed", error=str(e))
+                logger.error(f"Error loading model: {e}")
+                raise HTTPException(status_code=500, detail="Failed to load matching model")
     return DOC2VEC_MODEL
 
-def extract_zip_file(zip_file_path, extract_to_path):
-    """Extract ZIP file and return list of resume files"""
-    supported_extensions = {'.pdf', '.doc', '.docx', '.txt'}
-    resume_files = []
-    
+def preload_doc2vec_model():
+    """Startup preload; a failure is only reported through /health and retried by the first match request"""
     try:
-        with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
-            # Extract all files
-            zip_ref.extractall(extract_to_path)
-            
-            # Find all resume files in extracted content
-            extract_path = Path(extract_to_path)
-            for file_path in extract_path.rglob('*'):
-                if file_path.is_file() and file_path.suffix.lower() in supported_extensions:
-                    # Skip hidden files and __MACOSX folder (common in ZIP files)
-                    if not any(part.startswith('.') or part.startswith('__MACOSX') for part in file_path.parts):
-                        resume_files.append({
-                            "path": str(file_path),
-                            "filename": file_path.name
-                        })
-        
-        logger.info(f"Extracted ZIP and found {len(resume_files)} resume files")
-        return resume_files
-        
+        load_doc2vec_model()
+    except Exception:
+        pass
+
+def process_memory_mb():
+    """Resident and proportional (shared pages split between processes) memory of this process, where available"""
+    memory = {}
+    for path, fields in (("/proc/self/status", ("VmRSS",)), ("/proc/self/smaps_rollup", ("Pss",))):
+        try:
+            with open(path) as f:
+                for line in f:
+                    name, _, value = line.partition(":")
+                    if name in fields:
+                        memory[name.lower()] = round(int(value.split()[0]) / 1024, 1)
+        except OSError:
+            pass
+    return {"rss_mb": memory.get("vmrss"), "pss_mb": memory.get("pss")}
+
+def list_zip_resume_members(zip_ref):
+    """Resume entries of an open ZIP archive, read from its central directory only"""
+    members = []
+    for info in zip_ref.infolist():
+        member_path = Path(info.filename)
+        if info.is_dir() or member_path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+            continue
+        # Skip hidden files and __MACOSX folder (common in ZIP files)
+        if any(part.startswith('.') or part.startswith('__MACOSX') for part in member_path.parts):
+            continue
+        members.append(info)
+    return members
+
+def open_zip_file(zip_file_path):
+    """Open a ZIP archive without extracting it"""
+    try:
+        return zipfile.ZipFile(zip_file_path, 'r')
     except zipfile.BadZipFile:
         raise ValueError("Invalid ZIP file")
     except Exception as e:
-        raise ValueError(f"Error extracting ZIP file: {str(e)}")
+        raise ValueError(f"Error opening ZIP file: {str(e)}")
+
+async def iter_zip_resumes(zip_ref, members):
+    """Yield resume entries one at a time, reading each member's bytes lazily"""
+    for info in members:
+        file_info = {"filename": Path(info.filename).name, "path": info.filename}
+        try:
+            file_info["content"] = await asyncio.to_thread(zip_ref.read, info)
+        except Exception as e:
+            file_info["read_error"] = f"Error reading {info.filename} from ZIP: {str(e)}"
+        yield file_info
 
 def get_resume_files(folder_path):
     """Get all resume files from folder (kept for backward compatibility)"""
-    supported_extensions = {'.pdf', '.doc', '.docx', '.txt'}
     resume_files = []
     
     folder = Path(folder_path)
@@ -188,189 +565,580 @@ def get_resume_files(folder_path):
         raise ValueError(f"Folder does not exist: {folder_path}")
     
     for file_path in folder.rglob('*'):
-        if file_path.is_file() and file_path.suffix.lower() in supported_extensions:
+        if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_EXTENSIONS:
             resume_files.append({
                 "path": str(file_path),
-                "filename": file_path.name
+                "filename": file_path.name,
+                "size": file_path.stat().st_size
             })
     
     logger.info(f"Found {len(resume_files)} resume files")
     return resume_files
 
-def extract_text_from_file(file_path):
-    """Extract text from different file types"""
-    file_extension = os.path.splitext(file_path)[1].lower()
-    
-    try:
-        if file_extension == ".txt":
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
-        elif file_extension == ".pdf":
-            pdf = PdfReader(file_path)
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text()
-            return text
-        elif file_extension in [".docx", ".doc"]:
-            doc = docx.Document(file_path)
-            text = ""
-            for para in doc.paragraphs:
-                text += para.text + "\n"
-            return text
-        else:
-            raise ValueError(f"Unsupported file type: {file_extension}")
-    except Exception as e:
-        raise ValueError(f"Error reading file {file_path}: {str(e)}")
+def dispatch_order(items, size):
+    """Order in which files enter the shared work queue (biggest first when LARGEST_FIRST is set)"""
+    return sorted(items, key=size, reverse=True) if LARGEST_FIRST else list(items)
 
-def analyze_resume_with_gemini(resume_text, api_key, filename):
-    """Analyze resume using Gemini API"""
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-1.5-flash")
-        
-        prompt = f"""
+async def iter_resume_files(files):
+    """Async source of folder files for the parsing pipeline (extraction reads them from disk)"""
+    for file_info in files:
+        yield file_info
+
+def extract_text_from_file(file_path, content=None):
+    """Extract text from different file types (from ``content`` bytes instead of disk when given), within the extraction budget"""
+    return extract_text(file_path, content, EXTRACTION_MAX_PAGES, EXTRACTION_MAX_CHARS, PDF_BACKEND)
+
+def prepare_resume_file(file_path, content=None, max_tokens=PROMPT_TOKEN_BUDGET, extract_contacts=LOCAL_CONTACT_EXTRACTION):
+    """Extract a file's text and preprocess it into prompt text, contacts and token counts"""
+    return prepare_resume_text(extract_text_from_file(file_path, content), max_tokens, extract_contacts)
+
+# Contacts found locally are not asked for
+LLM_ANALYSIS_FIELDS = tuple(
+    field for field in ANALYSIS_FIELDS if not (LOCAL_CONTACT_EXTRACTION and field in CONTACT_FIELDS)
+)
+
+RESUME_SCHEMA_FIELDS = {
+    "summary": "\"comprehensive summary of candidate's background and qualifications\"",
+    "email": "\"candidate's email address (if found, else empty string)\"",
+    "phone": "\"candidate's phone number (if found, else empty string)\"",
+    "linkedin": "\"candidate's LinkedIn URL (if found, else empty string)\"",
+    "other_contacts": '["any other contact info, e.g., github, website, etc."]',
+    "education": """[
+                {"degree": "", "institution": "", "year": ""}
+            ]""",
+    "work_experience": """[
+                {"title": "", "company": "", "duration": "", "responsibilities": []}
+            ]""",
+    "technical_skills": "[]",
+    "soft_skills": "[]",
+    "key_skills": "[]",
+    "experience_years": '"X years"',
+}
+
+RESUME_JSON_SCHEMA = "{\n" + ",\n".join(
+    f'            "{field}": {RESUME_SCHEMA_FIELDS[field]}' for field in LLM_ANALYSIS_FIELDS
+) + "\n        }"
+
+def build_resume_prompt(resume_text):
+    """Prompt asking Gemini for the structured resume analysis"""
+    return f"""
         Analyze this resume and extract information in JSON format:
         
         {resume_text}
         
         Return JSON with this structure:
-        {{
-            "summary": "comprehensive summary of candidate's background and qualifications",
-            "email": "candidate's email address (if found, else empty string)",
-            "phone": "candidate's phone number (if found, else empty string)",
-            "linkedin": "candidate's LinkedIn URL (if found, else empty string)",
-            "other_contacts": ["any other contact info, e.g., github, website, etc."],
-            "education": [
-                {{"degree": "", "institution": "", "year": ""}}
-            ],
-            "work_experience": [
-                {{"title": "", "company": "", "duration": "", "responsibilities": []}}
-            ],
-            "technical_skills": [],
-            "soft_skills": [],
-            "key_skills": [],
-            "experience_years": "X years"
-        }}
+        {RESUME_JSON_SCHEMA}
         
         Return only valid JSON, no additional text.
         """
+
+def build_batch_prompt(resumes):
+    """Prompt analyzing several (filename, text) resumes in one request; the schema is sent once"""
+    sections = "\n".join(
+        f"=== RESUME: {filename} ===\n{resume_text}\n=== END RESUME: {filename} ==="
+        for filename, resume_text in resumes
+    )
+    return f"""
+        Analyze each of the following resumes and extract information in JSON format.
+        Each resume starts with "=== RESUME: <filename> ===" and ends with "=== END RESUME: <filename> ===".
         
-        response = model.generate_content(prompt)
+        {sections}
         
-        # Extract response text
-        if hasattr(response, 'text'):
-            response_text = response.text
-        elif hasattr(response, 'candidates') and response.candidates:
-            response_text = response.candidates[0].content.parts[0].text
-        else:
-            response_text = str(response)
+        Return a JSON array with one object per resume, in the same order. Each object has a
+        "filename" field with the resume's filename exactly as given, plus this structure:
+        {RESUME_JSON_SCHEMA}
         
-        # Parse JSON
-        json_match = re.search(r'({.*})', response_text.replace('\n', ' '), re.DOTALL)
-        if json_match:
-            return json.loads(json_match.group(0))
-        else:
-            raise ValueError("No valid JSON found in response")
-            
+        Return only the valid JSON array, no additional text.
+        """
+
+def build_reask_prompt(resume_text, fields):
+    """Prompt asking again for only the fields of an analysis that came back invalid"""
+    return f"""
+        Extract only these fields from this resume in JSON format: {", ".join(fields)}
+        
+        {resume_text}
+        
+        Return only valid JSON, no additional text.
+        """
+
+# Cached analyses are only valid for the prompts, schema and model that produced them
+PROMPT_VERSION = GEMINI_MODEL_NAME + ":" + hashlib.sha1(
+    (build_resume_prompt("") + build_batch_prompt([]) + json.dumps(response_schema(LLM_ANALYSIS_FIELDS, batched=True))).encode("utf-8")
+).hexdigest()[:12]
+
+def response_text(response):
+    """Text of a Gemini response"""
+    if hasattr(response, 'text'):
+        return response.text
+    if hasattr(response, 'candidates') and response.candidates:
+        return response.candidates[0].content.parts[0].text
+    return str(response)
+
+def load_response_json(response, opening="{"):
+    """JSON value of a Gemini response, repaired locally if it is slightly malformed; returns (value, truncated)"""
+    try:
+        value, repaired, truncated = load_json(response_text(response), opening)
+    except ValueError:
+        parse_stats["unparseable_responses"] += 1
+        GEMINI_PARSE_FAILURES.inc(kind="unparseable")
+        raise
+    if repaired:
+        parse_stats["repaired_responses"] += 1
+        GEMINI_PARSE_FAILURES.inc(kind="repaired")
+    return value, truncated
+
+def parse_gemini_response(response, fields=LLM_ANALYSIS_FIELDS):
+    """Validated analysis from a Gemini response, plus the fields that came back invalid"""
+    data, truncated = load_response_json(response)
+    return validate_analysis(data, fields, truncated)
+
+def parse_gemini_batch_response(response, filenames):
+    """(analysis, invalid fields) per filename of a batched response; entries without a known filename are left out"""
+    entries, truncated = load_response_json(response, "[")
+    if not isinstance(entries, list):
+        raise ValueError("Batched response is not a JSON array")
+    analyses = {}
+    for position, entry in enumerate(entries):
+        if isinstance(entry, dict) and entry.get("filename") in filenames:
+            # Only the last entry of a cut-off response can be incomplete
+            analyses[entry["filename"]] = validate_analysis(
+                entry, LLM_ANALYSIS_FIELDS, truncated=truncated and position == len(entries) - 1
+            )
+    return analyses
+
+async def reask_invalid_fields(resume_text, filename, analysis, invalid_fields):
+    """Ask Gemini again for only the invalid fields; returns the merged analysis and the fields still invalid"""
+    parse_stats["reasks"] += 1
+    logger.warning(f"Re-asking Gemini for {', '.join(invalid_fields)} of {filename}")
+    try:
+        response = await api_distributor.generate(
+            build_reask_prompt(resume_text, invalid_fields), response_schema=response_schema(invalid_fields)
+        )
+        fields, still_invalid = parse_gemini_response(response, invalid_fields)
+    except Exception as e:
+        logger.warning(f"Re-ask for {filename} failed: {str(e)}")
+        return analysis, invalid_fields
+    
+    for field in invalid_fields:
+        if field not in still_invalid:
+            analysis[field] = fields[field]
+    return analysis, still_invalid
+
+async def settle_analysis(resume_text, filename, analysis, invalid_fields):
+    """Repair an analysis's invalid fields with one re-ask; only a still-invalid required field fails the resume"""
+    if invalid_fields:
+        analysis, invalid_fields = await reask_invalid_fields(resume_text, filename, analysis, invalid_fields)
+        parse_stats["fields_left_invalid"] += len(invalid_fields)
+    missing = [field for field in REQUIRED_FIELDS if field in invalid_fields]
+    if missing:
+        raise ValueError(f"Gemini returned no valid {', '.join(missing)}")
+    return analysis
+
+async def analyze_resume_with_gemini(resume_text, filename):
+    """Analyze resume using Gemini API"""
+    try:
+        batch_stats["requests"] += 1
+        response = await api_distributor.generate(
+            build_resume_prompt(resume_text), response_schema=response_schema(LLM_ANALYSIS_FIELDS)
+        )
+        try:
+            analysis, invalid_fields = parse_gemini_response(response)
+        except ValueError as e:
+            # Nothing usable came back: every field gets re-asked
+            logger.warning(f"Unusable response for {filename}: {str(e)}")
+            analysis, invalid_fields = validate_analysis(None, LLM_ANALYSIS_FIELDS)
+        return await settle_analysis(resume_text, filename, analysis, invalid_fields)
     except Exception as e:
         logger.error(f"Error analyzing {filename}: {str(e)}")
         raise
 
-def process_single_resume(file_info, worker_id):
-    """Process a single resume file"""
-    filename = file_info["filename"]
-    file_path = file_info["path"]
-    api_key = None
+async def analyze_resumes_with_gemini(resumes):
+    """Analyze several (filename, text) resumes with one Gemini call"""
+    batch_stats["requests"] += 1
+    batch_stats["batched_requests"] += 1
+    response = await api_distributor.generate(
+        build_batch_prompt(resumes),
+        output_tokens=ESTIMATED_OUTPUT_TOKENS * len(resumes),
+        response_schema=response_schema(LLM_ANALYSIS_FIELDS, batched=True)
+    )
+    return parse_gemini_batch_response(response, {filename for filename, _ in resumes})
+
+def fits_in_batch(batch_length, batch_tokens, resume_text):
+    """Whether one more resume may join a batch (a lone resume always fits)"""
+    if batch_length == 0:
+        return True
+    return batch_length < BATCH_SIZE and batch_tokens + estimate_tokens(resume_text) <= BATCH_TOKEN_BUDGET
+
+def get_extraction_pool():
+    """Worker processes for text extraction, so PDF parsing never holds the server's GIL"""
+    global EXTRACTION_POOL
+    if EXTRACTION_POOL is None:
+        EXTRACTION_POOL = ExtractionPool(EXTRACTION_WORKERS)
+    return EXTRACTION_POOL
+
+async def extract_resume_text(file_info):
+    """Extract and preprocess a resume's text in the extraction process pool; returns the prompt text.
+    
+    The locally found contacts and the token counts are recorded on file_info.
+    """
+    if file_info.get("read_error"):
+        raise ValueError(file_info["read_error"])
     
     try:
-        logger.info(f"Worker {worker_id} processing: {filename}")
-        
-        # Get API key
-        api_key = api_distributor.get_api_key()
-        
-        # Extract text
-        resume_text = extract_text_from_file(file_path)
-        
-        # Analyze with Gemini
-        analysis = analyze_resume_with_gemini(resume_text, api_key, filename)
-        
-        result = {
-            "filename": filename,
-            "name": analysis.get("name", ""),
-            "email": analysis.get("email", ""),
-            "phone": analysis.get("phone", ""),
-            "linkedin": analysis.get("linkedin", ""),
-            "other_contacts": ", ".join(analysis.get("other_contacts", [])),
-            "summary": analysis.get("summary", ""),
-            "key_skills": ", ".join(analysis.get("key_skills", [])),
-            "technical_skills": ", ".join(analysis.get("technical_skills", [])),
-            "soft_skills": ", ".join(analysis.get("soft_skills", [])),
-            "experience_years": analysis.get("experience_years", ""),
-            "education": json.dumps(analysis.get("education", [])),
-            "work_experience": json.dumps(analysis.get("work_experience", [])),
-            "status": "success",
-            "error": ""
-        }
+        with EXTRACTIONS_IN_FLIGHT.track():
+            prepared = await asyncio.wrap_future(get_extraction_pool().submit(
+                prepare_resume_file,
+                (file_info["path"], file_info.get("content"), PROMPT_TOKEN_BUDGET, LOCAL_CONTACT_EXTRACTION),
+                timeout=EXTRACTION_TIMEOUT_SECONDS or None
+            ))
+    except ExtractionTimeout:
+        # Its process was killed and replaced; no other file was affected
+        raise ValueError(f"Text extraction timed out after {EXTRACTION_TIMEOUT_SECONDS:g}s on {file_info['filename']}")
+    except ExtractionCrash:
+        raise ValueError(f"Text extraction process crashed on {file_info['filename']}")
+    
+    file_info["contacts"] = prepared["contacts"]
+    file_info["prompt_tokens"] = {
+        "original_tokens": prepared["original_tokens"],
+        "prompt_tokens": prepared["prompt_tokens"],
+        "truncated_texts": int(prepared["truncated"])
+    }
+    for field, value in file_info["prompt_tokens"].items():
+        prompt_stats[field] += value
+    return prepared["text"]
+
+def build_resume_result(filename, analysis):
+    """Result row for a successfully analyzed resume (lists stay lists until written)"""
+    return {
+        "filename": filename,
+        "name": analysis.get("name", ""),
+        "email": analysis.get("email", ""),
+        "phone": analysis.get("phone", ""),
+        "linkedin": analysis.get("linkedin", ""),
+        "other_contacts": analysis.get("other_contacts", []),
+        "summary": analysis.get("summary", ""),
+        "key_skills": analysis.get("key_skills", []),
+        "technical_skills": analysis.get("technical_skills", []),
+        "soft_skills": analysis.get("soft_skills", []),
+        "experience_years": analysis.get("experience_years", ""),
+        "education": analysis.get("education", []),
+        "work_experience": analysis.get("work_experience", []),
+        "status": "success",
+        "error": ""
+    }
+
+def build_failed_result(filename, error):
+    """Result row for a resume that could not be processed"""
+    return {
+        "filename": filename,
+        "name": "Error",
+        "email": "Error", 
+        "phone": "",
+        "linkedin": "",
+        "other_contacts": [],
+        "summary": "",
+        "key_skills": [],
+        "technical_skills": [],
+        "soft_skills": [],
+        "experience_years": "",
+        "education": None,
+        "work_experience": None,
+        "status": "failed",
+        "error": str(error)
+    }
+
+async def complete_resume(filename, analysis, worker_id):
+    """Store the summary vector of a finished analysis and build its result row"""
+    try:
+        # Pre-compute the summary vector for future matching requests
+        await asyncio.to_thread(cache_summary_embedding, analysis.get("summary", ""))
         
         logger.info(f"✅ Worker {worker_id} completed: {filename}")
-        return result
+        return build_resume_result(filename, analysis)
         
     except Exception as e:
         logger.error(f"❌ Worker {worker_id} failed {filename}: {str(e)}")
+        return build_failed_result(filename, e)
+
+async def analyze_uncached_resume(filename, resume_text, cache_key, worker_id):
+    """Single-resume Gemini call for a cache miss"""
+    try:
+        analysis = await analyze_resume_with_gemini(resume_text, filename)
+        analysis_cache.put(cache_key, analysis)
+    except Exception as e:
+        logger.error(f"❌ Worker {worker_id} failed {filename}: {str(e)}")
+        return build_failed_result(filename, e)
+    
+    return await complete_resume(filename, analysis, worker_id)
+
+async def analyze_resume(file_info, resume_text, worker_id, use_cache=True):
+    """LLM stage: analyze extracted text and build the result row"""
+    filename = file_info["filename"]
+    
+    # Re-uploaded resumes are answered from the cache instead of another Gemini call
+    cache_key = AnalysisCache.make_key(resume_text, PROMPT_VERSION)
+    analysis = analysis_cache.get(cache_key) if use_cache else None
+    if analysis is not None:
+        logger.info(f"Worker {worker_id} cache hit: {filename}")
+        return await complete_resume(filename, analysis, worker_id)
+    
+    batch_stats["llm_resumes"] += 1
+    return await analyze_uncached_resume(filename, resume_text, cache_key, worker_id)
+
+async def analyze_resume_batch(batch, worker_id, use_cache=True):
+    """LLM stage for a batch of (file_info, text): one Gemini call for every uncached resume.
+    
+    Resumes the batched response leaves out fall back to single-resume
+    calls; entries with invalid fields only get those fields re-asked.
+    Results come back in batch order.
+    """
+    if len(batch) == 1:
+        return [await analyze_resume(*batch[0], worker_id, use_cache)]
+    
+    results = [None] * len(batch)
+    pending = {}  # filename -> (batch index, cache key)
+    singles = []  # (batch index, cache key)
+    for index, (file_info, resume_text) in enumerate(batch):
+        filename = file_info["filename"]
+        cache_key = AnalysisCache.make_key(resume_text, PROMPT_VERSION)
+        analysis = analysis_cache.get(cache_key) if use_cache else None
+        if analysis is not None:
+            logger.info(f"Worker {worker_id} cache hit: {filename}")
+            results[index] = await complete_resume(filename, analysis, worker_id)
+            continue
+        batch_stats["llm_resumes"] += 1
+        if filename in pending:
+            # The batched response is keyed by filename, so a duplicate name goes on its own
+            singles.append((index, cache_key))
+        else:
+            pending[filename] = (index, cache_key)
+    
+    if len(pending) == 1:
+        singles.extend(pending.values())
+        pending = {}
+    
+    analyses = {}
+    if pending:
+        try:
+            analyses = await analyze_resumes_with_gemini(
+                [(filename, batch[index][1]) for filename, (index, _) in pending.items()]
+            )
+        except Exception as e:
+            logger.warning(f"Worker {worker_id} batch of {len(pending)} failed, retrying one by one: {str(e)}")
+    
+    async def settle_entry(index, cache_key, analysis, invalid_fields):
+        filename = batch[index][0]["filename"]
+        try:
+            analysis = await settle_analysis(batch[index][1], filename, analysis, invalid_fields)
+            analysis_cache.put(cache_key, analysis)
+        except Exception as e:
+            logger.error(f"❌ Worker {worker_id} failed {filename}: {str(e)}")
+            return build_failed_result(filename, e)
+        return await complete_resume(filename, analysis, worker_id)
+    
+    tasks = {}
+    for filename, (index, cache_key) in pending.items():
+        if filename in analyses:
+            tasks[index] = settle_entry(index, cache_key, *analyses[filename])
+        else:
+            batch_stats["fallback_resumes"] += 1
+            singles.append((index, cache_key))
+    for index, cache_key in singles:
+        tasks[index] = analyze_uncached_resume(batch[index][0]["filename"], batch[index][1], cache_key, worker_id)
+    
+    for index, result in zip(tasks, await asyncio.gather(*tasks.values())):
+        results[index] = result
+    return results
+
+async def analyze_and_record(batch, worker_id, job_id, use_cache=True):
+    """Analyze a batch, fill in the locally found contacts and update job progress for each of its files"""
+    results = await analyze_resume_batch(batch, worker_id, use_cache)
+    for (file_info, _), result in zip(batch, results):
+        if result["status"] == "success" and file_info.get("contacts"):
+            result.update(file_info["contacts"])
+        await record_file_result(job_id, file_info, result)
+    return results
+
+def estimate_eta(job):
+    """Seconds until a job finishes at the average pace of its current pass, or None before its first file"""
+    started_at = job.get("eta_started_at") or job.get("started_at")
+    processed = job["processed_files"] - job.get("eta_baseline_files", 0)
+    if not started_at or processed <= 0 or not job["total_files"]:
+        return None
+    remaining = max(job["total_files"] - job["processed_files"], 0)
+    return round((time.time() - started_at) / processed * remaining, 1)
+
+ROW_EVENT_FIELDS = ("name", "email", "experience_years", "key_skills")  # Row fields sent with "file" events
+
+def store_file_result(job_id, file_info, result):
+    """Blocking store and checkpoint writes behind record_file_result"""
+    job = job_store.increment(job_id, processed_files=1, failed_files=int(result["status"] == "failed"))
+    if job is None:
+        return
+    if job.get("checkpoint_path"):
+        ResultCheckpoint(job["checkpoint_path"]).append(file_info["path"], result)
+    job_store.add_event(job_id, "file", {
+        "filename": result["filename"],
+        "status": result["status"],
+        "error": result["error"],
+        "processed_files": job["processed_files"],
+        "failed_files": job["failed_files"],
+        "total_files": job["total_files"],
+        "progress_percentage": job["progress_percentage"],
+        "eta_seconds": estimate_eta(job),
+        # Identifies the row only; the full row is in the checkpoint and the job's results
+        "row": {field: result.get(field) for field in ROW_EVENT_FIELDS}
+    })
+
+async def record_file_result(job_id, file_info, result):
+    """Checkpoint one file's result row, update job progress and publish it to the job's event stream"""
+    await asyncio.to_thread(store_file_result, job_id, file_info, result)
+
+class PipelineStats:
+    """Per-stage queue depths and timings of a parsing job, plus its prompt token savings, published in its status"""
+    def __init__(self, job_id, queues):
+        self.job_id = job_id
+        self.queues = queues
+        self.timings = {stage: {"completed": 0, "total_seconds": 0.0, "max_seconds": 0.0} for stage in queues}
+        # Token counts carry over from earlier passes (and runs) of the same job
+        job = job_store.get(job_id) or {}
+        self.prompt_tokens = {"original_tokens": 0, "prompt_tokens": 0, "truncated_texts": 0}
+        self.prompt_tokens.update({
+            field: value for field, value in (job.get("prompt_tokens") or {}).items() if field in self.prompt_tokens
+        })
+    
+    def record_prompt(self, counts):
+        for field, value in counts.items():
+            self.prompt_tokens[field] += value
+    
+    def record(self, stage, seconds):
+        timing = self.timings[stage]
+        timing["completed"] += 1
+        timing["total_seconds"] += seconds
+        timing["max_seconds"] = max(timing["max_seconds"], seconds)
+        self.publish()
+    
+    def snapshot(self):
         return {
-            "filename": filename,
-            "name": "Error",
-            "email": "Error", 
-            "phone": "",
-            "linkedin": "",
-            "other_contacts": "",
-            "summary": "",
-            "key_skills": "",
-            "technical_skills": "",
-            "soft_skills": "",
-            "experience_years": "",
-            "education": "",
-            "work_experience": "",
-            "status": "failed",
-            "error": str(e)
+            stage: {
+                "queue_depth": self.queues[stage].qsize(),
+                "completed": timing["completed"],
+                "avg_seconds": round(timing["total_seconds"] / timing["completed"], 3) if timing["completed"] else 0.0,
+                "max_seconds": round(timing["max_seconds"], 3),
+                "total_seconds": round(timing["total_seconds"], 2)
+            }
+            for stage, timing in self.timings.items()
         }
-    finally:
-        if api_key:
-            api_distributor.return_api_key(api_key)
+    
+    def publish(self):
+        # Doubles as the job's heartbeat, which tells a running job from one whose process died
+        prompt_tokens = {
+            **self.prompt_tokens, "saved_tokens": self.prompt_tokens["original_tokens"] - self.prompt_tokens["prompt_tokens"]
+        }
+        job_store.update(self.job_id, pipeline=self.snapshot(), prompt_tokens=prompt_tokens, heartbeat_at=time.time())
 
-def split_files_for_workers(files, num_workers):
-    """Split files evenly among workers"""
-    splits = [[] for _ in range(num_workers)]
-    for i, file_info in enumerate(files):
-        worker_id = i % num_workers
-        splits[worker_id].append(file_info)
+async def run_streaming_pipeline(file_source, job_id, use_cache=True):
+    """Two-stage pipeline over an async iterator of files.
     
-    logger.info(f"Split {len(files)} files among {num_workers} workers:")
-    for i, split in enumerate(splits):
-        logger.info(f"  Worker {i}: {len(split)} files")
+    Both stages pull from shared queues, so a worker that draws a large file
+    never leaves a share of other files waiting behind it. Extraction workers
+    (one per extraction process) feed a bounded queue of extracted texts that
+    the LLM workers consume, so slow PDFs never hold up an LLM slot and vice
+    versa. A single collector groups the extracted texts into batches, handing
+    one over once it is full or BATCH_WAIT_SECONDS after its first text, so
+    batches fill up instead of being split between idle workers.
+    """
+    # The queues are bounded to cap how many file bodies and texts sit in memory
+    file_queue = asyncio.Queue(maxsize=EXTRACTION_WORKERS * 2)
+    text_queue = asyncio.Queue(maxsize=MAX_WORKERS * 2)
+    batch_queue = asyncio.Queue(maxsize=MAX_WORKERS)
+    stats = PipelineStats(job_id, {"extraction": file_queue, "llm": text_queue})
     
-    return splits
-
-def process_worker_files(worker_files, worker_id, job_id):
-    """Process all files assigned to a worker"""
-    worker_results = []
+    async def produce():
+        try:
+            async for file_info in file_source:
+                await file_queue.put(file_info)
+        finally:
+            for _ in range(EXTRACTION_WORKERS):
+                await file_queue.put(None)
     
-    for file_info in worker_files:
-        result = process_single_resume(file_info, worker_id)
-        worker_results.append(result)
-        
-        # Update job status
-        if job_id in job_status:
-            with threading.Lock():
-                job_status[job_id]["processed_files"] += 1
-                if result["status"] == "failed":
-                    job_status[job_id]["failed_files"] += 1
-                
-                total = job_status[job_id]["total_files"]
-                processed = job_status[job_id]["processed_files"]
-                job_status[job_id]["progress_percentage"] = round((processed / total) * 100, 2)
+    async def extract():
+        while (file_info := await file_queue.get()) is not None:
+            start = time.monotonic()
+            try:
+                resume_text = await extract_resume_text(file_info)
+                EXTRACTION_SECONDS.observe(time.monotonic() - start, outcome="ok")
+                stats.record_prompt(file_info["prompt_tokens"])
+                await text_queue.put((file_info, resume_text, None))
+            except Exception as e:
+                EXTRACTION_SECONDS.observe(time.monotonic() - start, outcome="failed")
+                await text_queue.put((file_info, None, e))
+            stats.record("extraction", time.monotonic() - start)
     
-    return worker_results
+    async def extraction_stage():
+        try:
+            await asyncio.gather(*[extract() for _ in range(EXTRACTION_WORKERS)])
+        finally:
+            await text_queue.put(None)
+    
+    async def collect_batches():
+        """Group extracted texts into batches for the LLM workers; returns the results of failed extractions"""
+        failed_results = []
+        batch, batch_tokens, deadline = [], 0, None
+        try:
+            while True:
+                try:
+                    # Wait as long as needed for a batch's first text, then only until its deadline
+                    timeout = None if not batch else max(0.0, deadline - time.monotonic())
+                    item = await asyncio.wait_for(text_queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    await batch_queue.put(batch)
+                    batch, batch_tokens = [], 0
+                    continue
+                if item is None:
+                    break
+                file_info, resume_text, error = item
+                if error is not None:
+                    logger.error(f"❌ Failed {file_info['filename']}: {str(error)}")
+                    result = build_failed_result(file_info["filename"], error)
+                    failed_results.append(result)
+                    await record_file_result(job_id, file_info, result)
+                    continue
+                if not fits_in_batch(len(batch), batch_tokens, resume_text):
+                    await batch_queue.put(batch)
+                    batch, batch_tokens = [], 0
+                if not batch:
+                    deadline = time.monotonic() + BATCH_WAIT_SECONDS
+                batch.append((file_info, resume_text))
+                batch_tokens += estimate_tokens(resume_text)
+                if len(batch) >= BATCH_SIZE:
+                    await batch_queue.put(batch)
+                    batch, batch_tokens = [], 0
+            if batch:
+                await batch_queue.put(batch)
+        finally:
+            for _ in range(MAX_WORKERS):
+                await batch_queue.put(None)
+        return failed_results
+    
+    async def analyze(worker_id):
+        worker_results = []
+        while (batch := await batch_queue.get()) is not None:
+            start = time.monotonic()
+            worker_results.extend(await analyze_and_record(batch, worker_id, job_id, use_cache))
+            for _ in batch:
+                stats.record("llm", time.monotonic() - start)
+        return worker_results
+    
+    active_pipelines.add(stats)
+    try:
+        outputs = await asyncio.gather(
+            produce(), extraction_stage(), collect_batches(), *[analyze(i) for i in range(MAX_WORKERS)]
+        )
+    finally:
+        active_pipelines.discard(stats)
+    stats.publish()
+    return [result for stage_results in outputs[2:] for result in stage_results]
 
 def clean_text(text):
     """Clean text for matching"""
@@ -378,18 +1146,224 @@ def clean_text(text):
     text = re.sub(r'[^a-z\s]', '', text)
     return ' '.join(text.split())
 
+def infer_vectors(texts, workers=MATCH_INFERENCE_WORKERS, progress_callback=None):
+    """Infer Doc2Vec vectors for many texts, returned as a float32 matrix (one row per text)"""
+    model = load_doc2vec_model()
+    texts = list(texts)
+    matrix = np.zeros((len(texts), model.vector_size), dtype=np.float32)
+    
+    def infer_chunk(start):
+        chunk = texts[start:start + INFERENCE_CHUNK_SIZE]
+        for offset, text in enumerate(chunk):
+            with DOC2VEC_INFERENCE_SECONDS.time(kind="summary"):
+                matrix[start + offset] = model.infer_vector(clean_text(text).split())
+        return len(chunk)
+    
+    chunk_starts = range(0, len(texts), INFERENCE_CHUNK_SIZE)
+    done = 0
+    if workers <= 1 or len(texts) <= INFERENCE_CHUNK_SIZE:
+        for start in chunk_starts:
+            done += infer_chunk(start)
+            if progress_callback:
+                progress_callback(done)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(infer_chunk, start) for start in chunk_starts]
+            for future in as_completed(futures):
+                done += future.result()
+                if progress_callback:
+                    progress_callback(done)
+    
+    return matrix
+
+def ensure_summary_vectors(summaries, workers=MATCH_INFERENCE_WORKERS, progress_callback=None):
+    """Make sure every summary has a stored vector, inferring only the missing ones; returns their keys"""
+    cleaned = [clean_text(summary) for summary in summaries]
+    keys = [content_hash(text) for text in cleaned]
+    missing_keys = set(embedding_store.missing(keys))
+    
+    if missing_keys:
+        cache_hits = len(keys) - len(missing_keys)
+        logger.info(f"Embedding cache: {cache_hits} hits, {len(missing_keys)} to infer")
+        missing = {}
+        for i, key in enumerate(keys):
+            if key in missing_keys:
+                missing.setdefault(key, i)
+        inferred = infer_vectors(
+            [cleaned[i] for i in missing.values()],
+            workers=workers,
+            progress_callback=(lambda done: progress_callback(cache_hits + done)) if progress_callback else None
+        )
+        embedding_store.add_many(list(missing), inferred)
+    
+    return keys
+
+def get_summary_vectors(summaries, workers=MATCH_INFERENCE_WORKERS, progress_callback=None):
+    """Summary vectors from the embedding store, inferring and storing only the missing ones"""
+    keys = ensure_summary_vectors(summaries, workers=workers, progress_callback=progress_callback)
+    stored = embedding_store.get_many(keys)
+    
+    model = load_doc2vec_model()
+    matrix = np.zeros((len(keys), model.vector_size), dtype=np.float32)
+    for i, key in enumerate(keys):
+        matrix[i] = stored[key]
+    return matrix
+
+def cache_summary_embedding(summary):
+    """Embed a freshly parsed summary so later matches only need a lookup"""
+    if not summary or not os.path.exists(DOC2VEC_MODEL_PATH):
+        return
+    try:
+        ensure_summary_vectors([summary], workers=1)
+        candidate_index.sync(embedding_store)
+    except Exception as e:
+        logger.warning(f"Failed to cache summary embedding: {e}")
+
+def infer_job_vector(model, words):
+    """Deterministic infer_vector: the same words always give the same vector"""
+    # A shallow copy shares the model's (read-only) weights but gets its own freshly seeded RNG,
+    # so inference running concurrently in other threads cannot shift the random stream
+    seeded = copy.copy(model)
+    seeded.random = np.random.RandomState(JOB_VECTOR_SEED)
+    with DOC2VEC_INFERENCE_SECONDS.time(kind="job"):
+        return seeded.infer_vector(words, epochs=JOB_VECTOR_EPOCHS or None)
+
+def get_job_vector(job_description, job_posting_id=None):
+    """Job-description vector from the cache, inferred (deterministically) only on a miss"""
+    model = load_doc2vec_model()
+    normalized = clean_text(job_description)
+    key = JobVectorCache.make_key(normalized, f"{DOC2VEC_MODEL_FINGERPRINT}:{JOB_VECTOR_SEED}:{JOB_VECTOR_EPOCHS}")
+    if job_posting_id and job_vector_cache.link_posting(job_posting_id, key):
+        logger.info(f"Job {job_posting_id} was edited, dropped its old vector")
+    
+    vector = job_vector_cache.get(key)
+    if vector is None:
+        vector = infer_job_vector(model, normalized.split())
+        job_vector_cache.put(key, vector)
+    return vector
+
+def cosine_scores(matrix, vector):
+    """Cosine similarity (as a 0-100 score) of every matrix row against one vector"""
+    denominators = norm(matrix, axis=1) * norm(vector)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = 100 * (matrix @ vector) / denominators
+    scores = np.where(denominators > 0, scores, 0.0)
+    return np.round(scores.astype(np.float64), 2)
+
+@MATCH_SCORING_SECONDS.time(mode="summaries")
+def score_summaries(summaries, job_description, workers=MATCH_INFERENCE_WORKERS, progress_callback=None,
+                    job_posting_id=None, lexical_scores=None, weights=None):
+    """Score many summaries against one job description in a single vectorized pass.
+    
+    The job vector comes from the job vector cache, summary vectors are stacked into a matrix and
+    all similarities and recommendation buckets are computed with NumPy. Given lexical_scores
+    (aligned with ``summaries``), the result is their blend with the semantic scores.
+    Returns (scores, recommendations) arrays aligned with ``summaries``.
+    """
+    summaries = pd.Series(summaries, dtype=object).reset_index(drop=True)
+    has_summary = (summaries.notna() & summaries.astype(str).str.strip().ne("")).to_numpy()
+    
+    scores = np.zeros(len(summaries), dtype=np.float64)
+    recommendations = np.full(len(summaries), "No summary available", dtype=object)
+    
+    if has_summary.any():
+        job_vector = get_job_vector(job_description, job_posting_id)
+        summary_matrix = get_summary_vectors(
+            summaries[has_summary].astype(str).tolist(),
+            workers=workers,
+            progress_callback=progress_callback
+        )
+        scores[has_summary] = cosine_scores(summary_matrix, job_vector)
+    
+    if lexical_scores is not None:
+        scores = blend_scores(scores, lexical_scores, weights)
+    recommendations[has_summary] = get_recommendations(scores[has_summary])
+    
+    return scores, recommendations
+
+def match_weights(semantic_weight=None, lexical_weight=None):
+    """(semantic, lexical) score weights summing to 1: the request's, falling back to the configured ones"""
+    semantic = MATCH_SEMANTIC_WEIGHT if semantic_weight is None else semantic_weight
+    lexical = MATCH_LEXICAL_WEIGHT if lexical_weight is None else lexical_weight
+    if semantic < 0 or lexical < 0 or semantic + lexical <= 0:
+        raise HTTPException(status_code=400, detail="Match weights must not be negative or both zero")
+    return semantic / (semantic + lexical), lexical / (semantic + lexical)
+
+def blend_scores(semantic_scores, lexical_scores, weights):
+    semantic_weight, lexical_weight = weights
+    return np.round(semantic_weight * np.asarray(semantic_scores) + lexical_weight * np.asarray(lexical_scores), 2)
+
+def load_skill_index(csv_file_path):
+    """Skill index of a match source: the pool's (synced first), or a throwaway one built from a result file"""
+    if csv_file_path is None:
+        skill_index.sync(candidate_pool)
+        return skill_index
+    index = SkillIndex()
+    df = read_results(csv_file_path, columns=list(SKILL_FIELDS))
+    for row_index, row in zip(df.index, df.to_dict("records")):
+        index.add(row_index, candidate_skills(row))
+    return index
+
+def required_skill_mask(index, labels, required_skills):
+    """Which of the labelled candidates list every required skill"""
+    return np.asarray(labels.isin(index.matching(required_skills, labels)))
+
+def cosine_score_matrix(matrix, vectors):
+    """Cosine similarity (as 0-100 scores) of every vector against every matrix row, one output row per vector"""
+    denominators = np.outer(norm(vectors, axis=1), norm(matrix, axis=1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        scores = 100 * (vectors @ matrix.T) / denominators
+    scores = np.where(denominators > 0, scores, 0.0)
+    return np.round(scores.astype(np.float64), 2)
+
+@MATCH_SCORING_SECONDS.time(mode="matrix")
+def score_matrix(summaries, jobs, weights=(1.0, 0.0), index=None, workers=MATCH_INFERENCE_WORKERS):
+    """Scores of every summary against every job: a (jobs x summaries) matrix plus the has-summary mask.
+    
+    Summary vectors are fetched (or inferred) once for all jobs, job vectors
+    come from their cache, and the whole matrix is a single multiply; with a
+    lexical weight, each job's skill scores from ``index`` are blended in.
+    Resumes without a summary get no semantic score; candidates missing one of
+    a job's required skills are NaN in its row (and never embedded if no job wants them).
+    """
+    labels = summaries.index
+    summaries = pd.Series(summaries, dtype=object).reset_index(drop=True)
+    has_summary = (summaries.notna() & summaries.astype(str).str.strip().ne("")).to_numpy()
+    
+    eligible = np.ones((len(jobs), len(summaries)), dtype=bool)
+    for row, job in enumerate(jobs):
+        if job.required_skills:
+            eligible[row] = required_skill_mask(index, labels, job.required_skills)
+    wanted = has_summary & eligible.any(axis=0)
+    
+    scores = np.zeros((len(jobs), len(summaries)), dtype=np.float64)
+    if wanted.any():
+        job_vectors = np.stack([get_job_vector(job.job_description, job.job_posting_id) for job in jobs])
+        summary_matrix = get_summary_vectors(summaries[wanted].astype(str).tolist(), workers=workers)
+        scores[:, wanted] = cosine_score_matrix(summary_matrix, job_vectors)
+    if weights[1] > 0:
+        lexical = np.stack([index.scores(job.job_description, labels) for job in jobs])
+        scores = blend_scores(scores, lexical, weights)
+    scores[~eligible] = np.nan
+    return scores, has_summary
+
+def top_score_indices(scores, has_summary, top_k):
+    """Positions of the top_k scores among the eligible resumes that have a summary, best first"""
+    candidates = np.flatnonzero(has_summary & ~np.isnan(scores))
+    if len(candidates) > top_k:
+        candidates = candidates[np.argpartition(-scores[candidates], top_k - 1)[:top_k]]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+@MATCH_SCORING_SECONDS.time(mode="single")
 def calculate_match_score(summary, job_description):
     """Calculate job match score"""
     try:
-        model = load_doc2vec_model()
-        
         # Clean texts
         summary_clean = clean_text(summary)
-        job_clean = clean_text(job_description)
         
-        # Vectorize
-        v1 = model.infer_vector(summary_clean.split())
-        v2 = model.infer_vector(job_clean.split())
+        # Vectorize (summary vectors come from the embedding store, job vectors from their cache)
+        v1 = get_summary_vectors([summary_clean], workers=1)[0]
+        v2 = get_job_vector(job_description)
         
         # Calculate similarity
         similarity = 100 * (np.dot(v1, v2) / (norm(v1) * norm(v2)))
@@ -400,257 +1374,510 @@ def calculate_match_score(summary, job_description):
 
 def get_recommendation(score):
     """Get recommendation based on score"""
-    if score < 50:
-        return "Low match - modify CV"
-    elif score < 70:
-        return "Good match - can improve"
+    if score < LOW_MATCH_THRESHOLD:
+        return LOW_MATCH_RECOMMENDATION
+    elif score < GOOD_MATCH_THRESHOLD:
+        return GOOD_MATCH_RECOMMENDATION
     else:
-        return "Excellent match - submit CV"
+        return EXCELLENT_MATCH_RECOMMENDATION
+
+def get_recommendations(scores):
+    """Vectorized get_recommendation over an array of scores"""
+    scores = np.asarray(scores, dtype=np.float64)
+    return np.select(
+        [scores < LOW_MATCH_THRESHOLD, scores < GOOD_MATCH_THRESHOLD],
+        [LOW_MATCH_RECOMMENDATION, GOOD_MATCH_RECOMMENDATION],
+        default=EXCELLENT_MATCH_RECOMMENDATION
+    ).astype(object)
+
+def write_job_results(df, path):
+    """Write a job's result file, timed for /metrics"""
+    with RESULT_WRITE_SECONDS.time(format=result_format(path)):
+        write_results(df, path)
+
+def checkpoint_path(job_id):
+    return RESULTS_DIR / f"checkpoint_{job_id}.jsonl"
+
+async def parse_pending_files(job_id, files, source_path, file_source, use_cache=True):
+    """Run the pipeline over the files without a successful checkpointed row; returns every file's row.
+    
+    ``source_path`` gives a file's checkpoint key and ``file_source`` turns a
+    list of files into the pipeline's async source. Failed files get up to
+    FAILED_FILE_RETRIES more passes. Files that already succeeded, in this
+    run or an earlier one, are never sent to Gemini again.
+    """
+    checkpoint = ResultCheckpoint(checkpoint_path(job_id))
+    for attempt in range(FAILED_FILE_RETRIES + 1):
+        done = checkpoint.load()
+        pending = [item for item in files if done.get(source_path(item), {}).get("status") != "success"]
+        if not pending:
+            break
+        if attempt:
+            logger.info(f"Retrying {len(pending)} failed files (pass {attempt + 1})")
+        elif len(pending) < len(files):
+            logger.info(f"Resuming from checkpoint: {len(files) - len(pending)} files already done, {len(pending)} to process")
+        
+        # Progress restarts from the files already done; failures are counted again by this pass
+        succeeded = len(files) - len(pending)
+        job_store.update(
+            job_id,
+            processed_files=succeeded,
+            failed_files=0,
+            progress_percentage=progress_percentage(succeeded, len(files)),
+            eta_started_at=time.time(),
+            eta_baseline_files=succeeded
+        )
+        await run_streaming_pipeline(file_source(pending), job_id, use_cache)
+    
+    rows = checkpoint.load()
+    return [rows[source_path(item)] for item in files if source_path(item) in rows]
+
+def add_to_candidate_pool(rows, job_id=None):
+    """Upsert successful rows into the candidate pool, embedding and indexing only new or changed summaries"""
+    counts, summaries = candidate_pool.add_rows(rows, job_id)
+    summaries = [summary for summary in summaries if summary.strip()]
+    if summaries:
+        ensure_summary_vectors(summaries)
+        candidate_index.sync(embedding_store)
+    skill_index.sync(candidate_pool)
+    logger.info(f"Candidate pool: {counts['added']} added, {counts['updated']} updated, {counts['unchanged']} unchanged")
+    return counts
 
-def cleanup_temp_folder(temp_path):
-    """Clean up temporary folder after processing"""
+async def pool_job_results(job_id, rows):
+    """Add a parsing job's rows to the candidate pool; a failure here never fails the job"""
     try:
-        if os.path.exists(temp_path):
-            shutil.rmtree(temp_path)
-            logger.info(f"Cleaned up temporary folder: {temp_path}")
+        counts = await asyncio.to_thread(add_to_candidate_pool, rows, job_id)
+        job_store.update(job_id, candidate_pool=counts)
     except Exception as e:
-        logger.warning(f"Failed to cleanup temp folder {temp_path}: {e}")
+        logger.warning(f"Could not add job {job_id} to the candidate pool: {e}")
 
-async def process_resume_parsing_from_zip(zip_file_path, job_id):
-    """Main resume parsing function from ZIP file with parallel processing"""
+async def process_resume_parsing_from_zip(zip_file_path, job_id, use_cache=True, add_to_pool=True):
+    """Main resume parsing function from ZIP file, streaming members straight into the pipeline.
+    
+    The archive is kept until the job completes without failed files, so a
+    failed or interrupted job can be resumed from its checkpoint.
+    """
     start_time = time.time()
-    temp_extract_path = None
     
     try:
-        job_status[job_id]["status"] = "processing"
-        
-        # Create temporary extraction directory
-        temp_extract_path = TEMP_DIR / f"extract_{job_id}"
-        temp_extract_path.mkdir(exist_ok=True)
-        
-        # Extract ZIP file and get resume files
-        files = extract_zip_file(zip_file_path, temp_extract_path)
-        job_status[job_id]["total_files"] = len(files)
-        
-        if not files:
-            raise ValueError("No valid resume files found in ZIP archive")
-        
-        # Split files among workers
-        file_splits = split_files_for_workers(files, MAX_WORKERS)
-        
-        # Process files in parallel using ThreadPoolExecutor
-        all_results = []
-        
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Submit worker tasks
-            futures = [
-                executor.submit(process_worker_files, worker_files, worker_id, job_id)
-                for worker_id, worker_files in enumerate(file_splits)
-                if worker_files  # Only submit if worker has files
-            ]
+        job_store.update(job_id, status="processing", started_at=start_time, error_message=None)
+        
+        # Only the central directory is read up front; member bytes are read as workers need them
+        zip_ref = await asyncio.to_thread(open_zip_file, zip_file_path)
+        with zip_ref:
+            members = list_zip_resume_members(zip_ref)
+            job_store.update(job_id, total_files=len(members))
+            logger.info(f"Found {len(members)} resume files in ZIP")
             
-            # Collect results from all workers
-            for future in as_completed(futures):
-                try:
-                    worker_results = future.result(timeout=1800)  # 30 minute timeout
-                    all_results.extend(worker_results)
-                except Exception as e:
-                    logger.error(f"Worker failed: {e}")
+            if not members:
+                raise ValueError("No valid resume files found in ZIP archive")
+            
+            members = dispatch_order(members, size=lambda info: info.file_size)
+            all_results = await parse_pending_files(
+                job_id, members, lambda info: info.filename,
+                lambda pending: iter_zip_resumes(zip_ref, pending), use_cache
+            )
         
-        # Save results to CSV
+        # Save results (CSV or Parquet)
         df = pd.DataFrame(all_results)
-        csv_path = RESULTS_DIR / f"resume_parsing_{job_id}.csv"
-        df.to_csv(csv_path, index=False)
+        csv_path = RESULTS_DIR / f"resume_parsing_{job_id}{FORMAT_EXTENSIONS[RESULT_FORMAT]}"
+        await asyncio.to_thread(write_job_results, df, csv_path)
+        if add_to_pool:
+            await pool_job_results(job_id, all_results)
         
         processing_time = time.time() - start_time
         
         # Update job status
-        job_status[job_id].update({
-            "status": "completed",
-            "result_csv_path": str(csv_path),
-            "processing_time": round(processing_time, 2)
-        })
+        job_store.update(
+            job_id,
+            status="completed",
+            result_csv_path=str(csv_path),
+            processing_time=round(processing_time, 2)
+        )
         
         # Log statistics
         successful = len([r for r in all_results if r["status"] == "success"])
         failed = len([r for r in all_results if r["status"] == "failed"])
         api_stats = api_distributor.get_stats()
         
+        JOB_SECONDS.observe(processing_time, kind="parse", status="completed")
         logger.info(f"Resume parsing completed in {processing_time:.2f}s")
         logger.info(f"Results: {successful} successful, {failed} failed")
         logger.info(f"API usage: {api_stats}")
         
+        # Nothing left to retry: clean up the uploaded archive and the checkpoint
+        if not failed:
+            if os.path.exists(zip_file_path):
+                os.remove(zip_file_path)
+            ResultCheckpoint(checkpoint_path(job_id)).delete()
+        
     except Exception as e:
         logger.error(f"Resume parsing failed: {e}")
-        job_status[job_id].update({
-            "status": "failed",
-            "error_message": str(e),
-            "processing_time": round(time.time() - start_time, 2)
-        })
-    finally:
-        # Clean up temporary files
-        if temp_extract_path:
-            cleanup_temp_folder(temp_extract_path)
-        if os.path.exists(zip_file_path):
-            os.remove(zip_file_path)
+        JOB_SECONDS.observe(time.time() - start_time, kind="parse", status="failed")
+        job_store.update(
+            job_id,
+            status="failed",
+            error_message=str(e),
+            processing_time=round(time.time() - start_time, 2)
+        )
 
-async def process_resume_parsing(folder_path, job_id):
+async def process_resume_parsing(folder_path, job_id, use_cache=True, add_to_pool=True):
     """Main resume parsing function with parallel processing (kept for backward compatibility)"""
     start_time = time.time()
     
     try:
-        job_status[job_id]["status"] = "processing"
+        job_store.update(job_id, status="processing", started_at=start_time, error_message=None)
         
         # Get all resume files
-        files = get_resume_files(folder_path)
-        job_status[job_id]["total_files"] = len(files)
-        
-        # Split files among workers
-        file_splits = split_files_for_workers(files, MAX_WORKERS)
+        files = await asyncio.to_thread(get_resume_files, folder_path)
+        job_store.update(job_id, total_files=len(files))
         
-        # Process files in parallel using ThreadPoolExecutor
-        all_results = []
-        
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            # Submit worker tasks
-            futures = [
-                executor.submit(process_worker_files, worker_files, worker_id, job_id)
-                for worker_id, worker_files in enumerate(file_splits)
-                if worker_files  # Only submit if worker has files
-            ]
-            
-            # Collect results from all workers
-            for future in as_completed(futures):
-                try:
-                    worker_results = future.result(timeout=1800)  # 30 minute timeout
-                    all_results.extend(worker_results)
-                except Exception as e:
-                    logger.error(f"Worker failed: {e}")
+        # Process files concurrently across all API keys, dispatched from one shared queue
+        files = dispatch_order(files, size=lambda file_info: file_info["size"])
+        all_results = await parse_pending_files(
+            job_id, files, lambda file_info: file_info["path"], iter_resume_files, use_cache
+        )
         
-        # Save results to CSV
+        # Save results (CSV or Parquet)
         df = pd.DataFrame(all_results)
-        csv_path = RESULTS_DIR / f"resume_parsing_{job_id}.csv"
-        df.to_csv(csv_path, index=False)
+        csv_path = RESULTS_DIR / f"resume_parsing_{job_id}{FORMAT_EXTENSIONS[RESULT_FORMAT]}"
+        await asyncio.to_thread(write_job_results, df, csv_path)
+        if add_to_pool:
+            await pool_job_results(job_id, all_results)
         
         processing_time = time.time() - start_time
         
         # Update job status
-        job_status[job_id].update({
-            "status": "completed",
-            "result_csv_path": str(csv_path),
-            "processing_time": round(processing_time, 2)
-        })
+        job_store.update(
+            job_id,
+            status="completed",
+            result_csv_path=str(csv_path),
+            processing_time=round(processing_time, 2)
+        )
         
         # Log statistics
         successful = len([r for r in all_results if r["status"] == "success"])
         failed = len([r for r in all_results if r["status"] == "failed"])
         api_stats = api_distributor.get_stats()
         
+        JOB_SECONDS.observe(processing_time, kind="parse", status="completed")
         logger.info(f"Resume parsing completed in {processing_time:.2f}s")
         logger.info(f"Results: {successful} successful, {failed} failed")
         logger.info(f"API usage: {api_stats}")
         
+        if not failed:
+            ResultCheckpoint(checkpoint_path(job_id)).delete()
+        
     except Exception as e:
         logger.error(f"Resume parsing failed: {e}")
-        job_status[job_id].update({
-            "status": "failed",
-            "error_message": str(e),
-            "processing_time": round(time.time() - start_time, 2)
-        })
+        JOB_SECONDS.observe(time.time() - start_time, kind="parse", status="failed")
+        job_store.update(
+            job_id,
+            status="failed",
+            error_message=str(e),
+            processing_time=round(time.time() - start_time, 2)
+        )
 
-async def process_job_matching(csv_file_path, job_description, job_id):
-    """Process job matching for CSV file"""
+def match_job_results(csv_file_path, job_description, job_id, job_posting_id=None,
+                      required_skills=None, weights=(1.0, 0.0)):
+    """Score a result file, or the whole candidate pool when csv_file_path is None, and save the scored rows.
+    
+    Candidates missing any of required_skills are dropped before scoring; the
+    rest get the weighted blend of their semantic and skill (BM25) scores.
+    Blocking (pandas and Doc2Vec work), so it runs in a worker thread; returns the result file path.
+    """
+    # Only the summaries are needed for scoring
+    if csv_file_path is None:
+        summaries = candidate_pool.summaries().to_frame()
+    else:
+        summaries = read_results(csv_file_path, columns=["summary"])
+    
+    index = load_skill_index(csv_file_path) if required_skills or weights[1] > 0 else None
+    if required_skills:
+        summaries = summaries[required_skill_mask(index, summaries.index, required_skills)]
+        logger.info(f"{len(summaries)} resumes have all required skills: {', '.join(required_skills)}")
+    total_resumes = len(summaries)
+    job_store.update(job_id, total_files=total_resumes)
+    
+    logger.info(f"Processing job matching for {total_resumes} resumes")
+    
+    def update_progress(processed_count):
+        job_store.update(
+            job_id,
+            processed_files=processed_count,
+            progress_percentage=round((processed_count / total_resumes) * 100, 2) if total_resumes else 0.0
+        )
+    
+    # Score every resume in one vectorized pass
+    scores, recommendations = score_summaries(
+        summaries["summary"] if "summary" in summaries.columns else [None] * total_resumes,
+        job_description,
+        progress_callback=update_progress,
+        job_posting_id=job_posting_id,
+        lexical_scores=index.scores(job_description, summaries.index) if weights[1] > 0 else None,
+        weights=weights
+    )
+    
+    # The full rows are only loaded to write the output (exactly the candidates that were scored)
+    if csv_file_path is None:
+        df = candidate_pool.frame(summaries.index)
+    else:
+        df = read_results(csv_file_path).loc[summaries.index]
+    df["match_score"] = scores
+    df["recommendation"] = recommendations
+    update_progress(total_resumes)
+    
+    # Results are served page by page from this file (see /api/results/{job_id})
+    result_csv_path = RESULTS_DIR / f"job_matching_{job_id}{FORMAT_EXTENSIONS[RESULT_FORMAT]}"
+    write_job_results(fill_missing(df), result_csv_path)
+    return result_csv_path
+
+async def process_job_matching(csv_file_path, job_description, job_id, job_posting_id=None,
+                               required_skills=None, weights=(1.0, 0.0)):
+    """Background matching job: scoring runs in a worker thread, so status polls and other requests are never blocked"""
     start_time = time.time()
     
     try:
-        job_status[job_id]["status"] = "processing"
-        
-        # Read CSV
-        df = pd.read_csv(csv_file_path)
-        total_resumes = len(df)
-        job_status[job_id]["total_files"] = total_resumes
-        
-        logger.info(f"Processing job matching for {total_resumes} resumes")
-        
-        # Add match columns
-        df["match_score"] = 0.0
-        df["recommendation"] = ""
-        
-        processed_count = 0
-        results_json = []
-        
-        # Process each resume
-        for idx, row in df.iterrows():
-            try:
-                if pd.notna(row["summary"]) and str(row["summary"]).strip():
-                    score = calculate_match_score(row["summary"], job_description)
-                    recommendation = get_recommendation(score)
-                    df.at[idx, "match_score"] = score
-                    df.at[idx, "recommendation"] = recommendation
-                else:
-                    df.at[idx, "match_score"] = 0.0
-                    df.at[idx, "recommendation"] = "No summary available"
-                
-                processed_count += 1
-                # Update progress
-                progress = (processed_count / total_resumes) * 100
-                job_status[job_id]["processed_files"] = processed_count
-                job_status[job_id]["progress_percentage"] = round(progress, 2)
-            except Exception as e:
-                logger.error(f"Error processing row {idx}: {e}")
-                df.at[idx, "match_score"] = 0.0
-                df.at[idx, "recommendation"] = f"Error: {str(e)}"
+        job_store.update(job_id, status="processing", started_at=start_time)
         
-        # Clean DataFrame for JSON serialization
-        df = df.replace([np.inf, -np.inf], np.nan)
-        df = df.fillna(0.0)
-        
-        # Build results_json
-        for idx, row in df.iterrows():
-            row_dict = row.to_dict()
-            row_dict["match_score"] = df.at[idx, "match_score"]
-            row_dict["recommendation"] = df.at[idx, "recommendation"]
-            results_json.append(row_dict)
-        
-        # Save results
-        result_csv_path = RESULTS_DIR / f"job_matching_{job_id}.csv"
-        df.to_csv(result_csv_path, index=False)
+        result_csv_path = await asyncio.to_thread(
+            match_job_results, csv_file_path, job_description, job_id, job_posting_id, required_skills, weights
+        )
         
         processing_time = time.time() - start_time
         
         # Update job status
-        job_status[job_id].update({
-            "status": "completed",
-            "result_csv_path": str(result_csv_path),
-            "processing_time": round(processing_time, 2),
-            "results_json": results_json
-        })
-        
+        job_store.update(
+            job_id,
+            status="completed",
+            result_csv_path=str(result_csv_path),
+            processing_time=round(processing_time, 2)
+        )
+        
+        JOB_SECONDS.observe(processing_time, kind="match", status="completed")
         logger.info(f"Job matching completed in {processing_time:.2f}s")
         
     except Exception as e:
         logger.error(f"Job matching failed: {e}")
-        job_status[job_id].update({
-            "status": "failed",
-            "error_message": str(e),
-            "processing_time": round(time.time() - start_time, 2),
-            "results_json": []
-        })
+        JOB_SECONDS.observe(time.time() - start_time, kind="match", status="failed")
+        job_store.update(
+            job_id,
+            status="failed",
+            error_message=str(e),
+            processing_time=round(time.time() - start_time, 2)
+        )
+
+def load_match_summaries(csv_file_path):
+    """Summaries to match: a result file's (indexed by row) or the candidate pool's (indexed by candidate id)"""
+    if csv_file_path is None:
+        return candidate_pool.summaries()
+    return read_results(csv_file_path, columns=["summary"])["summary"]
+
+def load_match_rows(csv_file_path, row_indices):
+    """Full rows for the given summary index labels of load_match_summaries"""
+    if csv_file_path is None:
+        return candidate_pool.frame(row_indices)
+    return read_result_rows(csv_file_path, row_indices)
+
+def load_summary_keys(csv_file_path):
+    """Embedding keys of a match source's summaries, every one of them embedded and in the ANN index.
+    
+    The pool's keys are synced from the keys it stores, a result file's are
+    computed once per version of the file; summaries are only read (and
+    inferred where missing) the first time, or after the model changed.
+    """
+    candidate_index.sync(embedding_store)
+    fingerprint = candidate_index.source_fingerprint
+    if csv_file_path is None:
+        keys = pool_summary_keys
+        new_keys = keys.sync(candidate_pool)
+        if keys.embedded_fingerprint != fingerprint:
+            new_keys = keys.keys()
+        # Parsing jobs embed what they add to the pool, so this is normally empty
+        needs_embedding = bool(embedding_store.missing(new_keys))
+    else:
+        stat = os.stat(csv_file_path)
+        cache_key = (os.path.abspath(csv_file_path), stat.st_size, stat.st_mtime_ns)
+        with result_summary_keys_lock:
+            keys = result_summary_keys.get(cache_key)
+            if keys is None:
+                keys = result_summary_keys[cache_key] = SummaryKeys()
+                while len(result_summary_keys) > RESULT_KEY_CACHE_FILES:
+                    result_summary_keys.pop(next(iter(result_summary_keys)))
+        needs_embedding = keys.embedded_fingerprint != fingerprint
+    
+    if needs_embedding:
+        summaries = load_match_summaries(csv_file_path)
+        summaries = summaries[summaries.notna() & summaries.astype(str).str.strip().ne("")].astype(str)
+        for row_index, key in zip(summaries.index, ensure_summary_vectors(summaries.tolist())):
+            keys.set(row_index, key)
+        candidate_index.sync(embedding_store)
+    keys.embedded_fingerprint = candidate_index.source_fingerprint
+    return keys
+
+def find_top_candidates(csv_file_path, job_description, top_k, job_posting_id=None, required_skills=None,
+                        weights=(1.0, 0.0)):
+    """Top-K resumes of a result file (or of the candidate pool without one), retrieved through the ANN index.
+    
+    With a lexical weight, HYBRID_RERANK_FACTOR times K semantic neighbours are
+    retrieved and re-ranked by their blended semantic and skill scores.
+    """
+    keys = load_summary_keys(csv_file_path)
+    index = load_skill_index(csv_file_path) if required_skills or weights[1] > 0 else None
+    allowed_rows = None
+    if required_skills:
+        allowed_rows = index.matching(required_skills, keys.labels())
+        if not allowed_rows:
+            return []
+    if not len(keys):
+        return []
+    
+    job_vector = get_job_vector(job_description, job_posting_id)
+    retrieve = top_k * HYBRID_RERANK_FACTOR if weights[1] > 0 else top_k
+    
+    def search(allowed_keys=None):
+        matches = []
+        for key, similarity in candidate_index.search(job_vector, k=retrieve, allowed_keys=allowed_keys):
+            score = round(100 * similarity, 2)
+            matches.extend((row_index, score) for row_index in keys.rows(key, allowed_rows))
+        return matches[:retrieve]
+    
+    if allowed_rows is not None:
+        matches = search(keys.keys(allowed_rows))
+    else:
+        # The index holds every source's summaries: search it unfiltered, and only restrict
+        # the search to this source's keys when other candidates crowded its best ones out
+        matches = search()
+        if len(matches) < min(retrieve, len(keys)):
+            matches = search(keys.keys())
+    if not matches:
+        return []
+    
+    if weights[1] > 0:
+        row_indices = [row_index for row_index, _ in matches]
+        blended = blend_scores([score for _, score in matches], index.scores(job_description, row_indices), weights)
+        matches = [(row_indices[i], float(blended[i])) for i in np.argsort(-blended, kind="stable")]
+    matches = matches[:top_k]
+    
+    # Load only the winning rows
+    df = load_match_rows(csv_file_path, [row_index for row_index, _ in matches])
+    df = fill_missing(df)
+    df["match_score"] = [score for _, score in matches]
+    df["recommendation"] = [get_recommendation(score) for _, score in matches]
+    return records_from_frame(df)
+
+def validate_match_source(csv_file_path):
+    """Reject matching against a missing result file or an empty candidate pool"""
+    if csv_file_path is None:
+        if not len(candidate_pool):
+            raise HTTPException(status_code=400, detail="The candidate pool is empty")
+    elif not os.path.exists(csv_file_path):
+        raise HTTPException(status_code=404, detail="CSV file not found")
+
+def match_matrix_lines(request, labels, scores, has_summary, start_time):
+    """NDJSON lines of a score matrix: a header, then one line per job (its scores, or its top matches)"""
+    header = {"jobs": len(request.jobs), "candidates": len(labels), "top_k": request.top_k}
+    if request.top_k is None:
+        header["candidate_ids"] = [int(label) for label in labels]
+    
+    winners = []
+    rows_by_label = {}
+    if request.top_k is not None:
+        winners = [top_score_indices(job_scores, has_summary, request.top_k) for job_scores in scores]
+        # Every winning row is loaded once, however many jobs it wins for
+        wanted = sorted({int(labels[position]) for positions in winners for position in positions})
+        if wanted:
+            df = fill_missing(load_match_rows(request.csv_file_path, wanted))
+            rows_by_label = dict(zip(wanted, records_from_frame(df.loc[wanted])))
+    
+    header["processing_time"] = round(time.time() - start_time, 2)
+    yield json.dumps(header) + "\n"
+    
+    for job_index, (job, job_scores) in enumerate(zip(request.jobs, scores)):
+        line = {"job_index": job_index, "job_posting_id": job.job_posting_id}
+        if request.top_k is None:
+            # null: the candidate lacks one of this job's required skills
+            line["scores"] = [None if np.isnan(score) else score for score in job_scores.tolist()]
+        else:
+            line["matches"] = [
+                {
+                    **rows_by_label[int(labels[position])],
+                    "match_score": float(job_scores[position]),
+                    "recommendation": get_recommendation(job_scores[position])
+                }
+                for position in winners[job_index]
+            ]
+        yield json.dumps(line) + "\n"
+
+# Progress streaming
+STATUS_EVENT_FIELDS = (
+    "job_id", "status", "total_files", "processed_files", "failed_files", "progress_percentage",
+    "result_csv_path", "error_message", "processing_time"
+)
+
+def format_sse(event, data, event_id=None):
+    """One Server-Sent Events message"""
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data)}")
+    return "\n".join(lines) + "\n\n"
+
+async def job_event_stream(job_id, request, last_event_id=0, include_rows=False):
+    """Tail a job's event log as SSE: "file" per processed file, "status" on changes, then "done" """
+    last_status = None
+    last_sent = time.monotonic()
+    while not await request.is_disconnected():
+        # Read the job before its events: once it is finished, no event can be appended after this read
+        job = job_store.get(job_id)
+        if job is None:
+            yield format_sse("error", {"detail": "Job not found"})
+            return
+        
+        events = job_store.events_since(job_id, last_event_id)
+        for event in events:
+            data = event["data"]
+            if not include_rows:
+                data = {key: value for key, value in data.items() if key != "row"}
+            yield format_sse(event["event"], data, event["id"])
+            last_event_id = event["id"]
+            last_sent = time.monotonic()
+        
+        status = {field: job.get(field) for field in STATUS_EVENT_FIELDS}
+        if status != last_status:
+            yield format_sse("status", {**status, "eta_seconds": estimate_eta(job)})
+            last_status = status
+            last_sent = time.monotonic()
+        
+        if job["status"] in ("completed", "failed") and not events:
+            yield format_sse("done", status)
+            return
+        
+        if events:
+            continue  # Catch up on a backlog without waiting
+        if time.monotonic() - last_sent > EVENT_KEEPALIVE_SECONDS:
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+        await asyncio.sleep(EVENT_POLL_INTERVAL)
 
 # API ENDPOINTS
 
 @app.post("/api/parse-resumes-zip")
 async def parse_resumes_from_zip(
     background_tasks: BackgroundTasks,
-    zip_file: UploadFile = File(...)
+    zip_file: UploadFile = File(...),
+    use_cache: bool = True,
+    add_to_pool: bool = True
 ):
     """
     Parse all resumes from an uploaded ZIP file
     - Accepts ZIP file upload containing resume files
-    - Extracts ZIP to temporary directory
-    - Uses 5 workers with 5 API keys in parallel
+    - Streams archive members straight into text extraction (no extract-to-disk)
+    - Runs concurrent Gemini calls across all API keys on the event loop
     - Saves results to CSV
-    - Cleans up temporary files after processing
+    - Checkpoints every file's result as it finishes (see /api/resume/{job_id})
+    - Deletes the uploaded archive once every file has succeeded
+    - Reuses cached analyses of previously seen resumes (pass use_cache=false to bypass)
+    - Adds the parsed candidates to the candidate pool (pass add_to_pool=false to skip)
     """
     job_id = str(uuid.uuid4())
     
@@ -663,39 +1890,44 @@ async def parse_resumes_from_zip(
         if zip_file.size and zip_file.size > MAX_FILE_SIZE:
             raise HTTPException(status_code=413, detail=f"File too large. Maximum size: {MAX_FILE_SIZE/1024/1024}MB")
         
-        # Save uploaded ZIP file
+        # Stream the uploaded ZIP file to disk in chunks
         zip_filename = f"upload_{job_id}_{zip_file.filename}"
         zip_file_path = UPLOAD_DIR / zip_filename
         
+        file_size = 0
         with open(zip_file_path, "wb") as buffer:
-            content = await zip_file.read()
-            buffer.write(content)
+            while chunk := await zip_file.read(UPLOAD_CHUNK_SIZE):
+                file_size += len(chunk)
+                if file_size > MAX_FILE_SIZE:
+                    break
+                buffer.write(chunk)
+        if file_size > MAX_FILE_SIZE:
+            os.remove(zip_file_path)
+            raise HTTPException(status_code=413, detail=f"File too large. Maximum size: {MAX_FILE_SIZE/1024/1024}MB")
         
-        logger.info(f"Uploaded ZIP file: {zip_filename} ({len(content)} bytes)")
+        logger.info(f"Uploaded ZIP file: {zip_filename} ({file_size} bytes)")
         
-        # Initialize job status
-        job_status[job_id] = {
-            "job_id": job_id,
-            "status": "pending",
-            "total_files": 0,
-            "processed_files": 0,
-            "failed_files": 0,
-            "progress_percentage": 0.0,
-            "result_csv_path": None,
-            "error_message": None,
-            "processing_time": None
-        }
+        # Initialize job status (the source and checkpoint are recorded so the job can be resumed)
+        job_store.create(
+            job_id,
+            upload_path=str(zip_file_path),
+            checkpoint_path=str(checkpoint_path(job_id)),
+            use_cache=use_cache,
+            add_to_pool=add_to_pool
+        )
         
         # Start background processing
-        background_tasks.add_task(process_resume_parsing_from_zip, str(zip_file_path), job_id)
+        background_tasks.add_task(process_resume_parsing_from_zip, str(zip_file_path), job_id, use_cache, add_to_pool)
         
         return {
             "job_id": job_id,
             "message": "Resume parsing from ZIP started",
             "filename": zip_file.filename,
-            "file_size": len(content)
+            "file_size": file_size
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Parse resumes from ZIP error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -707,9 +1939,10 @@ async def parse_resumes(
 ):
     """
     Parse all resumes from a folder (kept for backward compatibility)
-    - Uses 5 workers with 5 API keys in parallel
-    - Splits files evenly among workers
+    - Runs concurrent Gemini calls across all API keys on the event loop
+    - Workers take files from one shared queue, largest first
     - Saves results to CSV
+    - Checkpoints every file's result as it finishes (see /api/resume/{job_id})
     """
     job_id = str(uuid.uuid4())
     
@@ -719,20 +1952,18 @@ async def parse_resumes(
             raise HTTPException(status_code=404, detail="Folder not found")
         
         # Initialize job status
-        job_status[job_id] = {
-            "job_id": job_id,
-            "status": "pending",
-            "total_files": 0,
-            "processed_files": 0,
-            "failed_files": 0,
-            "progress_percentage": 0.0,
-            "result_csv_path": None,
-            "error_message": None,
-            "processing_time": None
-        }
+        job_store.create(
+            job_id,
+            folder_path=request.folder_path,
+            checkpoint_path=str(checkpoint_path(job_id)),
+            use_cache=request.use_cache,
+            add_to_pool=request.add_to_pool
+        )
         
         # Start background processing
-        background_tasks.add_task(process_resume_parsing, request.folder_path, job_id)
+        background_tasks.add_task(
+            process_resume_parsing, request.folder_path, job_id, request.use_cache, request.add_to_pool
+        )
         
         return {
             "job_id": job_id,
@@ -744,6 +1975,54 @@ async def parse_resumes(
         logger.error(f"Parse resumes error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def job_is_running(job_info):
+    """Whether a pending or processing job has made progress within JOB_STALE_SECONDS (a dead run's job has not)"""
+    if job_info["status"] not in ("pending", "processing"):
+        return False
+    last_progress = max(job_info.get("heartbeat_at") or 0, job_info.get("started_at") or 0)
+    return time.time() - last_progress < JOB_STALE_SECONDS
+
+@app.post("/api/resume/{job_id}")
+async def resume_parsing_job(job_id: str, background_tasks: BackgroundTasks):
+    """
+    Restart a failed, interrupted or partly failed parsing job from its checkpoint
+    - Files that already succeeded keep their checkpointed rows (no new Gemini calls)
+    - Only unprocessed and failed files go through the pipeline again
+    - A job still marked processing can only be resumed once it has made no progress for JOB_STALE_SECONDS
+    """
+    job_info = job_store.get(job_id)
+    if job_info is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if not job_info.get("checkpoint_path"):
+        raise HTTPException(status_code=400, detail="Only parsing jobs can be resumed")
+    
+    if job_is_running(job_info):
+        raise HTTPException(status_code=409, detail="Job is still running")
+    if job_info["status"] == "completed" and not job_info["failed_files"]:
+        raise HTTPException(status_code=400, detail="Job has no unprocessed or failed files")
+    
+    options = (job_info.get("use_cache", True), job_info.get("add_to_pool", True))
+    if job_info.get("upload_path"):
+        if not os.path.exists(job_info["upload_path"]):
+            raise HTTPException(status_code=410, detail="The uploaded ZIP file is no longer available")
+        background_tasks.add_task(process_resume_parsing_from_zip, job_info["upload_path"], job_id, *options)
+    else:
+        if not os.path.exists(job_info["folder_path"]):
+            raise HTTPException(status_code=404, detail="Folder not found")
+        background_tasks.add_task(process_resume_parsing, job_info["folder_path"], job_id, *options)
+    
+    # Claim the job before the runner starts so a second resume request is refused
+    job_store.update(job_id, status="pending", heartbeat_at=time.time(), resumes=job_info.get("resumes", 0) + 1)
+    already_done = sum(
+        row["status"] == "success" for row in ResultCheckpoint(job_info["checkpoint_path"]).load().values()
+    )
+    
+    return {
+        "job_id": job_id,
+        "message": "Resume parsing restarted",
+        "files_already_processed": already_done
+    }
+
 @app.post("/api/match-jobs")
 async def match_jobs(
     background_tasks: BackgroundTasks,
@@ -751,61 +2030,220 @@ async def match_jobs(
 ):
     """
     Add job match scores to existing CSV
-    - Reads CSV with parsed resumes
-    - Calculates match score for each resume
+    - Reads CSV with parsed resumes (or the whole candidate pool when no csv_file_path is given)
+    - Calculates match score for each resume in a background job (poll /api/status/{job_id})
     - Saves updated CSV with scores
-    - Returns JSON content of results for frontend integration
+    - Serves the scored rows page by page, sorted, from /api/results/{job_id}
     """
     job_id = str(uuid.uuid4())
     
     try:
-        # Validate CSV file
-        if not os.path.exists(request.csv_file_path):
-            raise HTTPException(status_code=404, detail="CSV file not found")
+        validate_match_source(request.csv_file_path)
+        weights = match_weights(request.semantic_weight, request.lexical_weight)
         
         # Initialize job status
-        job_status[job_id] = {
-            "job_id": job_id,
-            "status": "pending",
-            "total_files": 0,
-            "processed_files": 0,
-            "failed_files": 0,
-            "progress_percentage": 0.0,
-            "result_csv_path": None,
-            "error_message": None,
-            "processing_time": None,
-            "results_json": []
-        }
+        job_store.create(job_id)
         
         # Start background processing
-        await process_job_matching(request.csv_file_path, request.job_description, job_id)
-        # Return the JSON content directly
+        background_tasks.add_task(
+            process_job_matching, request.csv_file_path, request.job_description, job_id,
+            request.job_posting_id, request.required_skills, weights
+        )
+        
         return {
             "job_id": job_id,
-            "message": "Job matching completed",
-            "csv_file_path": job_status[job_id]["result_csv_path"],
-            "results": job_status[job_id]["results_json"]
+            "message": "Job matching started"
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Match jobs error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/top-candidates")
+async def top_candidates(request: TopCandidatesRequest):
+    """
+    Return only the best matching resumes for a job description
+    - Embeds any summaries from the CSV that are not in the embedding store yet
+    - Retrieves the top K through the approximate nearest-neighbour index, re-ranked with skill scores
+    - Only candidates with all required_skills are searched
+    - Searches the whole candidate pool when no csv_file_path is given
+    """
+    try:
+        validate_match_source(request.csv_file_path)
+        if request.top_k < 1:
+            raise HTTPException(status_code=400, detail="top_k must be at least 1")
+        weights = match_weights(request.semantic_weight, request.lexical_weight)
+        
+        start_time = time.time()
+        results = await asyncio.to_thread(
+            find_top_candidates, request.csv_file_path, request.job_description, request.top_k, request.job_posting_id,
+            request.required_skills, weights
+        )
+        return {
+            "top_k": request.top_k,
+            "processing_time": round(time.time() - start_time, 2),
+            "results": results
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Top candidates error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/api/match-matrix")
+async def match_matrix(request: MatchMatrixRequest):
+    """
+    Score candidates against many job descriptions at once
+    - Reads the summaries once (from csv_file_path, or the whole candidate pool)
+    - Candidate vectors come from the embedding store, job vectors from their cache
+    - One matrix multiply gives the jobs x candidates score matrix, blended with skill scores
+    - Streams NDJSON: a header line, then one line per job with every candidate's score
+      (in header["candidate_ids"] order, null without the job's required_skills) or, with top_k,
+      its best matches
+    """
+    try:
+        validate_match_source(request.csv_file_path)
+        if not request.jobs:
+            raise HTTPException(status_code=400, detail="At least one job is required")
+        if request.top_k is not None and request.top_k < 1:
+            raise HTTPException(status_code=400, detail="top_k must be at least 1")
+        weights = match_weights(request.semantic_weight, request.lexical_weight)
+        
+        start_time = time.time()
+        summaries = await asyncio.to_thread(load_match_summaries, request.csv_file_path)
+        index = None
+        if weights[1] > 0 or any(job.required_skills for job in request.jobs):
+            index = await asyncio.to_thread(load_skill_index, request.csv_file_path)
+        scores, has_summary = await asyncio.to_thread(score_matrix, summaries, request.jobs, weights, index)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Match matrix error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return StreamingResponse(
+        match_matrix_lines(request, summaries.index, scores, has_summary, start_time),
+        media_type="application/x-ndjson"
+    )
+
+@app.get("/api/pool")
+async def get_candidate_pool():
+    """Size of the candidate pool that matching runs against when no CSV is given"""
+    return candidate_pool.get_stats()
+
+@app.post("/api/pool/import")
+async def import_into_candidate_pool(request: PoolImportRequest):
+    """
+    Add the rows of an existing result file (CSV or Parquet) to the candidate pool
+    - Candidates already in the pool (same email or same analysis) are updated, not duplicated
+    - Only new or changed summaries are embedded and indexed
+    """
+    try:
+        if not os.path.exists(request.csv_file_path):
+            raise HTTPException(status_code=404, detail="CSV file not found")
+        
+        rows = await asyncio.to_thread(read_result_records, request.csv_file_path)
+        counts = await asyncio.to_thread(add_to_candidate_pool, rows)
+        return {**counts, "pool": candidate_pool.get_stats()}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Candidate pool import error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.delete("/api/job-vectors/{job_posting_id}")
+async def invalidate_job_vector(job_posting_id: str):
+    """Drop the cached vector of a backend job that was edited or deleted"""
+    return {"job_posting_id": job_posting_id, "invalidated": job_vector_cache.invalidate_posting(job_posting_id)}
+
 @app.get("/api/status/{job_id}", response_model=JobStatus)
 async def get_job_status(job_id: str):
     """Get status of any job (parsing or matching)"""
-    if job_id not in job_status:
+    job_info = job_store.get(job_id)
+    if job_info is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    return job_status[job_id]
+    return job_info
 
-@app.get("/api/download/{job_id}")
-async def download_results(job_id: str):
-    """Download results CSV file"""
-    if job_id not in job_status:
+@app.get("/api/events/{job_id}")
+async def stream_job_events(job_id: str, request: Request, include_rows: bool = False):
+    """Server-Sent Events stream of a job's progress (replaces polling /api/status)"""
+    if job_store.get(job_id) is None:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job_info = job_status[job_id]
+    # Reconnecting EventSource clients resume after the last event they saw
+    last_event_id = request.headers.get("last-event-id", "")
+    last_event_id = int(last_event_id) if last_event_id.isdigit() else 0
+    
+    return StreamingResponse(
+        job_event_stream(job_id, request, last_event_id, include_rows),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/results/{job_id}")
+async def get_job_results(
+    job_id: str,
+    page: int = 1,
+    page_size: int = DEFAULT_RESULTS_PAGE_SIZE,
+    sort_by: Optional[str] = None,
+    order: str = "desc"
+):
+    """
+    One page of a finished job's result rows
+    - Sorted by any result column when sort_by is given (e.g. match_score), in file order otherwise
+    - order is "asc" or "desc"; ties keep their file order and empty values come last
+    """
+    job_info = job_store.get(job_id)
+    if not job_info:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job_info["status"] != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job_info['status']}, results are not ready")
+    if page < 1:
+        raise HTTPException(status_code=400, detail="page must be at least 1")
+    if not 1 <= page_size <= MAX_RESULTS_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"page_size must be between 1 and {MAX_RESULTS_PAGE_SIZE}")
+    if order not in ("asc", "desc"):
+        raise HTTPException(status_code=400, detail="order must be 'asc' or 'desc'")
+    
+    result_path = job_info.get("result_csv_path")
+    if not result_path or not os.path.exists(result_path):
+        raise HTTPException(status_code=404, detail="Result file not found")
+    
+    try:
+        if sort_by is not None and sort_by not in await asyncio.to_thread(result_columns, result_path):
+            raise HTTPException(status_code=400, detail=f"Unknown sort column: {sort_by}")
+        total, results = await asyncio.to_thread(
+            read_result_page, result_path, (page - 1) * page_size, page_size, sort_by, order == "desc"
+        )
+        return {
+            "job_id": job_id,
+            "page": page,
+            "page_size": page_size,
+            "total": total,
+            "pages": -(-total // page_size),
+            "sort_by": sort_by,
+            "order": order,
+            "results": results
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Results error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/api/download/{job_id}")
+async def download_results(job_id: str, format: Optional[str] = None):
+    """Download results as CSV or Parquet (converted on demand if stored in the other format)"""
+    job_info = job_store.get(job_id)
+    if job_info is None:
+        raise HTTPException(status_code=404, detail="Job not found")
     
     if job_info["status"] != "completed" or not job_info["result_csv_path"]:
         raise HTTPException(status_code=400, detail="Results not ready")
@@ -813,10 +2251,22 @@ async def download_results(job_id: str):
     csv_path = job_info["result_csv_path"]
     if not os.path.exists(csv_path):
         raise HTTPException(status_code=404, detail="Results file not found")
+    
+    requested_format = format or result_format(csv_path)
+    if requested_format not in available_formats():
+        raise HTTPException(status_code=400, detail=f"Unsupported format. Available: {', '.join(available_formats())}")
+    
+    download_path = csv_path
+    if requested_format != result_format(csv_path):
+        download_path = str(Path(csv_path).with_suffix(FORMAT_EXTENSIONS[requested_format]))
+        if not os.path.exists(download_path):
+            await asyncio.to_thread(convert_results, csv_path, download_path)
+            job_store.update(job_id, converted_path=download_path)
+    
     return FileResponse(
-        csv_path,
-        media_type='text/csv',
-        filename=f"results_{job_id}.csv"
+        download_path,
+        media_type=MEDIA_TYPES[requested_format],
+        filename=f"results_{job_id}{FORMAT_EXTENSIONS[requested_format]}"
     )
 
 @app.get("/api/stats")
@@ -824,37 +2274,82 @@ async def get_stats():
     """Get system statistics"""
     api_stats = api_distributor.get_stats()
     
-    parsing_jobs = [j for j in job_status.values() if "total_files" in j]
+    job_store.expire()
+    job_counts = job_store.count_by_status()
     
     return {
         "api_keys_available": len(API_KEYS),
         "api_usage_stats": api_stats,
+        "api_key_scheduler": api_distributor.get_key_stats(),
+        "analysis_cache": analysis_cache.get_stats(),
+        "candidate_pool": candidate_pool.get_stats(),
+        "job_vector_cache": job_vector_cache.get_stats(),
+        "skill_index": skill_index.get_stats(),
+        "extraction": {
+            **(EXTRACTION_POOL.get_stats() if EXTRACTION_POOL is not None else {"timeouts": 0, "crashes": 0}),
+            "pdf_backend": PDF_BACKEND,
+            "max_pages": EXTRACTION_MAX_PAGES,
+            "max_chars": EXTRACTION_MAX_CHARS,
+            "timeout_seconds": EXTRACTION_TIMEOUT_SECONDS
+        },
+        "prompt_compaction": {
+            **{field: prompt_stats[field] for field in ("original_tokens", "prompt_tokens", "truncated_texts")},
+            "saved_tokens": prompt_stats["original_tokens"] - prompt_stats["prompt_tokens"],
+            "token_budget": PROMPT_TOKEN_BUDGET,
+            "local_contact_extraction": LOCAL_CONTACT_EXTRACTION
+        },
+        "structured_output": {
+            "repaired_responses": parse_stats["repaired_responses"],
+            "unparseable_responses": parse_stats["unparseable_responses"],
+            "reasks": parse_stats["reasks"],
+            "fields_left_invalid": parse_stats["fields_left_invalid"]
+        },
+        "batching": {
+            "batch_size": BATCH_SIZE,
+            "token_budget": BATCH_TOKEN_BUDGET,
+            "requests": batch_stats["requests"],
+            "batched_requests": batch_stats["batched_requests"],
+            "llm_resumes": batch_stats["llm_resumes"],
+            "fallback_resumes": batch_stats["fallback_resumes"],
+            "calls_per_resume": round(batch_stats["requests"] / batch_stats["llm_resumes"], 3) if batch_stats["llm_resumes"] else 0.0
+        },
         "jobs": {
-            "active": len([j for j in job_status.values() if j["status"] == "processing"]),
-            "completed": len([j for j in job_status.values() if j["status"] == "completed"]),
-            "failed": len([j for j in job_status.values() if j["status"] == "failed"]),
-            "total": len(job_status)
+            "active": job_counts.get("processing", 0),
+            "completed": job_counts.get("completed", 0),
+            "failed": job_counts.get("failed", 0),
+            "total": sum(job_counts.values())
         },
         "model_loaded": DOC2VEC_MODEL is not None
     }
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics: hot-path timing histograms plus queue-depth and in-flight gauges"""
+    for stage in ("extraction", "llm"):
+        PIPELINE_QUEUE_DEPTH.set(sum(stats.queues[stage].qsize() for stats in active_pipelines), stage=stage)
+    for client in api_distributor.clients:
+        GEMINI_IN_FLIGHT.set(client.in_flight, key=client.label)
+    job_store.expire()
+    job_counts = job_store.count_by_status()
+    for status in ("pending", "processing", "completed", "failed"):
+        JOBS.set(job_counts.get(status, 0), status=status)
+    return Response(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.delete("/api/cleanup/{job_id}")
 async def cleanup_job_files(job_id: str):
     """Clean up job-related files"""
-    if job_id not in job_status:
+    job_info = job_store.get(job_id)
+    if job_info is None:
         raise HTTPException(status_code=404, detail="Job not found")
+    if job_is_running(job_info):
+        raise HTTPException(status_code=409, detail="Job is still running")
     
     try:
-        job_info = job_status[job_id]
-        files_deleted = []
-        
-        # Delete result CSV if exists
-        if job_info.get("result_csv_path") and os.path.exists(job_info["result_csv_path"]):
-            os.remove(job_info["result_csv_path"])
-            files_deleted.append(job_info["result_csv_path"])
+        # Delete result files if they exist
+        files_deleted = delete_result_files(job_info)
         
-        # Delete from job status
-        del job_status[job_id]
+        # Delete from job store
+        job_store.delete(job_id)
         
         return {
             "message": f"Cleaned up job {job_id}",
@@ -866,9 +2361,16 @@ async def cleanup_job_files(job_id: str):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/health")
-async def health_check():
+async def health_check(ready: bool = False):
+    """Liveness plus readiness of the matching model (pass ready=true to get a 503 until it is loaded)"""
+    if ready and model_status["state"] != "ready":
+        raise HTTPException(status_code=503, detail=f"Matching model is {model_status['state']}")
     return {
         "status": "healthy",
+        "ready": model_status["state"] == "ready",
+        "model": {**model_status, "mmap": DOC2VEC_MMAP},
+        "memory": process_memory_mb(),
+        "pid": os.getpid(),
         "api_keys_available": len(API_KEYS),
         "workers": MAX_WORKERS,
         "batch_size": BATCH_SIZE,
@@ -0,0 +1,287 @@
+"""
+Reading and writing parsing/matching results as CSV or Parquet.
+
+Result rows keep real Python structures (lists of skills, lists of education
+and work-experience records). CSV output flattens them the way it always has
+(comma-joined skills, JSON-encoded nested records); Parquet stores them as
+native list/struct columns, supports reading only the columns a caller needs,
+and is written in row groups so a handful of rows can be read without
+decoding the whole file. For a CSV, the byte offset of every record is
+indexed on first access, so reading a few rows seeks to just those records;
+that index and the row orders of sorted pages are cached per file version.
+
+Parquet support needs pyarrow; without it only CSV is available.
+"""
+import csv
+import io
+import json
+import os
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional
+    pa = None
+    pq = None
+
+PARQUET_ROW_GROUP_SIZE = 10000
+ROW_INDEX_CACHE_ENTRIES = 32  # Record offsets and sort orders kept, across result files
+FORMAT_EXTENSIONS = {"csv": ".csv", "parquet": ".parquet"}
+MEDIA_TYPES = {"csv": "text/csv", "parquet": "application/vnd.apache.parquet"}
+
+LIST_COLUMNS = ("other_contacts", "key_skills", "technical_skills", "soft_skills")
+EDUCATION_FIELDS = ("degree", "institution", "year")
+WORK_EXPERIENCE_FIELDS = ("title", "company", "duration")
+NESTED_COLUMNS = ("education", "work_experience")
+
+if pa is not None:
+    NESTED_TYPES = {
+        "education": pa.list_(pa.struct([(field, pa.string()) for field in EDUCATION_FIELDS])),
+        "work_experience": pa.list_(pa.struct(
+            [(field, pa.string()) for field in WORK_EXPERIENCE_FIELDS]
+            + [("responsibilities", pa.list_(pa.string()))]
+        )),
+    }
+
+def available_formats():
+    return [fmt for fmt in FORMAT_EXTENSIONS if fmt == "csv" or pq is not None]
+
+def result_format(path):
+    """Format of a result file, from its extension"""
+    return "parquet" if Path(path).suffix.lower() == ".parquet" else "csv"
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and pd.isna(value))
+
+def _plain(value):
+    """Convert numpy arrays read back from Parquet (possibly nested in records) to lists"""
+    if isinstance(value, np.ndarray):
+        return [_plain(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    return value
+
+def _as_list(value):
+    """Coerce a column value (list, array, flattened string or empty) to a list"""
+    if _is_missing(value):
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if not value:
+            return []
+        if value.startswith("["):
+            try:
+                return list(json.loads(value))
+            except ValueError:
+                pass
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return [_plain(item) for item in value]
+
+def _as_string(value):
+    return "" if value is None else str(value)
+
+def _normalize_records(value, fields, list_field=None):
+    """Coerce LLM-provided records to the fixed struct shape Parquet needs"""
+    records = []
+    for item in _as_list(value):
+        if not isinstance(item, dict):
+            item = {fields[0]: item}
+        record = {field: _as_string(item.get(field)) for field in fields}
+        if list_field:
+            record[list_field] = [_as_string(entry) for entry in _as_list(item.get(list_field))]
+        records.append(record)
+    return records
+
+def flatten_for_csv(df):
+    """Legacy CSV layout: comma-joined lists and JSON-encoded nested records"""
+    df = df.copy()
+    for column in LIST_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(lambda value: ", ".join(map(str, _as_list(value))))
+    for column in NESTED_COLUMNS:
+        if column in df.columns:
+            # Failed rows have no records at all (empty cell); successful rows always get a JSON list
+            df[column] = df[column].map(lambda value: "" if _is_missing(value) else json.dumps(_as_list(value)))
+    return df
+
+def to_arrow_table(df):
+    """Arrow table with native list/struct columns for the resume fields"""
+    df = df.copy()
+    for column in LIST_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(lambda value: [_as_string(item) for item in _as_list(value)])
+    if "education" in df.columns:
+        df["education"] = df["education"].map(lambda value: _normalize_records(value, EDUCATION_FIELDS))
+    if "work_experience" in df.columns:
+        df["work_experience"] = df["work_experience"].map(
+            lambda value: _normalize_records(value, WORK_EXPERIENCE_FIELDS, "responsibilities")
+        )
+
+    typed = {column: pa.list_(pa.string()) for column in LIST_COLUMNS if column in df.columns}
+    typed.update({column: NESTED_TYPES[column] for column in NESTED_COLUMNS if column in df.columns})
+    inferred = pa.Schema.from_pandas(df.drop(columns=list(typed)), preserve_index=False)
+    fields = [
+        pa.field(column, typed[column]) if column in typed else inferred.field(column)
+        for column in df.columns
+    ]
+    return pa.Table.from_pandas(df, schema=pa.schema(fields), preserve_index=False)
+
+def write_results(df, path):
+    """Write a result frame in the format implied by the path's extension"""
+    if result_format(path) == "parquet":
+        if pq is None:
+            raise RuntimeError("Parquet output requires pyarrow")
+        pq.write_table(to_arrow_table(df), path, row_group_size=PARQUET_ROW_GROUP_SIZE)
+    else:
+        flatten_for_csv(df).to_csv(path, index=False)
+
+def read_results(path, columns=None):
+    """Read a result file, loading only ``columns`` when given"""
+    if result_format(path) == "parquet":
+        return pd.read_parquet(path, columns=columns)
+    if columns is not None:
+        return pd.read_csv(path, usecols=lambda column: column in columns)
+    return pd.read_csv(path)
+
+_row_index_cache = {}  # (path, kind) -> (file version, value), oldest first
+_row_index_lock = threading.Lock()
+
+def _cached(path, kind, compute):
+    """Value derived from a result file, recomputed only when the file changes"""
+    key = (os.path.abspath(path), kind)
+    stat = os.stat(path)
+    version = (stat.st_size, stat.st_mtime_ns)
+    with _row_index_lock:
+        entry = _row_index_cache.get(key)
+    if entry is not None and entry[0] == version:
+        return entry[1]
+    value = compute()
+    with _row_index_lock:
+        _row_index_cache.pop(key, None)
+        _row_index_cache[key] = (version, value)
+        while len(_row_index_cache) > ROW_INDEX_CACHE_ENTRIES:
+            _row_index_cache.pop(next(iter(_row_index_cache)))
+    return value
+
+def _csv_record_offsets(path):
+    """Byte offsets where the header ends and each record ends, so record i spans offsets[i]:offsets[i + 1]"""
+    position = 0
+
+    def lines():
+        nonlocal position
+        with open(path, "rb") as f:
+            for line in f:
+                position += len(line)
+                yield line.decode("utf-8")
+
+    # The reader pulls one line at a time and stops at a record's end, so position is where that record ends
+    offsets = [position for record in csv.reader(lines()) if record]
+    return np.asarray(offsets, dtype=np.int64)
+
+def _read_csv_rows(path, rows):
+    """The given rows (sorted, in range) of a CSV, read by seeking to their records"""
+    offsets = _cached(path, "offsets", lambda: _csv_record_offsets(path))
+    with open(path, "rb") as f:
+        chunks = [f.read(int(offsets[0]))]
+        for row in rows:
+            f.seek(int(offsets[row]))
+            chunk = f.read(int(offsets[row + 1] - offsets[row]))
+            chunks.append(chunk if chunk.endswith(b"\n") else chunk + b"\n")
+    df = pd.read_csv(io.BytesIO(b"".join(chunks)))
+    df.index = rows
+    return df
+
+def read_result_rows(path, row_indices):
+    """Read only the given rows (in the given order) of a result file; indices past its end are dropped"""
+    total = result_row_count(path)
+    row_indices = [row for row in row_indices if 0 <= row < total]
+    wanted = set(row_indices)
+    if result_format(path) == "parquet":
+        parquet_file = pq.ParquetFile(path)
+        groups, offsets, start = [], [], 0
+        for group in range(parquet_file.num_row_groups):
+            size = parquet_file.metadata.row_group(group).num_rows
+            if any(start <= row < start + size for row in wanted):
+                groups.append(group)
+                offsets.append(start)
+            start += size
+        if not groups:
+            return pd.DataFrame()
+        frames = []
+        for group, offset in zip(groups, offsets):
+            frame = parquet_file.read_row_group(group).to_pandas()
+            frame.index = range(offset, offset + len(frame))
+            frames.append(frame)
+        df = pd.concat(frames)
+    else:
+        df = _read_csv_rows(path, sorted(wanted))
+    return df.loc[row_indices]
+
+def fill_missing(df, value=0.0):
+    """Replace NaN/inf in the scalar columns; list and record columns keep their empty values"""
+    df = df.copy()
+    structured = set(LIST_COLUMNS + NESTED_COLUMNS)
+    scalar = [column for column in df.columns if column not in structured]
+    df[scalar] = df[scalar].replace([np.inf, -np.inf], np.nan).fillna(value)
+    return df
+
+def _structured_records(df):
+    for column in LIST_COLUMNS + NESTED_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].map(_as_list)
+    return records_from_frame(df)
+
+def read_result_records(path):
+    """Result rows as dicts with real lists and records, whichever format the file is in"""
+    return _structured_records(read_results(path))
+
+def result_columns(path):
+    """Column names of a result file, without reading its rows"""
+    if result_format(path) == "parquet":
+        return pq.read_schema(path).names
+    return list(pd.read_csv(path, nrows=0).columns)
+
+def result_row_count(path):
+    if result_format(path) == "parquet":
+        return pq.ParquetFile(path).metadata.num_rows
+    return len(_cached(path, "offsets", lambda: _csv_record_offsets(path))) - 1
+
+def _sorted_order(path, sort_by, descending):
+    values = read_results(path, columns=[sort_by])[sort_by].reset_index(drop=True)
+    return values.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+
+def read_result_page(path, offset, limit, sort_by=None, descending=False):
+    """One page of a result file as records (in file order, or sorted by a column); returns (total rows, records).
+
+    The row order of a sort is computed from the sort column once per file
+    version and cached, so a page only costs reading its own rows. Ties keep
+    their file order and missing values sort last.
+    """
+    if sort_by is None:
+        total = result_row_count(path)
+        page = list(range(min(offset, total), min(offset + limit, total)))
+    else:
+        order = _cached(path, ("order", sort_by, descending), lambda: _sorted_order(path, sort_by, descending))
+        total = len(order)
+        page = order[offset:offset + limit].tolist()
+    if not page:
+        return total, []
+    return total, _structured_records(read_result_rows(path, page))
+
+def records_from_frame(df):
+    """JSON-safe row dicts (numpy arrays from Parquet become plain lists)"""
+    return json.loads(df.to_json(orient="records"))
+
+def convert_results(source_path, target_path):
+    """Convert a result file between CSV and Parquet"""
+    df = read_results(source_path)
+    if result_format(source_path) == "csv":
+        for column in NESTED_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].map(_as_list)
+    write_results(df, target_path)
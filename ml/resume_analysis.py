@@ -0,0 +1,186 @@
+"""
+Schema, repair and validation of Gemini resume analyses.
+
+Requests use Gemini's JSON response mode with ``response_schema``, so most
+responses are valid as-is. What still goes wrong is cheap to fix locally:
+code fences, trailing commas, Python literals, or output cut off mid-object.
+``load_json`` repairs those before giving up. ``validate_analysis`` then checks
+the result field by field, so one bad field is reported (and can be re-asked
+for) instead of failing the whole resume. When the output was cut off, the
+fields that never arrived and the last one that did are reported too.
+"""
+import json
+import re
+from typing import List
+
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+
+STRING = {"type": "string"}
+STRING_LIST = {"type": "array", "items": STRING}
+
+FIELD_SCHEMAS = {
+    "summary": STRING,
+    "email": STRING,
+    "phone": STRING,
+    "linkedin": STRING,
+    "other_contacts": STRING_LIST,
+    "education": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {"degree": STRING, "institution": STRING, "year": STRING},
+        },
+    },
+    "work_experience": {
+        "type": "array",
+        "items": {
+            "type": "object",
+            "properties": {
+                "title": STRING, "company": STRING, "duration": STRING, "responsibilities": STRING_LIST,
+            },
+        },
+    },
+    "technical_skills": STRING_LIST,
+    "soft_skills": STRING_LIST,
+    "key_skills": STRING_LIST,
+    "experience_years": STRING,
+}
+ANALYSIS_FIELDS = tuple(FIELD_SCHEMAS)
+REQUIRED_FIELDS = ("summary",)  # Matching is impossible without it, so an empty one counts as invalid
+
+def _split_list(value):
+    """Accept a comma-separated string or null where a list of strings is expected"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(",") if item.strip()]
+    return value
+
+def _empty_string(value):
+    return "" if value is None else value
+
+class AnalysisModel(BaseModel):
+    model_config = ConfigDict(coerce_numbers_to_str=True, extra="ignore")
+
+class Education(AnalysisModel):
+    degree: str = ""
+    institution: str = ""
+    year: str = ""
+
+    _strings = field_validator("degree", "institution", "year", mode="before")(_empty_string)
+
+class WorkExperience(AnalysisModel):
+    title: str = ""
+    company: str = ""
+    duration: str = ""
+    responsibilities: List[str] = []
+
+    _strings = field_validator("title", "company", "duration", mode="before")(_empty_string)
+    _lists = field_validator("responsibilities", mode="before")(_split_list)
+
+class ResumeAnalysis(AnalysisModel):
+    summary: str = ""
+    email: str = ""
+    phone: str = ""
+    linkedin: str = ""
+    other_contacts: List[str] = []
+    education: List[Education] = []
+    work_experience: List[WorkExperience] = []
+    technical_skills: List[str] = []
+    soft_skills: List[str] = []
+    key_skills: List[str] = []
+    experience_years: str = ""
+
+    _strings = field_validator("summary", "email", "phone", "linkedin", "experience_years", mode="before")(_empty_string)
+    _lists = field_validator(
+        "other_contacts", "technical_skills", "soft_skills", "key_skills", "education", "work_experience",
+        mode="before"
+    )(_split_list)
+
+def response_schema(fields=ANALYSIS_FIELDS, batched=False):
+    """Gemini response schema for the given analysis fields (an array keyed by filename when batched)"""
+    properties = {field: FIELD_SCHEMAS[field] for field in fields}
+    if batched:
+        properties = {"filename": STRING, **properties}
+    schema = {"type": "object", "properties": properties, "required": list(properties)}
+    return {"type": "array", "items": schema} if batched else schema
+
+def _strip_fences(text):
+    text = text.strip()
+    fenced = re.match(r"^```[a-zA-Z]*\s*(.*?)\s*```$", text, re.DOTALL)
+    return fenced.group(1) if fenced else text
+
+def _close_truncated(text):
+    """Close strings and brackets left open by output that was cut off"""
+    stack, in_string, escaped = [], False, False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in "{[":
+            stack.append("}" if char == "{" else "]")
+        elif char in "}]" and stack:
+            stack.pop()
+    if not stack and not in_string:
+        return text
+    if in_string:
+        text += '"'
+    text = re.sub(r"[\s,:]+$", "", text)
+    if stack and stack[-1] == "}":
+        # Drop a key whose value never arrived
+        text = re.sub(r'([{,])\s*"[^"]*"$', r"\1", text).rstrip(",")
+    return text + "".join(reversed(stack))
+
+def _repair(text):
+    """Repaired text and whether it had to be closed because it was cut off"""
+    text = text.replace("“", '"').replace("”", '"').replace("’", "'")
+    literals = {"True": "true", "False": "false", "None": "null"}
+    text = re.sub(r"([:\[,]\s*)(True|False|None)\b", lambda m: m.group(1) + literals[m.group(2)], text)
+    closed = _close_truncated(text)
+    return re.sub(r",\s*([}\]])", r"\1", closed), closed != text
+
+def load_json(text, opening="{"):
+    """Parse the JSON value starting at the first ``opening`` bracket; returns (value, repaired, truncated).
+
+    Raises ValueError when the text cannot be repaired into JSON.
+    """
+    text = _strip_fences(text)
+    start = text.find(opening)
+    if start == -1:
+        raise ValueError("No JSON found in response")
+    text = text[start:]
+
+    decoder = json.JSONDecoder()
+    try:
+        return decoder.raw_decode(text)[0], False, False
+    except ValueError:
+        pass
+    repaired, truncated = _repair(text)
+    try:
+        return decoder.raw_decode(repaired)[0], True, truncated
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON in response: {e}")
+
+def validate_analysis(data, fields=ANALYSIS_FIELDS, truncated=False):
+    """Validated analysis dict plus the fields that were invalid (and were reset to their defaults)"""
+    if not isinstance(data, dict):
+        return ResumeAnalysis().model_dump(), list(fields)
+    invalid = set()
+    try:
+        analysis = ResumeAnalysis.model_validate(data)
+    except ValidationError as e:
+        invalid = {error["loc"][0] for error in e.errors()}
+        analysis = ResumeAnalysis.model_validate({key: value for key, value in data.items() if key not in invalid})
+    if truncated:
+        # The last field that arrived may be cut short, and the rest never arrived
+        present = [field for field in data if field in fields]
+        invalid.update(present[-1:])
+        invalid.update(field for field in fields if field not in data)
+    invalid.update(field for field in REQUIRED_FIELDS if field in fields and not getattr(analysis, field).strip())
+    return analysis.model_dump(), [field for field in fields if field in invalid]
@@ -0,0 +1,120 @@
+"""
+Local preprocessing of extracted resume text before it is sent to Gemini.
+
+Prompt size drives both latency and quota use, and extracted text carries a
+lot the model does not need to see:
+
+- contact details (email, phone, LinkedIn, other profile links) are found
+  with regular expressions, so the model is no longer asked for them;
+- runs of spaces and blank lines are collapsed, and the header/footer lines
+  PDF extraction repeats at the top or bottom of every page (the candidate's
+  name, "Page 2 of 3", ...) are kept once;
+- what is left is cut to a token budget at a line boundary.
+
+Pages are separated by form feeds in the extracted text; text without them
+(DOCX, TXT) only gets whitespace collapsed and truncated. Everything here is
+plain string work, cheap enough to run in the extraction processes.
+"""
+import math
+import re
+from collections import Counter
+
+CONTACT_FIELDS = ("email", "phone", "linkedin", "other_contacts")
+CHARS_PER_TOKEN = 4
+PAGE_SEPARATOR = "\f"
+EDGE_LINES = 2  # Lines at the top and bottom of a page that may be a header or footer
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+LINKEDIN_PATTERN = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/(?:in|pub)/[A-Za-z0-9_%-]+/?", re.IGNORECASE)
+URL_PATTERN = re.compile(
+    r"(?:https?://|www\.)[^\s<>()\"',;]+|\b(?:github|gitlab|bitbucket)\.(?:com|org|io)/[^\s<>()\"',;]+",
+    re.IGNORECASE
+)
+PHONE_PATTERN = re.compile(r"(?<![\w+])\+?\(?\d[\d ().-]{5,}\d(?![\w@])")
+# Digit runs that look like phone numbers but are dates or year ranges
+NOT_PHONE_PATTERN = re.compile(r"(?:19|20)\d{2}\s*[-.]\s*(?:19|20)\d{2}|\d{1,2}[./-]\d{1,2}[./-]\d{2,4}|\d{4}[./-]\d{1,2}[./-]\d{1,2}")
+
+def estimate_tokens(text):
+    """Rough token count (about 4 characters per token)"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def find_phone(text):
+    for match in PHONE_PATTERN.finditer(text):
+        candidate = match.group().strip(" .-")
+        digits = sum(char.isdigit() for char in candidate)
+        if 7 <= digits <= 15 and not NOT_PHONE_PATTERN.fullmatch(candidate):
+            return candidate
+    return ""
+
+def find_contacts(text):
+    """Email, phone, LinkedIn URL and other profile/website links found in a resume"""
+    email = EMAIL_PATTERN.search(text)
+    linkedin = LINKEDIN_PATTERN.search(text)
+    other_contacts = []
+    for match in URL_PATTERN.finditer(text):
+        url = match.group().rstrip(".:")
+        if "linkedin.com" in url.lower() or "@" in url or url in other_contacts:
+            continue
+        other_contacts.append(url)
+    return {
+        "email": email.group() if email else "",
+        "phone": find_phone(text),
+        "linkedin": linkedin.group().rstrip("/") if linkedin else "",
+        "other_contacts": other_contacts,
+    }
+
+def _edge_key(line):
+    """Header/footer identity of a line: page numbers differ from page to page, the rest does not"""
+    return re.sub(r"\d+", "#", line.lower())
+
+def compact_text(text):
+    """Text with whitespace collapsed and repeated page headers/footers dropped"""
+    pages = [
+        [" ".join(line.split()) for line in page.splitlines()]
+        for page in text.split(PAGE_SEPARATOR)
+    ]
+    pages = [[line for line in page if line] or [""] for page in pages]
+
+    repeated = set()
+    if len(pages) > 1:
+        edges = Counter()
+        for page in pages:
+            edges.update({_edge_key(line) for line in page[:EDGE_LINES] + page[-EDGE_LINES:] if line})
+        # Something at the edge of at least half the pages (and of two or more) is a header or footer
+        needed = max(2, math.ceil(len(pages) / 2))
+        repeated = {key for key, count in edges.items() if count >= needed}
+
+    # The first occurrence stays (a header is often the candidate's name), the repeats go
+    lines, seen = [], set()
+    for page in pages:
+        edge = set(range(min(EDGE_LINES, len(page)))) | set(range(max(len(page) - EDGE_LINES, 0), len(page)))
+        for position, line in enumerate(page):
+            key = _edge_key(line)
+            if not line or (position in edge and key in repeated and key in seen):
+                continue
+            if position in edge:
+                seen.add(key)
+            lines.append(line)
+    return "\n".join(lines)
+
+def truncate_to_budget(text, max_tokens):
+    """Text cut to about max_tokens (at a line break where possible); returns (text, truncated)"""
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text, False
+    limit = max_tokens * CHARS_PER_TOKEN
+    cut = text.rfind("\n", 0, limit)
+    if cut < limit // 2:
+        cut = limit
+    return text[:cut].rstrip(), True
+
+def prepare_resume_text(text, max_tokens, extract_contacts=True):
+    """Prompt text of a resume plus its contacts (None when not extracted locally) and token counts"""
+    contacts = find_contacts(text) if extract_contacts else None
+    prompt_text, truncated = truncate_to_budget(compact_text(text), max_tokens)
+    return {
+        "text": prompt_text,
+        "contacts": contacts,
+        "original_tokens": estimate_tokens(text),
+        "prompt_tokens": estimate_tokens(prompt_text),
+        "truncated": truncated,
+    }
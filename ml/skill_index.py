@@ -0,0 +1,138 @@
+"""
+Inverted index over candidates' skills for lexical (BM25) matching.
+
+Semantic matching runs on ``clean_text`` output, which drops digits and
+symbols, so "C++", "C#", "Node.js" or ".NET" all but vanish. This index
+tokenizes the ``key_skills`` and ``technical_skills`` lists with those
+characters kept and maps every term to the candidates that list it, so:
+
+- a job description can be scored lexically with BM25 over the skill terms
+  it shares with each candidate (normalized to 0-100 and blended with the
+  semantic score), and
+- candidates lacking any required skill can be dropped with a few set
+  intersections, before any Doc2Vec work happens.
+
+The pool's index is kept in memory and synced incrementally from the
+candidate pool as parsing jobs add candidates; a result file gets a
+throwaway index built from its skill columns.
+"""
+import math
+import re
+import threading
+from collections import Counter, defaultdict
+
+import numpy as np
+
+SKILL_FIELDS = ("key_skills", "technical_skills")
+# Letters/digits with the symbols that are part of skill names: c++, c#, node.js, .net, asp.net, 5
+TOKEN_PATTERN = re.compile(r"\.?[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+STOPWORDS = frozenset({"a", "an", "and", "as", "at", "by", "for", "in", "of", "on", "or", "the", "to", "with"})
+
+def tokenize(text):
+    """Lowercase skill terms of a text, symbols that belong to skill names kept"""
+    return [token for token in TOKEN_PATTERN.findall(str(text).lower()) if token not in STOPWORDS]
+
+def candidate_skills(row):
+    """Skill strings of a result row (list fields, or the comma-joined strings of a CSV)"""
+    skills = []
+    for field in SKILL_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str):
+            skills.extend(item for item in value.split(",") if item.strip())
+        elif value is not None and not (isinstance(value, float) and value != value):
+            skills.extend(str(item) for item in value)
+    return skills
+
+class SkillIndex:
+    def __init__(self, k1=1.2, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.postings = defaultdict(dict)  # term -> {doc_id: term frequency}
+        self.doc_terms = {}
+        self.doc_lengths = {}
+        self.total_length = 0
+        self.synced_revision = 0
+
+    def __len__(self):
+        return len(self.doc_terms)
+
+    def add(self, doc_id, skills):
+        """Index (or re-index) a candidate's skills"""
+        with self.lock:
+            self._add(doc_id, skills)
+
+    def _add(self, doc_id, skills):
+        self._remove(doc_id)
+        terms = Counter(term for skill in skills for term in tokenize(skill))
+        for term, count in terms.items():
+            self.postings[term][doc_id] = count
+        self.doc_terms[doc_id] = terms
+        self.doc_lengths[doc_id] = sum(terms.values())
+        self.total_length += self.doc_lengths[doc_id]
+
+    def _remove(self, doc_id):
+        terms = self.doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            del self.postings[term][doc_id]
+            if not self.postings[term]:
+                del self.postings[term]
+        self.total_length -= self.doc_lengths.pop(doc_id)
+
+    def sync(self, pool):
+        """Re-index candidates added or updated in a CandidatePool since the last sync"""
+        with self.lock:
+            for candidate_id, skills, revision in pool.skills_since(self.synced_revision):
+                self._add(candidate_id, skills)
+                self.synced_revision = max(self.synced_revision, revision)
+
+    def matching(self, required_skills, doc_ids=None):
+        """Ids of the candidates whose skills contain every term of every required skill"""
+        terms = {term for skill in required_skills for term in tokenize(skill)}
+        with self.lock:
+            # Start from the rarest term so the candidate set is small from the outset
+            terms = sorted(terms, key=lambda term: len(self.postings.get(term, ())))
+            matched = set(self.postings.get(terms[0], ())) if terms else set(self.doc_terms)
+            for term in terms[1:]:
+                if not matched:
+                    break
+                matched &= self.postings.get(term, {}).keys()
+        return matched if doc_ids is None else matched.intersection(doc_ids)
+
+    def scores(self, text, doc_ids):
+        """BM25 scores (0-100) of the given candidates against a text, aligned with doc_ids.
+
+        Only terms that appear in some candidate's skills count. The score is
+        normalized by what a candidate listing each of those terms once (at
+        average length) would get, so 100 means every known skill is covered.
+        """
+        doc_ids = list(doc_ids)
+        scores = np.zeros(len(doc_ids), dtype=np.float64)
+        with self.lock:
+            count = len(self.doc_terms)
+            terms = [term for term in dict.fromkeys(tokenize(text)) if term in self.postings]
+            if not count or not terms or not doc_ids:
+                return scores
+            positions = {doc_id: position for position, doc_id in enumerate(doc_ids)}
+            average_length = self.total_length / count
+            ideal = 0.0
+            for term in terms:
+                postings = self.postings[term]
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                ideal += idf
+                for doc_id, frequency in postings.items():
+                    position = positions.get(doc_id)
+                    if position is None:
+                        continue
+                    saturation = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / average_length)
+                    scores[position] += idf * frequency * (self.k1 + 1) / (frequency + saturation)
+        return np.round(100 * np.minimum(scores / ideal, 1.0), 2)
+
+    def get_stats(self):
+        with self.lock:
+            return {"candidates": len(self.doc_terms), "terms": len(self.postings)}
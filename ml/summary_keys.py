@@ -0,0 +1,70 @@
+"""
+Embedding keys of the candidates in a match source.
+
+The ANN index is shared by every match source and keyed by the content hash of
+a cleaned summary, so top-K retrieval has to map each hit back to the
+candidates behind it. Rebuilding that mapping per query (reading, cleaning and
+hashing every summary of the source) costs far more than the search itself,
+so it is kept in memory instead: synced incrementally from the keys the
+candidate pool stores, or built once per result file.
+"""
+import threading
+from collections import defaultdict
+
+class SummaryKeys:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.key_by_row = {}
+        self.rows_by_key = defaultdict(set)
+        self.synced_revision = 0
+        self.embedded_fingerprint = None  # Embedding generation every key was last checked against
+
+    def __len__(self):
+        return len(self.key_by_row)
+
+    def set(self, row, key):
+        """Map a row to its key (None drops the row: it has no summary)"""
+        with self.lock:
+            self._set(row, key)
+
+    def _set(self, row, key):
+        old_key = self.key_by_row.pop(row, None)
+        if old_key is not None:
+            self.rows_by_key[old_key].discard(row)
+            if not self.rows_by_key[old_key]:
+                del self.rows_by_key[old_key]
+        if key is not None:
+            self.key_by_row[row] = key
+            self.rows_by_key[key].add(row)
+
+    def sync(self, pool):
+        """Pick up candidates added or updated in a CandidatePool since the last sync; returns their keys"""
+        with self.lock:
+            keys = []
+            for candidate_id, key, revision in pool.embedding_keys_since(self.synced_revision):
+                self._set(candidate_id, key)
+                if key is not None:
+                    keys.append(key)
+                self.synced_revision = max(self.synced_revision, revision)
+            return keys
+
+    def rows(self, key, allowed_rows=None):
+        """Rows with the given key, in row order, optionally only those in allowed_rows"""
+        with self.lock:
+            rows = self.rows_by_key.get(key, set())
+            return sorted(rows if allowed_rows is None else rows.intersection(allowed_rows))
+
+    def keys(self, rows=None):
+        """Distinct keys of the given rows, or of every row"""
+        with self.lock:
+            if rows is None:
+                return list(self.rows_by_key)
+            return list({self.key_by_row[row] for row in rows if row in self.key_by_row})
+
+    def labels(self):
+        """Every row that has a key"""
+        with self.lock:
+            return set(self.key_by_row)
@@ -0,0 +1,23 @@
+"""
+The modules under test live in ml/ next to main.py. Run from the ml/ directory:
+    python -m pytest -q
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+@pytest.fixture(scope="session")
+def main(tmp_path_factory):
+    """The API module, imported from a scratch directory"""
+    # main opens its stores relative to the working directory when it is imported
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("ml"))
+    try:
+        import main
+    finally:
+        os.chdir(cwd)
+    return main
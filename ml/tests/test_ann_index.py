@@ -0,0 +1,100 @@
+"""
+IVF top-K retrieval against brute-force cosine scoring. Run from the ml/ directory:
+    python -m pytest -q tests/test_ann_index.py
+"""
+import random
+
+import numpy as np
+import pytest
+from gensim.models.doc2vec import Doc2Vec, TaggedDocument
+
+from ann_index import IVFIndex
+from embedding_store import EmbeddingStore
+from job_vectors import JobVectorCache
+
+SKILLS = [
+    "python", "java", "react", "node", "django", "sql", "docker", "kubernetes", "aws", "azure",
+    "pandas", "tensorflow", "spark", "kafka", "terraform", "linux", "golang", "rust", "swift", "kotlin",
+]
+FILLER = ["experienced", "engineer", "developer", "building", "scalable", "systems", "team", "projects", "using"]
+CANDIDATES = 1500  # Enough for the index to train its quantizer and probe cells
+K = 20
+
+def summaries(count, seed):
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = rng.sample(SKILLS, 5) + rng.choices(FILLER, k=10)
+        rng.shuffle(words)
+        texts.append(" ".join(words))
+    return texts
+
+@pytest.fixture(scope="module")
+def doc2vec(main, tmp_path_factory):
+    """A small model trained on synthetic summaries, with its own embedding store and job vector cache"""
+    root = tmp_path_factory.mktemp("doc2vec")
+    corpus = [TaggedDocument(text.split(), [i]) for i, text in enumerate(summaries(1000, seed=1))]
+    model_path = root / "model.d2v"
+    Doc2Vec(corpus, vector_size=32, min_count=1, epochs=10, workers=1, seed=1).save(str(model_path))
+    saved = (main.DOC2VEC_MODEL, main.embedding_store, main.job_vector_cache)
+    main.DOC2VEC_MODEL = Doc2Vec.load(str(model_path))
+    main.embedding_store = EmbeddingStore(root / "embeddings", str(model_path))
+    main.job_vector_cache = JobVectorCache(root / "job_vectors.sqlite3", 100)
+    yield
+    main.DOC2VEC_MODEL, main.embedding_store, main.job_vector_cache = saved
+
+@pytest.fixture(scope="module")
+def pool(main, doc2vec):
+    """Candidate summaries, their exact scores for a few jobs and an IVF index over their stored vectors"""
+    texts = summaries(CANDIDATES, seed=2)
+    jobs = summaries(5, seed=3)
+    exact = {job: main.score_summaries(texts, job, workers=1)[0] for job in jobs}
+    index = IVFIndex(nprobe=8)
+    index.sync(main.embedding_store)
+    keys = [main.content_hash(main.clean_text(text)) for text in texts]
+    return texts, keys, exact, index
+
+def top_scores(scores, k=K):
+    return sorted(scores, reverse=True)[:k]
+
+def hit_scores(hits):
+    return [round(100 * similarity, 2) for _, similarity in hits]
+
+def assert_same_scores(actual, expected):
+    # The index normalizes before its float32 dot products, score_summaries divides after: allow one rounding step
+    np.testing.assert_allclose(actual, expected, atol=0.01 + 1e-9)
+
+def test_index_is_trained(pool):
+    _, _, _, index = pool
+    assert len(index) == CANDIDATES
+    assert index.centroids is not None and len(index.centroids) > 8
+
+def test_probing_every_cell_matches_brute_force(main, pool):
+    _, _, exact, index = pool
+    for job, scores in exact.items():
+        job_vector = main.get_job_vector(job)
+        expected = top_scores(scores)
+        assert_same_scores(hit_scores(index.search(job_vector, k=K, nprobe=len(index.centroids))), expected)
+        assert_same_scores(hit_scores(index.exact_search(job_vector, k=K)), expected)
+
+def test_default_probe_recalls_the_brute_force_top_k(main, pool):
+    _, keys, exact, index = pool
+    recalls = []
+    for job, scores in exact.items():
+        hits = index.search(main.get_job_vector(job), k=K)
+        assert len(hits) == K
+        # Every hit carries its exact cosine score
+        score_by_key = dict(zip(keys, scores))
+        assert_same_scores(hit_scores(hits), [score_by_key[key] for key, _ in hits])
+        threshold = top_scores(scores)[-1] - 0.01
+        recalls.append(sum(score_by_key[key] >= threshold for key, _ in hits) / K)
+    assert np.mean(recalls) >= 0.9, recalls
+
+def test_filtered_search_matches_brute_force_over_the_allowed_keys(main, pool):
+    _, keys, exact, index = pool
+    allowed = set(range(0, CANDIDATES, 7))
+    allowed_keys = [keys[i] for i in allowed]
+    for job, scores in exact.items():
+        hits = index.search(main.get_job_vector(job), k=K, allowed_keys=allowed_keys, nprobe=len(index.centroids))
+        assert {key for key, _ in hits} <= set(allowed_keys)
+        assert_same_scores(hit_scores(hits), top_scores([scores[i] for i in allowed]))
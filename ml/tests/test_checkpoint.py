@@ -0,0 +1,100 @@
+"""
+Per-file result checkpoint and resuming a parsing job from it. Run from the ml/ directory:
+    python -m pytest -q tests/test_checkpoint.py
+"""
+import asyncio
+
+import pytest
+
+from checkpoint import ResultCheckpoint
+from job_store import MemoryJobStore
+
+def row(filename, status="success"):
+    return {"filename": filename, "summary": f"summary of {filename}", "status": status}
+
+def test_appended_rows_are_reloaded(tmp_path):
+    checkpoint = ResultCheckpoint(tmp_path / "checkpoint.jsonl")
+    assert checkpoint.load() == {}
+    checkpoint.append("/in/a.pdf", row("a.pdf"))
+    checkpoint.append("/in/b.pdf", row("b.pdf", "failed"))
+
+    # A new instance (a resumed job) sees everything written before
+    assert ResultCheckpoint(tmp_path / "checkpoint.jsonl").load() == {
+        "/in/a.pdf": row("a.pdf"), "/in/b.pdf": row("b.pdf", "failed"),
+    }
+
+def test_latest_row_wins_in_first_processed_order(tmp_path):
+    checkpoint = ResultCheckpoint(tmp_path / "checkpoint.jsonl")
+    checkpoint.append("/in/b.pdf", row("b.pdf", "failed"))
+    checkpoint.append("/in/a.pdf", row("a.pdf"))
+    checkpoint.append("/in/b.pdf", row("b.pdf"))
+    rows = checkpoint.load()
+    assert list(rows) == ["/in/b.pdf", "/in/a.pdf"]
+    assert rows["/in/b.pdf"]["status"] == "success"
+
+def test_torn_last_line_is_skipped_and_not_glued_to(tmp_path):
+    path = tmp_path / "checkpoint.jsonl"
+    checkpoint = ResultCheckpoint(path)
+    checkpoint.append("/in/a.pdf", row("a.pdf"))
+    # The process died mid-write
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"path": "/in/b.pdf", "row": {"filename": "b.p')
+    assert list(checkpoint.load()) == ["/in/a.pdf"]
+
+    checkpoint.append("/in/c.pdf", row("c.pdf"))
+    assert list(checkpoint.load()) == ["/in/a.pdf", "/in/c.pdf"]
+
+def test_delete(tmp_path):
+    checkpoint = ResultCheckpoint(tmp_path / "checkpoint.jsonl")
+    checkpoint.delete()
+    checkpoint.append("/in/a.pdf", row("a.pdf"))
+    checkpoint.delete()
+    assert checkpoint.load() == {}
+
+@pytest.fixture
+def parsing(main, tmp_path, monkeypatch):
+    """main with its results directory and job store in tmp_path, and a fake pipeline recording each pass"""
+    monkeypatch.setattr(main, "RESULTS_DIR", tmp_path)
+    monkeypatch.setattr(main, "job_store", MemoryJobStore(3600))
+    monkeypatch.setattr(main, "FAILED_FILE_RETRIES", 1)
+    main.job_store.create("job", total_files=4)
+    passes, failing = [], {"c.pdf"}
+
+    async def run_streaming_pipeline(files, job_id, use_cache):
+        passes.append(list(files))
+        checkpoint = ResultCheckpoint(main.checkpoint_path(job_id))
+        for name in files:
+            checkpoint.append(f"/in/{name}", row(name, "failed" if name in failing else "success"))
+        failing.clear()  # Fails once, then succeeds on the retry
+
+    monkeypatch.setattr(main, "run_streaming_pipeline", run_streaming_pipeline)
+    return main, passes
+
+def parse(main, files):
+    return asyncio.run(main.parse_pending_files("job", files, lambda name: f"/in/{name}", lambda items: items))
+
+def test_resumed_job_skips_files_already_processed(parsing):
+    main, passes = parsing
+    # An earlier run got through a.pdf and failed b.pdf before it died
+    checkpoint = ResultCheckpoint(main.checkpoint_path("job"))
+    checkpoint.append("/in/a.pdf", row("a.pdf"))
+    checkpoint.append("/in/b.pdf", row("b.pdf", "failed"))
+
+    rows = parse(main, ["a.pdf", "b.pdf", "c.pdf", "d.pdf"])
+
+    # a.pdf is never sent again; b.pdf is retried; c.pdf fails once and gets the extra pass
+    assert passes == [["b.pdf", "c.pdf", "d.pdf"], ["c.pdf"]]
+    assert [(r["filename"], r["status"]) for r in rows] == [
+        ("a.pdf", "success"), ("b.pdf", "success"), ("c.pdf", "success"), ("d.pdf", "success"),
+    ]
+    # Progress of the last pass started from the files already done
+    assert main.job_store.get("job")["processed_files"] == 3
+
+def test_finished_checkpoint_needs_no_pass(parsing):
+    main, passes = parsing
+    checkpoint = ResultCheckpoint(main.checkpoint_path("job"))
+    for name in ("a.pdf", "b.pdf"):
+        checkpoint.append(f"/in/{name}", row(name))
+
+    assert [r["filename"] for r in parse(main, ["b.pdf", "a.pdf"])] == ["b.pdf", "a.pdf"]
+    assert passes == []
@@ -0,0 +1,58 @@
+"""
+Job store expiry across a resume. Run from the ml/ directory:
+    python -m pytest -q tests/test_job_store.py
+"""
+import pytest
+
+from job_store import JobStore, MemoryJobStore, SQLiteJobStore
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(ttl_seconds):
+        if request.param == "memory":
+            return MemoryJobStore(ttl_seconds)
+        return SQLiteJobStore(tmp_path / "jobs.sqlite3", ttl_seconds)
+    return make
+
+def job_files(tmp_path):
+    files = {"upload_path": tmp_path / "upload.zip", "checkpoint_path": tmp_path / "checkpoint.jsonl"}
+    for path in files.values():
+        path.write_text("data")
+    return {field: str(path) for field, path in files.items()}
+
+def test_resumed_job_does_not_expire_while_running(make_store, tmp_path):
+    # A zero TTL makes a finished job expire at once
+    store = make_store(ttl_seconds=0)
+    files = job_files(tmp_path)
+    store.create("job", **files)
+    store.update("job", status="failed", error_message="interrupted")
+
+    # Resumed before the expiry sweep ran: the job is running again
+    store.update("job", status="pending")
+    assert store.expire() == 0
+    store.update("job", status="processing")
+    assert store.expire() == 0
+    assert store.get("job")["status"] == "processing"
+    assert all(tmp_path.joinpath(name).exists() for name in ("upload.zip", "checkpoint.jsonl"))
+
+    # Once it finishes again it expires as usual, taking its files with it
+    store.update("job", status="completed")
+    assert store.expire() == 1
+    assert store.get("job") is None
+    assert not any(tmp_path.joinpath(name).exists() for name in ("upload.zip", "checkpoint.jsonl"))
+
+def test_progress_updates_keep_the_expiry(make_store, tmp_path):
+    store = make_store(ttl_seconds=0)
+    store.create("job", **job_files(tmp_path))
+    store.update("job", status="completed")
+    # Updates that do not change the status leave a finished job's expiry alone
+    store.update("job", processing_time=1.5)
+    assert store.expire() == 1
+
+def test_backends_must_implement_the_interface():
+    class PartialStore(JobStore):
+        def get(self, job_id):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialStore(ttl_seconds=0)
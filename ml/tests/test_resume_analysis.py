@@ -0,0 +1,118 @@
+"""
+Repair and validation of malformed Gemini analyses. Run from the ml/ directory:
+    python -m pytest -q tests/test_resume_analysis.py
+"""
+import pytest
+
+from resume_analysis import ANALYSIS_FIELDS, load_json, validate_analysis
+
+# (raw response, expected value, repaired, truncated)
+LOAD_CASES = {
+    "clean": (
+        '{"summary": "Backend engineer", "key_skills": ["python", "sql"]}',
+        {"summary": "Backend engineer", "key_skills": ["python", "sql"]}, False, False,
+    ),
+    "json code fence": (
+        '```json\n{"summary": "Data analyst", "experience_years": "4"}\n```',
+        {"summary": "Data analyst", "experience_years": "4"}, False, False,
+    ),
+    "bare code fence": (
+        '```\n{"summary": "Data analyst"}\n```',
+        {"summary": "Data analyst"}, False, False,
+    ),
+    "prose around the object": (
+        'Here is the extracted information:\n{"summary": "QA lead", "phone": "+44 20 7946 0958"}\nLet me know if you need more.',
+        {"summary": "QA lead", "phone": "+44 20 7946 0958"}, False, False,
+    ),
+    "trailing commas": (
+        '{"summary": "DevOps engineer", "key_skills": ["docker", "aws",], "soft_skills": [],}',
+        {"summary": "DevOps engineer", "key_skills": ["docker", "aws"], "soft_skills": []}, True, False,
+    ),
+    "python literals": (
+        "{\"summary\": \"Designer\", \"linkedin\": None, \"education\": [{\"degree\": \"BA\", \"year\": None}], \"open_to_work\": True}",
+        {"summary": "Designer", "linkedin": None, "education": [{"degree": "BA", "year": None}], "open_to_work": True},
+        True, False,
+    ),
+    "smart quotes": (
+        "{“summary”: “Product manager”, “email”: “pm@example.com”}",
+        {"summary": "Product manager", "email": "pm@example.com"}, True, False,
+    ),
+    "cut off inside a string": (
+        '{"summary": "Full-stack developer", "work_experience": [{"title": "Engineer", "responsibilities": ["Built the billing serv',
+        {"summary": "Full-stack developer",
+         "work_experience": [{"title": "Engineer", "responsibilities": ["Built the billing serv"]}]},
+        True, True,
+    ),
+    "cut off after a key": (
+        '{"summary": "Mobile developer", "key_skills": ["kotlin", "swift"], "experience_years":',
+        {"summary": "Mobile developer", "key_skills": ["kotlin", "swift"]}, True, True,
+    ),
+    "cut off after a comma": (
+        '```json\n{"summary": "SRE", "technical_skills": ["linux", "terraform",',
+        {"summary": "SRE", "technical_skills": ["linux", "terraform"]}, True, True,
+    ),
+}
+
+@pytest.mark.parametrize("raw, expected, repaired, truncated", LOAD_CASES.values(), ids=LOAD_CASES.keys())
+def test_load_json_repairs_malformed_output(raw, expected, repaired, truncated):
+    assert load_json(raw) == (expected, repaired, truncated)
+
+def test_load_json_repairs_a_cut_off_batch():
+    raw = '[{"filename": "a.pdf", "summary": "Analyst"}, {"filename": "b.pdf", "summary": "Engin'
+    value, repaired, truncated = load_json(raw, opening="[")
+    assert value == [{"filename": "a.pdf", "summary": "Analyst"}, {"filename": "b.pdf", "summary": "Engin"}]
+    assert repaired and truncated
+
+@pytest.mark.parametrize("raw", [
+    "I could not find a resume in the provided text.",
+    '{"summary": "Engineer" "key_skills": ["go"]}',
+], ids=["no json", "missing comma"])
+def test_load_json_rejects_unrepairable_output(raw):
+    with pytest.raises(ValueError):
+        load_json(raw)
+
+# (parsed value, truncated, expected fields of the analysis, expected invalid fields)
+VALIDATE_CASES = {
+    "complete": (
+        {"summary": "Backend engineer", "key_skills": ["python"], "experience_years": "6"}, False,
+        {"summary": "Backend engineer", "key_skills": ["python"], "experience_years": "6"}, [],
+    ),
+    "loose types are coerced": (
+        {"summary": "Analyst", "key_skills": "sql, excel, tableau", "soft_skills": None, "experience_years": 3,
+         "phone": None, "work_experience": [{"title": "Analyst", "responsibilities": "reporting, dashboards"}]},
+        False,
+        {"key_skills": ["sql", "excel", "tableau"], "soft_skills": [], "experience_years": "3", "phone": "",
+         "work_experience": [{"title": "Analyst", "company": "", "duration": "",
+                              "responsibilities": ["reporting", "dashboards"]}]},
+        [],
+    ),
+    "one bad field is reset": (
+        {"summary": "Teacher", "education": "BSc Mathematics", "key_skills": ["teaching"]}, False,
+        {"summary": "Teacher", "education": [], "key_skills": ["teaching"]}, ["education"],
+    ),
+    "empty summary": (
+        {"summary": "  ", "key_skills": ["java"]}, False,
+        {"summary": "  ", "key_skills": ["java"]}, ["summary"],
+    ),
+    "cut off": (
+        {"summary": "Full-stack developer", "email": "dev@example.com", "key_skills": ["react", "no"]}, True,
+        {"summary": "Full-stack developer", "key_skills": ["react", "no"]},
+        [field for field in ANALYSIS_FIELDS if field not in ("summary", "email")],
+    ),
+}
+
+@pytest.mark.parametrize("data, truncated, expected, invalid", VALIDATE_CASES.values(), ids=VALIDATE_CASES.keys())
+def test_validate_analysis_reports_invalid_fields(data, truncated, expected, invalid):
+    analysis, invalid_fields = validate_analysis(data, truncated=truncated)
+    assert {field: analysis[field] for field in expected} == expected
+    assert invalid_fields == invalid
+
+def test_validate_analysis_only_checks_the_requested_fields():
+    analysis, invalid = validate_analysis({"summary": "Nurse", "key_skills": None}, fields=("key_skills",))
+    assert analysis["key_skills"] == []
+    assert invalid == []
+
+def test_validate_analysis_rejects_a_non_object():
+    analysis, invalid = validate_analysis(["summary", "Engineer"])
+    assert analysis["summary"] == ""
+    assert invalid == list(ANALYSIS_FIELDS)
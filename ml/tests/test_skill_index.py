@@ -0,0 +1,102 @@
+"""
+BM25 skill scoring and the required-skill filter. Run from the ml/ directory:
+    python -m pytest -q tests/test_skill_index.py
+"""
+import numpy as np
+import pytest
+
+from candidate_pool import CandidatePool
+from skill_index import SkillIndex, candidate_skills, tokenize
+
+CANDIDATES = {
+    1: ["Python", "Django", "PostgreSQL", "Docker"],
+    2: ["C++", "Linux", "Embedded systems"],
+    3: ["C#", ".NET", "ASP.NET", "SQL Server"],
+    4: ["Node.js", "React", "Docker", "AWS"],
+    5: ["Python", "Machine Learning", "PyTorch", "Docker", "AWS", "Kubernetes", "Terraform", "Linux"],
+    6: ["Java", "Spring", "Docker"],
+}
+
+@pytest.fixture
+def index():
+    index = SkillIndex()
+    for doc_id, skills in CANDIDATES.items():
+        index.add(doc_id, skills)
+    return index
+
+@pytest.mark.parametrize("text, terms", [
+    ("C++ and C#", ["c++", "c#"]),
+    ("Node.js, .NET and ASP.NET", ["node.js", ".net", "asp.net"]),
+    ("Experience with the AWS cloud", ["experience", "aws", "cloud"]),
+    ("5+ years of Python 3", ["5+", "years", "python", "3"]),
+])
+def test_tokenize_keeps_symbols_of_skill_names(text, terms):
+    assert tokenize(text) == terms
+
+@pytest.mark.parametrize("row, skills", [
+    ({"key_skills": ["Python", "SQL"], "technical_skills": ["Docker"]}, ["Python", "SQL", "Docker"]),
+    ({"key_skills": "Python, SQL, ", "technical_skills": float("nan")}, ["Python", " SQL"]),
+    ({"key_skills": None}, []),
+], ids=["lists", "csv strings", "missing"])
+def test_candidate_skills(row, skills):
+    assert candidate_skills(row) == skills
+
+@pytest.mark.parametrize("required, expected", [
+    (["docker"], {1, 4, 5, 6}),
+    (["Docker", "AWS"], {4, 5}),
+    (["machine learning"], {5}),
+    (["C++"], {2}),
+    (["C#", ".NET"], {3}),
+    (["c"], set()),
+    (["Docker", "Rust"], set()),
+    ([], {1, 2, 3, 4, 5, 6}),
+])
+def test_matching_requires_every_skill(index, required, expected):
+    assert index.matching(required) == expected
+
+def test_matching_is_limited_to_the_given_candidates(index):
+    assert index.matching(["docker"], doc_ids=[1, 2, 3, 4]) == {1, 4}
+
+def test_reindexing_replaces_old_skills(index):
+    index.add(6, ["Kotlin", "Android"])
+    assert 6 not in index.matching(["docker"])
+    assert index.matching(["kotlin"]) == {6}
+    assert index.get_stats()["candidates"] == len(CANDIDATES)
+
+def test_bm25_ranks_rare_and_covered_skills_first(index):
+    doc_ids = list(CANDIDATES)
+    scores = dict(zip(doc_ids, index.scores("Senior Python engineer: Django, PostgreSQL and Docker", doc_ids)))
+    # Candidate 1 lists every known skill of the job; Docker alone is common and worth little,
+    # a little more on the shorter profile
+    assert scores[1] == 100.0
+    assert scores[5] > scores[6] > scores[4] > 0
+    assert scores[2] == scores[3] == 0.0
+    assert sorted(doc_ids, key=scores.get, reverse=True)[:2] == [1, 5]
+
+def test_bm25_prefers_a_focused_profile(index):
+    # Same single match, but candidate 5 lists many other skills
+    scores = index.scores("Linux", [2, 5])
+    assert scores[0] > scores[1] > 0
+
+def test_bm25_scores_align_with_doc_ids(index):
+    scores = index.scores("React and Rust", [6, 4, 99])
+    assert scores.tolist() == [0.0, scores[1], 0.0]
+    assert scores[1] > 0
+    assert not index.scores("Rust and Go", [1, 2]).any()
+    assert np.array_equal(SkillIndex().scores("python", [1]), [0.0])
+
+def test_sync_follows_pool_updates(tmp_path):
+    pool = CandidatePool(tmp_path / "pool.sqlite3")
+    row = lambda email, skills: {"status": "success", "email": email, "summary": "developer", "key_skills": skills}
+    pool.add_rows([row("a@x.com", ["Python"]), row("b@x.com", ["Go"])])
+    index = SkillIndex()
+    index.sync(pool)
+
+    pool.add_rows([row("a@x.com", ["Rust"]), row("c@x.com", ["Python", "Go"])])
+    index.sync(pool)
+    candidates = pool.frame()
+    ids = dict(zip(candidates["email"], candidates["candidate_id"]))
+    assert index.matching(["python"]) == {ids["c@x.com"]}
+    assert index.matching(["go"]) == {ids["b@x.com"], ids["c@x.com"]}
+    assert index.matching(["rust"]) == {ids["a@x.com"]}
+    assert len(index) == 3
@@ -0,0 +1,41 @@
+"""
+Candidate pool embedding keys and their in-memory sync. Run from the ml/ directory:
+    python -m pytest -q tests/test_summary_keys.py
+"""
+import sqlite3
+
+from candidate_pool import CandidatePool
+from summary_keys import SummaryKeys
+
+def summary_key(summary):
+    return summary.strip().lower()
+
+def row(email, summary):
+    return {"status": "success", "email": email, "summary": summary, "key_skills": ["python"]}
+
+def test_sync_follows_pool_updates(tmp_path):
+    pool = CandidatePool(tmp_path / "pool.sqlite3", summary_key=summary_key)
+    keys = SummaryKeys()
+    pool.add_rows([row("a@x.com", "Python developer"), row("b@x.com", "python developer"), row("c@x.com", "Java")])
+    assert sorted(keys.sync(pool)) == ["java", "python developer", "python developer"]
+    assert keys.rows("python developer") == [1, 2]
+
+    # A new summary moves the candidate to its new key; an empty one drops it
+    pool.add_rows([row("a@x.com", "Go developer"), row("c@x.com", " ")])
+    assert sorted(keys.sync(pool)) == ["go developer"]
+    assert keys.rows("python developer") == [2]
+    assert keys.rows("go developer") == [1]
+    assert keys.rows("java") == []
+    assert keys.labels() == {1, 2}
+    assert keys.sync(pool) == []
+
+def test_keys_of_an_older_pool_are_backfilled(tmp_path):
+    path = tmp_path / "pool.sqlite3"
+    CandidatePool(path).add_rows([row("a@x.com", "Python developer"), row("b@x.com", "")])
+    # A pool written before the embedding_key column existed
+    with sqlite3.connect(path) as conn:
+        conn.execute("ALTER TABLE candidates DROP COLUMN embedding_key")
+
+    keys = SummaryKeys()
+    assert keys.sync(CandidatePool(path, summary_key=summary_key)) == ["python developer"]
+    assert keys.rows("python developer") == [1]
@@ -0,0 +1,201 @@
+"""
+Text extraction from resume files, bounded in work and wall-clock time.
+
+Pages and paragraphs are collected in a list and joined once, and extraction
+stops at a page and character budget, so a 300-page PDF costs no more than
+the first few pages that could ever reach a prompt. PDF pages are separated
+by form feeds for the preprocessing that spots repeated headers and footers.
+
+PDFs are read with PyPDF2, or with PyMuPDF (much faster on large files) when
+it is installed and selected; PyMuPDF is optional.
+
+``ExtractionPool`` runs extraction in a fixed set of worker processes, one
+file per process at a time. A file that exceeds its wall-clock timeout (a
+malformed PDF that sends the parser into a loop) gets its process killed and
+replaced, so it never holds a worker indefinitely and other files are not
+affected. Workers are started with forkserver (spawn where that is not
+available) rather than fork, so they never inherit the event loop, threads
+and locks of the API process.
+"""
+import io
+import multiprocessing
+import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import docx
+from PyPDF2 import PdfReader
+
+from resume_preprocessing import PAGE_SEPARATOR
+
+try:
+    import fitz  # PyMuPDF
+except ImportError:  # The faster PDF backend is optional
+    fitz = None
+
+PDF_BACKENDS = ("pypdf2", "pymupdf")
+
+class ExtractionTimeout(Exception):
+    pass
+
+class ExtractionCrash(Exception):
+    pass
+
+def available_pdf_backends():
+    return [backend for backend in PDF_BACKENDS if backend == "pypdf2" or fitz is not None]
+
+def _limited(parts, max_chars, separator):
+    """Join text parts until max_chars is reached (0 = no limit)"""
+    collected, size = [], 0
+    for part in parts:
+        collected.append(part)
+        size += len(part) + len(separator)
+        if max_chars and size >= max_chars:
+            break
+    text = separator.join(collected)
+    return text[:max_chars] if max_chars else text
+
+def _pdf_pages_pypdf2(source, max_pages):
+    pdf = PdfReader(source)
+    for number, page in enumerate(pdf.pages):
+        if max_pages and number >= max_pages:
+            return
+        yield page.extract_text() or ""
+
+def _pdf_pages_pymupdf(source, max_pages):
+    if isinstance(source, io.BytesIO):
+        document = fitz.open(stream=source.getvalue(), filetype="pdf")
+    else:
+        document = fitz.open(source)
+    with document:
+        for number, page in enumerate(document):
+            if max_pages and number >= max_pages:
+                return
+            yield page.get_text()
+
+def extract_text(file_path, content=None, max_pages=0, max_chars=0, pdf_backend="pypdf2"):
+    """Text of a resume file (from ``content`` bytes instead of disk when given), within the page and character budget"""
+    file_extension = os.path.splitext(file_path)[1].lower()
+    source = io.BytesIO(content) if content is not None else file_path
+
+    try:
+        if file_extension == ".txt":
+            if content is not None:
+                text = content.decode('utf-8')
+            else:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    text = f.read(max_chars or -1)
+            return text[:max_chars] if max_chars else text
+        elif file_extension == ".pdf":
+            if pdf_backend == "pymupdf":
+                if fitz is None:
+                    raise ValueError("The pymupdf PDF backend is not installed")
+                pages = _pdf_pages_pymupdf(source, max_pages)
+            else:
+                pages = _pdf_pages_pypdf2(source, max_pages)
+            return _limited(pages, max_chars, PAGE_SEPARATOR)
+        elif file_extension in [".docx", ".doc"]:
+            doc = docx.Document(source)
+            return _limited((para.text for para in doc.paragraphs), max_chars, "\n")
+        else:
+            raise ValueError(f"Unsupported file type: {file_extension}")
+    except Exception as e:
+        raise ValueError(f"Error reading file {file_path}: {str(e)}")
+
+def _serve(conn):
+    """Worker process loop: run (function, args) requests until the pipe closes"""
+    conn.send((True, None))  # Started and imported; calls are timed from here
+    while True:
+        try:
+            func, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        try:
+            conn.send((True, func(*args)))
+        except Exception as e:
+            conn.send((False, str(e)))
+
+class ExtractionProcess:
+    """One worker process and the pipe to it"""
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_serve, args=(child_conn,), daemon=True)
+        self.process.start()
+        child_conn.close()
+        # A fresh interpreter takes a while to import the extractors; that must not count against a file's timeout
+        try:
+            self.conn.recv()
+        except (EOFError, OSError):
+            self.kill()
+            raise ExtractionCrash("worker process failed to start")
+
+    def call(self, func, args, timeout=None):
+        try:
+            self.conn.send((func, args))
+        except OSError:
+            raise ExtractionCrash("worker process died")
+        if not self.conn.poll(timeout):
+            raise ExtractionTimeout(f"no result after {timeout}s")
+        try:
+            ok, value = self.conn.recv()
+        except (EOFError, OSError):
+            raise ExtractionCrash("worker process died")
+        if not ok:
+            raise ValueError(value)
+        return value
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+def default_context():
+    """forkserver where the platform has it, spawn otherwise; never fork a threaded server"""
+    method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(method)
+
+class ExtractionPool:
+    def __init__(self, workers, context=None):
+        self.context = context or default_context()
+        self.lock = threading.Lock()
+        self.idle = queue.Queue()
+        self.timeouts = 0
+        self.crashes = 0
+        # Processes are started on first use; None marks a slot without one yet
+        for _ in range(workers):
+            self.idle.put(None)
+        # One waiting thread per process, so callers never queue behind unrelated thread work
+        self.waiters = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="extraction")
+
+    def run(self, func, args, timeout=None):
+        """Run func(*args) in an idle worker process (blocks until one is free).
+
+        Raises ExtractionTimeout or ExtractionCrash after killing and replacing
+        the worker; exceptions raised by func come back as ValueError.
+        """
+        worker = self.idle.get()
+        try:
+            if worker is None or not worker.process.is_alive():
+                worker = ExtractionProcess(self.context)
+            try:
+                return worker.call(func, args, timeout)
+            except (ExtractionTimeout, ExtractionCrash) as e:
+                with self.lock:
+                    if isinstance(e, ExtractionTimeout):
+                        self.timeouts += 1
+                    else:
+                        self.crashes += 1
+                worker.kill()
+                worker = None
+                raise
+        finally:
+            self.idle.put(worker)
+
+    def submit(self, func, args, timeout=None):
+        """run() on one of the pool's own threads; returns a concurrent.futures.Future"""
+        return self.waiters.submit(self.run, func, args, timeout)
+
+    def get_stats(self):
+        with self.lock:
+            return {"timeouts": self.timeouts, "crashes": self.crashes}